@@ -0,0 +1,178 @@
+"""
+Пакетное построение срезов в файлы без графического интерфейса.
+
+Срезы по заданным осям и значениям для каждого файла сохраняются в PNG
+или SVG. Работа распределяется по пулу процессов; каждый процесс
+загружает и индексирует файл один раз на свою часть срезов.
+
+Примеры:
+    python batch_render.py data/god0mes*.dat --axis z --out slices
+    python batch_render.py data/ --axis x y --count 20 --format svg
+    python batch_render.py run.dat --axis z --values 0 2.5 5 --isotherms 0
+    python batch_render.py run.dat --axis z --count 10 --interpolate idw --normal 1 0 1
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from data.data_summary import DataSummary
+from data.dataset import Dataset
+from data.parallel_loader import find_data_files
+from data.slice_index import SliceIndex
+from data.structured_grid import StructuredGrid
+from visualization.plot_3d import Plot3D
+
+AXES = ['x', 'y', 'z']
+
+# Загруженные в рабочем процессе файлы: путь -> (данные, индекс срезов, сводка)
+_worker_datasets = {}
+
+
+def _load_dataset(file_path, thinning):
+    """Загрузка, прореживание и индексирование файла (один раз на процесс)"""
+    if file_path not in _worker_datasets:
+        dataset = Dataset.from_file(file_path)
+        if thinning['method'] is None:
+            data = dataset.raw
+        else:
+            data = dataset.get_thinned(thinning['method'], thinning['bin_widths'],
+                                       thinning['precision'])
+        slice_index = SliceIndex(data, StructuredGrid.detect(data))
+        summary = DataSummary.from_data(data, slice_index)
+
+        # Держим в памяти только последний файл
+        _worker_datasets.clear()
+        _worker_datasets[file_path] = (data, slice_index, summary)
+    return _worker_datasets[file_path]
+
+
+def slice_values(summary, axis, values=None, count=None):
+    """
+    Значения срезов: заданные явно, count равномерных значений по
+    диапазону оси или все уровни данных по оси.
+    """
+    if values:
+        return list(values)
+    if count:
+        lo, hi = summary.range(axis)
+        return list(np.linspace(lo, hi, count))
+    return list(summary.unique[axis])
+
+
+def render_part(file_path, axis, options, part, parts):
+    """
+    Построение части срезов файла по оси (каждый parts-й срез, начиная
+    с part) в рабочем процессе. Возвращает [(путь изображения, секунды)].
+    """
+    data, slice_index, summary = _load_dataset(file_path, options['thinning'])
+    values = slice_values(summary, axis, options['values'], options['count'])[part::parts]
+    if not values or not summary.valid:
+        return []
+
+    plot = Plot3D()
+    show_isotherms = options['isotherms'] > 0
+    num_isotherms = max(options['isotherms'], 3)
+    name = os.path.splitext(os.path.basename(file_path))[0]
+
+    results = []
+    fig = None
+    for value in values:
+        start_time = time.perf_counter()
+        slice_params = {'axis': axis, 'value': float(value), 'tolerance': options['tolerance']}
+        if options['interpolate']:
+            slice_params.update({'mode': 'interpolated', 'method': options['interpolate'],
+                                 'k': options['neighbors'], 'normal': options['normal']})
+        if fig is None:
+            fig = plot.create_3d_plot_with_slice(data, slice_params, show_isotherms, num_isotherms,
+                                                 slice_index, summary, interactive=False)
+        else:
+            plot.update_3d_plot_with_slice(fig, data, slice_params, show_isotherms, num_isotherms,
+                                           slice_index, summary=summary, redraw=False)
+
+        image_path = os.path.join(options['out'], f"{name}_{axis}_{value:+.3f}.{options['format']}")
+        fig.savefig(image_path, dpi=options['dpi'])
+        results.append((image_path, time.perf_counter() - start_time))
+
+    plt.close(fig)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('sources', nargs='+', help='файлы, каталоги или шаблоны glob')
+    parser.add_argument('--axis', nargs='+', choices=AXES, default=['z'], help='оси срезов')
+    parser.add_argument('--values', nargs='+', type=float, help='значения срезов (по умолчанию - все уровни)')
+    parser.add_argument('--count', type=int, help='число равномерных срезов по диапазону оси')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='погрешность среза')
+    parser.add_argument('--interpolate', choices=['nearest', 'idw'],
+                        help='интерполированный срез по KD-дереву вместо полосы погрешности')
+    parser.add_argument('--neighbors', type=int, default=8, help='число соседей для --interpolate idw')
+    parser.add_argument('--normal', nargs=3, type=float, metavar=('X', 'Y', 'Z'),
+                        help='нормаль наклонной плоскости (с --interpolate)')
+    parser.add_argument('--isotherms', type=int, default=10, help='число изотерм (0 - без изотерм)')
+    parser.add_argument('--thinning', choices=['rounding', 'binning', 'none'], default='rounding')
+    parser.add_argument('--precision', type=int, default=0, help='знаков после запятой при округлении')
+    parser.add_argument('--bin-width', nargs=3, type=float, default=[0.5, 0.5, 0.5], metavar=('X', 'Y', 'Z'))
+    parser.add_argument('--format', choices=['png', 'svg'], default='png')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--out', default='slices', help='каталог для изображений')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='число процессов')
+    args = parser.parse_args()
+
+    files = []
+    for source in args.sources:
+        files.extend(path for path in find_data_files(source) if path not in files)
+    if not files:
+        parser.error("не найдено файлов данных")
+    if args.normal is not None and (args.interpolate is None or not any(args.normal)):
+        parser.error("--normal требует --interpolate и ненулевого вектора")
+
+    os.makedirs(args.out, exist_ok=True)
+    options = {
+        'values': args.values,
+        'count': args.count,
+        'tolerance': args.tolerance,
+        'interpolate': args.interpolate,
+        'neighbors': args.neighbors,
+        'normal': None if args.normal is None else tuple(args.normal),
+        'isotherms': args.isotherms,
+        'thinning': {
+            'method': None if args.thinning == 'none' else args.thinning,
+            'bin_widths': tuple(args.bin_width),
+            'precision': args.precision
+        },
+        'format': args.format,
+        'dpi': args.dpi,
+        'out': args.out
+    }
+
+    # Срезы одного файла и оси делятся между процессами поровну
+    workers = max(1, args.workers)
+    tasks = [(path, axis, part) for path in files for axis in args.axis for part in range(workers)]
+
+    start_time = time.perf_counter()
+    num_images = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(render_part, path, axis, options, part, workers): (path, axis)
+                   for path, axis, part in tasks}
+        for future in as_completed(futures):
+            path, axis = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"Ошибка при построении срезов {os.path.basename(path)} по {axis.upper()}: {e}")
+                continue
+            for image_path, seconds in results:
+                print(f"{image_path}: {seconds * 1000:.0f} мс")
+            num_images += len(results)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Построено изображений: {num_images} за {elapsed:.1f} с ({workers} процессов)")
+
+
+if __name__ == "__main__":
+    main()
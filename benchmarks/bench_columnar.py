@@ -0,0 +1,71 @@
+"""
+Колоночные форматы: разбор текстового файла против открытия сохраненного
+NPZ (Parquet, Feather, HDF5 - если установлены нужные пакеты) и чтение
+полосы вокруг плоскости среза только из пересекающих ее блоков.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_columnar --sizes 1e6
+    python -m benchmarks.bench_columnar --sizes 1e7 --kind scattered --no-memory
+"""
+import argparse
+import os
+import tempfile
+import numpy as np
+from benchmarks.bench_suite import measure
+from data.columnar import available_formats
+from data.data_loader import DataLoader
+from utils.synthetic_data import SyntheticDataGenerator
+
+EXTENSIONS = {'npz': '.npz', 'parquet': '.parquet', 'feather': '.feather', 'hdf5': '.h5'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=float, default=[1e6])
+    parser.add_argument('--kind', choices=['structured', 'scattered'], default='structured')
+    parser.add_argument('--band', type=float, default=0.02, help='ширина полосы среза (доля размаха по Z)')
+    parser.add_argument('--work-dir', help='каталог для сгенерированных файлов')
+    parser.add_argument('--no-memory', action='store_true', help='не измерять память')
+    args = parser.parse_args()
+
+    loader = DataLoader()
+    generator = SyntheticDataGenerator()
+    print(f"Доступные форматы: {', '.join(available_formats())}")
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        for size in args.sizes:
+            num_points = int(size)
+            source = os.path.join(work_dir, f"points_{num_points}.dat")
+            generator.write(source, num_points, args.kind)
+
+            raw, parse_time, parse_peak = measure(lambda: loader.load_raw(source, use_cache=False),
+                                                  not args.no_memory)
+            print(f"{num_points} точек, разбор DAT: {parse_time:.3f} с")
+
+            z_min, z_max = float(raw['z'].min()), float(raw['z'].max())
+            z0 = z_min + 0.37 * (z_max - z_min)
+            half_width = args.band * (z_max - z_min) / 2
+            bounds = {'z': (z0 - half_width, z0 + half_width)}
+
+            for name in available_formats():
+                path = os.path.join(work_dir, f"points_{num_points}{EXTENSIONS[name]}")
+                _, save_time, _ = measure(lambda: loader.save_data(raw, path), False)
+                df, open_time, open_peak = measure(lambda: loader.load_raw(path), not args.no_memory)
+                band, band_time, _ = measure(lambda: loader.load_region(path, bounds), False)
+
+                # Сохраненные точки совпадают с исходными с точностью до порядка строк
+                same = len(df) == len(raw) and np.array_equal(np.sort(df.to_numpy(), axis=0),
+                                                              np.sort(raw.to_numpy(), axis=0))
+                memory = ""
+                if open_peak is not None:
+                    memory = f", память {parse_peak:.0f} -> {open_peak:.0f} МБ"
+                print(f"  {name}: запись {save_time:.3f} с, открытие {open_time:.3f} с "
+                      f"(x{parse_time / max(open_time, 1e-6):.0f}){memory}, полоса среза {band_time:.3f} с "
+                      f"({len(band)} точек), результат совпадает: {same}")
+                os.remove(path)
+
+            os.remove(source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Чтение CSV: прежний путь (чтение с заголовком, при несовпадении колонок -
+повторное чтение без заголовка и pd.to_numeric по колонкам) против
+чтения за один проход с определением формата по началу файла.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_csv --sizes 1e5 1e6
+    python -m benchmarks.bench_csv --sizes 1e7 --no-memory
+"""
+import argparse
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from benchmarks.bench_suite import measure
+from data.data_loader import DataLoader, csv_engine
+from utils.synthetic_data import SyntheticDataGenerator
+
+
+def legacy_load_csv(file_path):
+    """Прежний DataLoader.load_from_csv (без обработки ошибок)"""
+    try:
+        df = pd.read_csv(file_path, comment='#', skip_blank_lines=True, header=0,
+                         encoding='utf-8', on_bad_lines='warn')
+        df.columns = df.columns.str.strip().str.lower()
+        expected_columns = ['x', 'y', 'z', 't']
+        if all(col in df.columns for col in expected_columns):
+            df = df[expected_columns].copy()
+            df.columns = ['x', 'y', 'z', 'T']
+        else:
+            raise ValueError("Заголовок не содержит ожидаемых колонок")
+    except (ValueError, pd.errors.ParserError):
+        df = pd.read_csv(file_path, comment='#', skip_blank_lines=True, header=None,
+                         names=['x', 'y', 'z', 'T'], encoding='utf-8', on_bad_lines='warn')
+
+    for col in ['x', 'y', 'z', 'T']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df.dropna()
+
+
+def write_headerless(source, target):
+    """Копия CSV файла без строки заголовка"""
+    with open(source, 'r', encoding='utf-8') as src, open(target, 'w', encoding='utf-8') as dst:
+        src.readline()
+        for line in src:
+            dst.write(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=float, default=[1e5, 1e6])
+    parser.add_argument('--work-dir', help='каталог для сгенерированных файлов')
+    parser.add_argument('--no-memory', action='store_true', help='не измерять память')
+    args = parser.parse_args()
+
+    loader = DataLoader()
+    generator = SyntheticDataGenerator()
+    print(f"Парсер CSV: {csv_engine()}")
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        for size in args.sizes:
+            num_points = int(size)
+            with_header = os.path.join(work_dir, f"header_{num_points}.csv")
+            without_header = os.path.join(work_dir, f"noheader_{num_points}.csv")
+            generator.write_csv(with_header, num_points)
+            write_headerless(with_header, without_header)
+
+            for name, path in (('с заголовком', with_header), ('без заголовка', without_header)):
+                old, old_time, old_peak = measure(lambda: legacy_load_csv(path), not args.no_memory)
+                new, new_time, new_peak = measure(lambda: loader.load_from_csv(path), not args.no_memory)
+
+                # Оба пути должны дать одни и те же точки
+                same = len(old) == len(new) and np.allclose(old.to_numpy(dtype=np.float64),
+                                                             new.to_numpy(dtype=np.float64))
+                memory = ""
+                if old_peak is not None:
+                    memory = f", память {old_peak:.0f} -> {new_peak:.0f} МБ"
+                print(f"{num_points} точек, {name}: {old_time:.3f} -> {new_time:.3f} с "
+                      f"(x{old_time / new_time:.1f}){memory}, результат совпадает: {same}")
+
+            os.remove(with_header)
+            os.remove(without_header)
+
+
+if __name__ == "__main__":
+    main()
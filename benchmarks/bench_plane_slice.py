@@ -0,0 +1,76 @@
+"""
+Срез полосой погрешности с интерполяцией Делоне против интерполированного
+среза по KD-дереву (ближайшая точка и ОВР по k соседям) при разном числе
+точек. Время среза по дереву зависит от размера сетки, а не от N.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_plane_slice --sizes 1e5 1e6
+    python -m benchmarks.bench_plane_slice --sizes 1e6 --kind structured --grid-size 200
+"""
+import argparse
+import time
+import numpy as np
+from data.slice_index import SliceIndex
+from utils.synthetic_data import SyntheticDataGenerator
+from visualization.plot_3d import Plot3D
+
+
+def mean_ms(func, values):
+    """Среднее время вызова func(value) по значениям среза, мс"""
+    times = []
+    for value in values:
+        start = time.perf_counter()
+        func(value)
+        times.append(time.perf_counter() - start)
+    return 1000 * float(np.mean(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=float, default=[1e5, 1e6])
+    parser.add_argument('--kind', choices=['structured', 'scattered'], default='scattered')
+    parser.add_argument('--slices', type=int, default=5, help='число положений плоскости')
+    parser.add_argument('--grid-size', type=int, default=100)
+    parser.add_argument('--neighbors', type=int, default=8)
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator()
+    print(f"{'точек':>10} {'полоса, мс':>11} {'пустых':>7} {'дерево, с':>10} "
+          f"{'ближайшая, мс':>14} {'ОВР, мс':>8} {'наклонный, мс':>14}")
+    for size in args.sizes:
+        data = generator.generate(int(size), args.kind)
+        z_min, z_max = float(data['z'].min()), float(data['z'].max())
+        # Положения плоскости между краями данных, не совпадающие со слоями решетки
+        values = z_min + (z_max - z_min) * (np.arange(args.slices) + 0.37) / args.slices
+
+        # Срез полосой: точки в полосе и триангуляция Делоне для изотерм
+        # (новый Plot3D на каждый срез - без кэша интерполяции)
+        slice_index = SliceIndex(data)
+        empty = 0
+
+        def band(value):
+            nonlocal empty
+            plot = Plot3D(grid_size=args.grid_size)
+            prepared = plot.prepare_slice(data, {'axis': 'z', 'value': value, 'tolerance': args.tolerance},
+                                          slice_index=slice_index)
+            empty += len(prepared['slice_data']) == 0
+
+        band_ms = mean_ms(band, values)
+
+        start = time.perf_counter()
+        slice_index.sampler.tree
+        build_time = time.perf_counter() - start
+
+        nearest_ms = mean_ms(lambda value: slice_index.sample_plane('z', value, grid_size=args.grid_size),
+                             values)
+        idw_ms = mean_ms(lambda value: slice_index.sample_plane('z', value, grid_size=args.grid_size,
+                                                                method='idw', k=args.neighbors), values)
+        oblique_ms = mean_ms(lambda value: slice_index.sample_plane('z', value, (1.0, 1.0, 2.0), args.grid_size,
+                                                                    'idw', args.neighbors), values)
+        print(f"{int(size):>10} {band_ms:>11.1f} {empty:>7} {build_time:>10.3f} "
+              f"{nearest_ms:>14.1f} {idw_ms:>8.1f} {oblique_ms:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
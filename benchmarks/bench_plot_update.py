@@ -0,0 +1,69 @@
+"""
+Задержка обновления графика при смене среза: полная перестройка
+(ax.clear()) против обновления существующих объектов.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_plot_update --sizes 1e5 1e6
+"""
+import argparse
+import time
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from visualization.plot_3d import Plot3D
+
+
+def make_lattice(num_points, seed=0):
+    """Точки на решетке 100 x 100 x nz с шагом 1 (срезы по Z непусты)"""
+    rng = np.random.default_rng(seed)
+    nz = max(1, num_points // 10000)
+    x, y, z = np.meshgrid(np.arange(100.0), np.arange(100.0), np.arange(float(nz)), indexing='ij')
+    return pd.DataFrame({
+        'x': x.ravel()[:num_points],
+        'y': y.ravel()[:num_points],
+        'z': z.ravel()[:num_points],
+        'T': rng.normal(-10, 5, min(num_points, x.size))
+    })
+
+
+def measure_updates(plot, data, values, full_redraw, show_isotherms):
+    """
+    Среднее время одного обновления, мс. На Agg draw_idle рисует сразу,
+    поэтому время включает отрисовку.
+    """
+    fig = plot.create_3d_plot_with_slice(data, {'axis': 'z', 'value': values[0], 'tolerance': 0.1},
+                                         show_isotherms=show_isotherms)
+    fig.canvas.draw()
+    times = []
+    for value in values[1:]:
+        start = time.perf_counter()
+        plot.update_3d_plot_with_slice(fig, data, {'axis': 'z', 'value': value, 'tolerance': 0.1},
+                                       show_isotherms=show_isotherms, full_redraw=full_redraw)
+        times.append(time.perf_counter() - start)
+    plt.close(fig)
+    return 1000 * float(np.mean(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=float, default=[1e5, 1e6])
+    parser.add_argument('--updates', type=int, default=5)
+    parser.add_argument('--no-isotherms', action='store_true')
+    args = parser.parse_args()
+
+    plot = Plot3D()
+    show_isotherms = not args.no_isotherms
+    print(f"{'точек':>10} {'полная, мс':>12} {'на месте, мс':>14} {'ускорение':>10}")
+    for size in args.sizes:
+        data = make_lattice(int(size))
+        nz = int(data['z'].max()) + 1
+        values = [float(v % nz) for v in range(args.updates + 1)]
+        t_full = measure_updates(plot, data, values, True, show_isotherms)
+        t_incremental = measure_updates(plot, data, values, False, show_isotherms)
+        print(f"{int(size):>10} {t_full:>12.1f} {t_incremental:>14.1f} {t_full / t_incremental:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Время запуска приложения с проверкой бюджета.
+
+Каждый замер - новый процесс Python: время импорта gui.main_window, время
+до первой отрисовки окна (если есть дисплей) и время фоновой загрузки
+тяжелых модулей. Тяжелые модули не должны загружаться до появления окна.
+Код возврата 1, если медиана времени до окна (без дисплея - времени
+импорта) больше бюджета.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_startup --budget 0.5
+    python -m benchmarks.bench_startup --runs 10 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Код, выполняемый в отдельном процессе при каждом замере
+CHILD_SCRIPT = r'''
+import json, sys, time
+start = time.perf_counter()
+import tkinter as tk
+from gui.main_window import Graph3DApp
+from gui.startup import HEAVY_MODULES, ModuleWarmer
+result = {
+    'import_seconds': time.perf_counter() - start,
+    'heavy_loaded': [name for name in HEAVY_MODULES if name in sys.modules]
+}
+try:
+    root = tk.Tk()
+except tk.TclError:
+    root = None
+if root is not None:
+    app = Graph3DApp(root)
+    root.update()
+    result['window_seconds'] = time.perf_counter() - start
+    warmer = app.module_warmer
+    warmer.start()
+else:
+    warmer = ModuleWarmer()
+    warmer.start()
+warmer.wait(120)
+result['warm_up_seconds'] = warmer.elapsed
+result['warm_up_errors'] = warmer.errors
+if root is not None:
+    root.destroy()
+print(json.dumps(result))
+'''
+
+
+def run_once():
+    """Один запуск в новом процессе"""
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run([sys.executable, '-c', CHILD_SCRIPT], cwd=root_dir,
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='число запусков')
+    parser.add_argument('--budget', type=float, default=0.5, help='бюджет времени до окна, с')
+    parser.add_argument('--output', help='файл JSON с результатами')
+    args = parser.parse_args()
+
+    runs = []
+    for i in range(args.runs):
+        result = run_once()
+        runs.append(result)
+        window = result.get('window_seconds')
+        window_text = f", окно {window * 1000:.0f} мс" if window is not None else ""
+        print(f"Запуск {i + 1}: импорт {result['import_seconds'] * 1000:.0f} мс{window_text}, "
+              f"фоновая загрузка {result['warm_up_seconds'] * 1000:.0f} мс")
+
+    has_window = all('window_seconds' in result for result in runs)
+    key = 'window_seconds' if has_window else 'import_seconds'
+    median = statistics.median(result[key] for result in runs)
+    heavy_loaded = sorted({name for result in runs for name in result['heavy_loaded']})
+
+    report = {
+        'metric': key,
+        'median_seconds': median,
+        'budget_seconds': args.budget,
+        'heavy_loaded_before_window': heavy_loaded,
+        'runs': runs
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+    if not has_window:
+        print("Дисплей недоступен: проверяется только время импорта")
+    print(f"Медиана ({key}): {median * 1000:.0f} мс, бюджет {args.budget * 1000:.0f} мс")
+
+    failed = False
+    if heavy_loaded:
+        print(f"Тяжелые модули загружаются до появления окна: {', '.join(heavy_loaded)}")
+        failed = True
+    if median > args.budget:
+        print("Бюджет времени запуска превышен")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Набор тестов производительности по основным этапам работы программы.
+
+Для каждого размера и типа данных генерируются CSV и DAT файлы, после
+чего измеряются время и пиковый объем памяти (tracemalloc, отдельным
+запуском) этапов:
+загрузка CSV и DAT, прореживание округлением и биннингом (в том числе
+по пирамиде бинов), построение индекса и срезы, интерполяция изотерм и
+отрисовка графика без окна. Отдельно измеряется параллельная загрузка
+серии DAT файлов с разным числом процессов (parallel_load): время,
+ускорение относительно одного процесса и эффективность (ускорение на
+процесс); при линейном масштабировании эффективность близка к 1.
+Результат записывается в JSON, чтобы сравнивать коммиты между собой.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_suite --sizes 1e4 1e5 1e6 --output bench.json
+    python -m benchmarks.bench_suite --sizes 1e7 --kinds scattered --skip-render
+    python -m benchmarks.bench_suite --sizes 1e6 --compact
+    python -m benchmarks.bench_suite --sizes 1e6 --workers 1 2 4 8 --series-files 16
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from data.bin_pyramid import BinPyramid
+from data.data_loader import DataLoader
+from data.parallel_loader import load_files_parallel
+from data.slice_index import SliceIndex
+from utils.synthetic_data import SyntheticDataGenerator
+from visualization.plot_3d import Plot3D
+
+# Число срезов по Z в этапе slice_queries
+NUM_SLICES = 10
+
+# Число процессов и файлов серии в этапе parallel_load
+DEFAULT_WORKERS = [1, 2, 4]
+DEFAULT_SERIES_FILES = 8
+
+
+def measure(func, trace_memory=True):
+    """
+    Выполнение func: (результат, секунды, пиковая память в МБ или None).
+
+    tracemalloc сильно замедляет pandas и matplotlib, поэтому время
+    измеряется отдельным запуском без трассировки памяти.
+    """
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def git_revision():
+    """Текущий коммит репозитория или None"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_case(num_points, kind, work_dir, trace_memory=True, skip_render=False, compact=False):
+    """Измерение всех этапов для одного размера и типа данных"""
+    loader = DataLoader(compact=compact)
+    plot = Plot3D()
+    generator = SyntheticDataGenerator()
+    stages = {}
+
+    def stage(name, func):
+        result, seconds, peak = measure(func, trace_memory)
+        stages[name] = {'seconds': round(seconds, 6), 'peak_mb': None if peak is None else round(peak, 3)}
+        print(f"  {name:<20} {seconds * 1000:>10.1f} мс" + (f" {peak:>10.1f} МБ" if peak is not None else ""))
+        return result
+
+    csv_path = os.path.join(work_dir, f"{kind}_{num_points}.csv")
+    dat_path = os.path.join(work_dir, f"{kind}_{num_points}.dat")
+    generator.write_csv(csv_path, num_points, kind)
+    generator.write_dat(dat_path, num_points, kind)
+
+    stage('load_from_csv', lambda: loader.load_from_csv(csv_path))
+    stage('load_from_dat', lambda: loader.load_from_dat(dat_path))
+    raw = loader.read_dat_columns(dat_path, dtype=loader.dtype)
+    raw_mb = raw.memory_usage(index=True).sum() / (1024 * 1024)
+    print(f"  {'raw_data':<20} {'':>10}    {raw_mb:>10.1f} МБ ({loader.dtype})")
+
+    stage('thin_rounding', lambda: loader.get_data_without_binning(raw))
+    stage('thin_binning', lambda: loader.get_data_with_binning(raw, 1.0, 1.0, 1.0))
+    pyramid = stage('pyramid_build', lambda: BinPyramid.build(raw['x'], raw['y'], raw['z'], raw['T'],
+                                                              (0.5, 0.5, 0.5), loader.binning_engine))
+    stage('thin_pyramid', lambda: pyramid.query((1.0, 1.0, 1.0)))
+
+    # Срезы по исходным точкам через решетку (если найдена) или индекс
+    z_min, z_max = raw['z'].min(), raw['z'].max()
+    values = np.linspace(z_min, z_max, NUM_SLICES)
+    tolerance = (z_max - z_min) / (2 * NUM_SLICES)
+    slice_index = stage('slice_index_build', lambda: SliceIndex(raw, loader.detect_structured_grid(raw)))
+    slices = stage('slice_queries', lambda: [slice_index.get_slice_data('z', v, tolerance) for v in values])
+    slice_data = max(slices, key=len)
+
+    # Интерполяция изотерм на сетку так же, как в Plot3D._add_isotherms
+    fig, ax = plt.subplots()
+    stage('isotherms', lambda: plot._add_isotherms(ax, slice_data['x'].values, slice_data['y'].values,
+                                                   slice_data['T'].values, 10))
+    plt.close(fig)
+
+    if not skip_render:
+        slice_params = {'axis': 'z', 'value': float(values[NUM_SLICES // 2]), 'tolerance': tolerance}
+
+        def render():
+            fig = plot.create_3d_plot_with_slice(raw, slice_params, slice_index=slice_index, interactive=False)
+            fig.savefig(io.BytesIO(), format='png', dpi=80)
+            plt.close(fig)
+        stage('render', render)
+
+    for path in (csv_path, dat_path):
+        os.remove(path)
+    return stages
+
+
+def run_parallel_load(num_points, kind, work_dir, workers=DEFAULT_WORKERS, num_files=DEFAULT_SERIES_FILES,
+                      compact=False):
+    """
+    Параллельная загрузка серии из num_files DAT файлов по num_points
+    точек (с прореживанием округлением, как в окне) с разным числом
+    процессов. Кэш не используется, чтобы каждый запуск разбирал файлы.
+    """
+    generator = SyntheticDataGenerator()
+    series_dir = os.path.join(work_dir, f"series_{kind}_{num_points}")
+    os.makedirs(series_dir)
+    for i in range(num_files):
+        generator.write_dat(os.path.join(series_dir, f"step{i}.dat"), num_points, kind)
+
+    results = {}
+    for count in workers:
+        start = time.perf_counter()
+        collection = load_files_parallel(series_dir, method='rounding', max_workers=count, use_cache=False,
+                                         compact=compact)
+        seconds = time.perf_counter() - start
+        if len(collection) != num_files:
+            raise RuntimeError(f"Загружено {len(collection)} файлов серии из {num_files}")
+        results[count] = seconds
+
+    base = results[workers[0]] * workers[0]
+    stages = {}
+    for count, seconds in results.items():
+        speedup = base / seconds
+        stages[str(count)] = {'seconds': round(seconds, 6), 'speedup': round(speedup, 3),
+                              'efficiency': round(speedup / count, 3)}
+        print(f"  {'parallel_load':<14} {count:>3} пр. {seconds * 1000:>10.1f} мс "
+              f"ускорение {speedup:>5.2f}x, эффективность {speedup / count:.2f}")
+
+    for name in os.listdir(series_dir):
+        os.remove(os.path.join(series_dir, name))
+    os.rmdir(series_dir)
+    return {'files': num_files, 'workers': stages}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=float, default=[1e4, 1e5, 1e6])
+    parser.add_argument('--kinds', nargs='+', choices=['structured', 'scattered'],
+                        default=['structured', 'scattered'])
+    parser.add_argument('--output', help='файл JSON с результатами (по умолчанию - только вывод)')
+    parser.add_argument('--work-dir', help='каталог для сгенерированных файлов')
+    parser.add_argument('--no-memory', action='store_true', help='не измерять память (этапы выполняются один раз)')
+    parser.add_argument('--skip-render', action='store_true', help='без этапа отрисовки')
+    parser.add_argument('--compact', action='store_true', help='компактный режим (колонки float32)')
+    parser.add_argument('--workers', nargs='+', type=int, default=DEFAULT_WORKERS,
+                        help='число процессов в этапе parallel_load (0 - без этого этапа)')
+    parser.add_argument('--series-files', type=int, default=DEFAULT_SERIES_FILES,
+                        help='число файлов серии в этапе parallel_load')
+    args = parser.parse_args()
+    workers = sorted(set(count for count in args.workers if count > 0))
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'compact': args.compact,
+        'cases': []
+    }
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        for kind in args.kinds:
+            for size in args.sizes:
+                num_points = int(size)
+                print(f"{kind}, {num_points} точек:")
+                stages = run_case(num_points, kind, work_dir, not args.no_memory, args.skip_render,
+                                  args.compact)
+                case = {'kind': kind, 'points': num_points, 'stages': stages}
+                if workers:
+                    case['parallel_load'] = run_parallel_load(num_points, kind, work_dir, workers,
+                                                              args.series_files, args.compact)
+                report['cases'].append(case)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+        print(f"Результаты сохранены в {args.output}")
+    else:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
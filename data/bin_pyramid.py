@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+from data.binning import BinningEngine, narrow_keys, result_dtype
+
+# Во сколько раз базовые бины мельче ширины, для которой строится пирамида
+BASE_SUBDIVISION = 2
+
+# Наибольшее число уровней над базовым (уровень L - бины в 2**L раз крупнее)
+MAX_LEVELS = 8
+
+# Допустимое относительное отклонение отношения ширины к базовой от целого
+MULTIPLE_TOLERANCE = 1e-9
+
+
+def _narrow_int(values):
+    """Целочисленный массив в int32, если значения в него помещаются"""
+    if len(values) and (values.min() < -2 ** 31 or values.max() >= 2 ** 31):
+        return values.astype(np.int64, copy=False)
+    return values.astype(np.int32)
+
+
+class BinPyramid:
+    """
+    Пирамида бинов для мгновенной смены ширины бинов.
+
+    Базовый уровень - число точек и суммы x, y, z, T по занятым бинам
+    мелкой сетки с шагом base_widths от минимумов координат. Уровень L
+    получается из уровня L - 1 слиянием соседних бинов по два вдоль
+    каждой оси; уровни строятся лениво. Ширина, кратная базовой
+    (k_x, k_y, k_z раз), считается по самому крупному уровню, на котором
+    все k делятся на 2**L, с доведением до нужной ширины целочисленным
+    делением индексов - без обращения к исходным точкам.
+
+    Результат совпадает с BinningEngine.bin_points для той же ширины, кроме
+    точек, лежащих точно на границе бина: из-за округления при делении
+    они могут попасть в соседний бин.
+    """
+
+    def __init__(self, base_widths, origin, bins, counts, sums, dtype=np.float64, engine: BinningEngine = None):
+        self.base_widths = tuple(float(w) for w in base_widths)
+        self.origin = tuple(float(o) for o in origin)
+        self.dtype = np.dtype(dtype)
+        self.engine = engine or BinningEngine()
+        # Уровни: (индексы бинов по осям, число точек, суммы x, y, z, T);
+        # индексы и число точек хранятся в int32, суммы - в float64
+        self.levels = [(tuple(_narrow_int(b) for b in bins), _narrow_int(counts), list(sums))]
+
+    @classmethod
+    def build(cls, x, y, z, T, base_widths, engine: BinningEngine = None):
+        """Построение базового уровня по исходным точкам"""
+        engine = engine or BinningEngine()
+        coords = [np.asarray(c) for c in (x, y, z)]
+        T = np.asarray(T)
+        origin = tuple(float(c.min()) for c in coords)
+
+        keys, offsets, shape = narrow_keys([(c - o) // w for c, o, w in zip(coords, origin, base_widths)])
+        bins, counts, sums = engine.reduce_bins(keys, shape, [*coords, T])
+        bins = tuple(b + o for b, o in zip(bins, offsets))
+        return cls(base_widths, origin, bins, counts, sums, result_dtype(*coords, T), engine)
+
+    def factors(self, bin_widths):
+        """Кратности ширины бинов базовой по осям или None, если ширина не кратна"""
+        factors = []
+        for width, base in zip(bin_widths, self.base_widths):
+            ratio = float(width) / base
+            k = int(round(ratio))
+            if k < 1 or abs(ratio - k) > MULTIPLE_TOLERANCE * ratio:
+                return None
+            factors.append(k)
+        return tuple(factors)
+
+    def supports(self, bin_widths):
+        """Можно ли получить биннинг с такой шириной из пирамиды"""
+        return self.factors(bin_widths) is not None
+
+    def level(self, index):
+        """Уровень index (бины в 2**index раз крупнее базовых)"""
+        while len(self.levels) <= index:
+            bins, counts, sums = self.levels[-1]
+            self.levels.append(self._merge(tuple(b >> 1 for b in bins), counts, sums))
+        return self.levels[index]
+
+    def query(self, bin_widths, output='centroid'):
+        """
+        DataFrame с колонками x, y, z, T для ширины bin_widths, как у
+        BinningEngine.bin_points, или None, если ширина не кратна базовой.
+        """
+        factors = self.factors(bin_widths)
+        if factors is None:
+            return None
+
+        # Самый крупный уровень, бины которого целиком входят в искомые
+        index = min(MAX_LEVELS, *((k & -k).bit_length() - 1 for k in factors))
+        bins, counts, sums = self.level(index)
+        rest = [k >> index for k in factors]
+        if any(r > 1 for r in rest):
+            bins, counts, sums = self._merge(tuple(b // r for b, r in zip(bins, rest)), counts, sums)
+
+        result = {}
+        for i, col in enumerate(['x', 'y', 'z']):
+            if output == 'center':
+                center = self.origin[i] + (bins[i] + 0.5) * float(bin_widths[i])
+                result[col] = center.astype(self.dtype, copy=False)
+            else:
+                result[col] = (sums[i] / counts).astype(self.dtype, copy=False)
+        result['T'] = (sums[3] / counts).astype(self.dtype, copy=False)
+        return pd.DataFrame(result)
+
+    def _merge(self, bins, counts, sums):
+        """Свертка бинов с совпадающими индексами (индексы неотрицательные)"""
+        if len(counts) == 0:
+            return bins, counts, sums
+        # Индексы - новые массивы (после сдвига или деления), их можно менять на месте
+        keys, offsets, shape = narrow_keys(list(bins))
+        merged_bins, _, merged = self.engine.reduce_bins(keys, shape, [counts, *sums])
+        merged_bins = tuple(_narrow_int(b + o) for b, o in zip(merged_bins, offsets))
+        return merged_bins, _narrow_int(np.rint(merged[0])), merged[1:]
+
+    def memory_usage(self):
+        """Объем построенных уровней в байтах"""
+        return sum(sum(b.nbytes for b in bins) + counts.nbytes + sum(s.nbytes for s in sums)
+                   for bins, counts, sums in self.levels)
+
+    def to_arrays(self):
+        """Базовый уровень и параметры сетки в виде словаря массивов (для кэша)"""
+        bins, counts, sums = self.levels[0]
+        arrays = {f"bins_{axis}": b for axis, b in zip(['x', 'y', 'z'], bins)}
+        arrays.update({f"sum_{col}": s for col, s in zip(['x', 'y', 'z', 'T'], sums)})
+        arrays.update({
+            'counts': counts,
+            'base_widths': np.array(self.base_widths),
+            'origin': np.array(self.origin),
+            'dtype': np.array(self.dtype.name)
+        })
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, engine: BinningEngine = None):
+        """Пирамида из словаря массивов to_arrays"""
+        return cls(
+            arrays['base_widths'], arrays['origin'],
+            [arrays[f"bins_{axis}"] for axis in ['x', 'y', 'z']],
+            arrays['counts'],
+            [arrays[f"sum_{col}"] for col in ['x', 'y', 'z', 'T']],
+            str(arrays['dtype']), engine
+        )
@@ -0,0 +1,259 @@
+import numpy as np
+import pandas as pd
+
+# Плотный np.bincount используется, пока число ячеек сетки не превышает
+# DENSE_BINS_FACTOR * число точек; иначе - сортировка и np.add.reduceat
+DENSE_BINS_FACTOR = 4
+
+# Предел числа ячеек, при котором линейный индекс помещается в int64
+MAX_FLAT_BINS = 2 ** 62
+
+
+def narrow_keys(cells):
+    """
+    Индексы ячеек от нуля по каждой оси в самом узком беззнаковом типе,
+    вмещающем число ячеек (uint8, uint16 или uint32; иначе int64).
+
+    cells - номера ячеек по осям (массивы с целыми значениями, обычно
+    float после деления с округлением вниз); массивы изменяются на месте.
+    Возвращает ключи, смещения (номер первой ячейки) и форму сетки.
+    """
+    keys, offsets, shape = [], [], []
+    for c in cells:
+        lo = int(c.min()) if len(c) else 0
+        n = int(c.max()) - lo + 1 if len(c) else 1
+        dtype = np.min_scalar_type(n - 1)
+        if dtype.itemsize == 8:
+            dtype = np.dtype(np.int64)
+        np.subtract(c, lo, out=c, casting='unsafe')
+        keys.append(c.astype(dtype))
+        offsets.append(lo)
+        shape.append(n)
+    return keys, offsets, tuple(shape)
+
+
+def result_dtype(*arrays):
+    """Тип колонок результата: тип входных данных с плавающей точкой (float32 в компактном режиме)"""
+    dtype = np.result_type(*arrays)
+    return dtype if dtype.kind == 'f' else np.dtype(np.float64)
+
+
+class BinningEngine:
+    """
+    Прореживание точек через линейный индекс ячейки.
+
+    Для каждой точки вычисляется один целочисленный индекс ячейки, после
+    чего количество точек и суммы x, y, z, T по ячейкам считаются через
+    np.bincount (плотные сетки) или через сортировку и np.add.reduceat
+    (разреженные сетки). Память результата ограничена числом занятых
+    ячеек, а не nx * ny * nz.
+
+    Ключи ячеек - временные массивы узких целых типов (narrow_keys), к
+    данным вызывающего они не добавляются. Суммы копятся в float64, а
+    колонки результата имеют тип входных данных (float32 в компактном
+    режиме DataLoader).
+    """
+
+    def bin_points(self, x, y, z, T, bin_widths=(0.5, 0.5, 0.5), origin=None, output='centroid'):
+        """
+        Биннинг точек с шагом bin_widths.
+
+        Параметры:
+        ----------
+        origin : tuple или None
+            Начало сетки (x0, y0, z0); по умолчанию - минимумы координат
+        output : str
+            'centroid' - средние координаты точек ячейки,
+            'center' - центры ячеек (равномерная сетка)
+
+        Возвращает DataFrame с колонками x, y, z, T и словарь с параметрами сетки.
+        """
+        coords = [np.asarray(c) for c in (x, y, z)]
+        T = np.asarray(T)
+        dtype = result_dtype(*coords, T)
+        if origin is None:
+            origin = tuple(float(c.min()) for c in coords)
+
+        keys, offsets, shape = narrow_keys([(c - o) // w for c, o, w in zip(coords, origin, bin_widths)])
+
+        bins, counts, sums = self.reduce_bins(keys, shape, [*coords, T])
+        bins = tuple(b + o for b, o in zip(bins, offsets))
+
+        result = {}
+        for i, col in enumerate(['x', 'y', 'z']):
+            if output == 'center':
+                result[col] = (origin[i] + (bins[i] + 0.5) * bin_widths[i]).astype(dtype, copy=False)
+            else:
+                result[col] = (sums[i] / counts).astype(dtype, copy=False)
+        result['T'] = (sums[3] / counts).astype(dtype, copy=False)
+
+        grid = {'origin': origin, 'shape': shape, 'bins': bins, 'counts': counts}
+        return pd.DataFrame(result), grid
+
+    def round_points(self, x, y, z, T, precision=0):
+        """
+        Прореживание округлением координат до precision знаков с
+        усреднением температуры. При precision = 0 координаты целые, при
+        отрицательном precision - кратные 10 ** -precision (как round).
+        """
+        scale = 10.0 ** precision
+        coords = [np.asarray(c) for c in (x, y, z)]
+        T = np.asarray(T)
+        dtype = result_dtype(*coords, T)
+        keys, offsets, shape = narrow_keys([np.rint(c * scale) for c in coords])
+
+        bins, counts, sums = self.reduce_bins(keys, shape, [T])
+
+        result = {}
+        for i, col in enumerate(['x', 'y', 'z']):
+            rounded = bins[i] + offsets[i]
+            if precision > 0:
+                rounded = (rounded / scale).astype(dtype, copy=False)
+            elif precision < 0:
+                # Умножение на целую степень десяти точнее деления на scale < 1
+                rounded = (rounded * 10.0 ** -precision).astype(dtype, copy=False)
+            elif dtype == np.float32:
+                # В компактном режиме целые координаты тоже хранятся как float32
+                rounded = rounded.astype(dtype)
+            result[col] = rounded
+        result['T'] = (sums[0] / counts).astype(dtype, copy=False)
+        return pd.DataFrame(result)
+
+    def reduce_bins(self, keys, shape, values):
+        """
+        Свертка значений по ячейкам.
+
+        keys - целочисленные индексы ячейки по каждой оси (от 0 до shape[i] - 1,
+        любого целого типа), values - массивы, по которым считаются суммы.
+        Возвращает индексы занятых ячеек по осям (int64), число точек и
+        суммы (float64) в порядке возрастания линейного индекса.
+        """
+        num_points = len(keys[0])
+        total_bins = 1
+        for n in shape:
+            total_bins *= n
+
+        if total_bins < MAX_FLAT_BINS:
+            flat = np.ravel_multi_index(keys, shape)
+
+            if total_bins <= DENSE_BINS_FACTOR * max(num_points, 1):
+                # Плотная сетка: один проход np.bincount на каждую величину
+                counts = np.bincount(flat, minlength=total_bins)
+                occupied = np.flatnonzero(counts)
+                sums = [np.bincount(flat, weights=v, minlength=total_bins)[occupied] for v in values]
+                bins = np.unravel_index(occupied, shape)
+                return bins, counts[occupied], sums
+
+            order = np.argsort(flat, kind='stable')
+            sorted_keys = flat[order]
+        else:
+            # Слишком большая сетка для линейного индекса: лексикографическая сортировка
+            order = np.lexsort(keys[::-1])
+            sorted_keys = np.stack([k[order] for k in keys])
+
+        # Разреженная сетка: сортировка и свертка отрезков одинаковых индексов
+        if sorted_keys.ndim == 1:
+            changes = np.diff(sorted_keys) != 0
+        else:
+            changes = np.any(np.diff(sorted_keys, axis=1) != 0, axis=0)
+        starts = np.concatenate(([0], np.flatnonzero(changes) + 1)) if num_points else np.empty(0, np.int64)
+        counts = np.diff(np.append(starts, num_points))
+        sums = [np.add.reduceat(v[order], starts, dtype=np.float64) if num_points else np.empty(0)
+                for v in values]
+        bins = tuple(k[order][starts].astype(np.int64) for k in keys)
+        return bins, counts, sums
+
+
+# Минимальное число ячеек в буфере частичных результатов перед слиянием
+MIN_MERGE_BINS = 1 << 16
+
+
+class BinAccumulator:
+    """
+    Накопитель биннинга для потоковой обработки данных блоками.
+
+    Каждый блок сворачивается по своим ячейкам (BinningEngine.reduce_bins),
+    а частичные результаты сливаются сортировкой по индексам ячеек. Слияние
+    откладывается, пока буфер меньше уже накопленного результата, поэтому
+    память пропорциональна числу занятых ячеек, а не числу точек.
+
+    Начало сетки origin должно быть известно заранее: при origin, равном
+    минимумам координат, результат совпадает с BinningEngine.bin_points.
+    """
+
+    def __init__(self, bin_widths, origin, engine: BinningEngine = None):
+        self.bin_widths = tuple(float(w) for w in bin_widths)
+        self.origin = tuple(float(o) for o in origin)
+        self.engine = engine or BinningEngine()
+        self.num_points = 0
+        # Тип колонок результата по добавленным блокам, как у bin_points
+        self.dtype = None
+
+        self._bins = tuple(np.empty(0, dtype=np.int64) for _ in range(3))
+        self._counts = np.empty(0, dtype=np.int64)
+        self._sums = [np.empty(0) for _ in range(4)]
+        self._pending = []
+        self._pending_bins = 0
+
+    def add(self, x, y, z, T):
+        """Добавление блока точек"""
+        coords = [np.asarray(c) for c in (x, y, z)]
+        T = np.asarray(T)
+        if len(T) == 0:
+            return
+        dtype = result_dtype(*coords, T)
+        self.dtype = dtype if self.dtype is None else np.promote_types(self.dtype, dtype)
+
+        keys, offsets, shape = narrow_keys([(c - o) // w for c, o, w in zip(coords, self.origin, self.bin_widths)])
+
+        bins, counts, sums = self.engine.reduce_bins(keys, shape, [*coords, T])
+        bins = tuple(b + o for b, o in zip(bins, offsets))
+
+        self.num_points += len(T)
+        self._pending.append((bins, counts, sums))
+        self._pending_bins += len(counts)
+        if self._pending_bins >= max(len(self._counts), MIN_MERGE_BINS):
+            self._merge()
+
+    def _merge(self):
+        """Слияние накопленного результата с буфером частичных результатов"""
+        if not self._pending:
+            return
+
+        parts = [(self._bins, self._counts, self._sums)] + self._pending
+        bins = [np.concatenate([p[0][i] for p in parts]) for i in range(3)]
+        counts = np.concatenate([p[1] for p in parts])
+        sums = [np.concatenate([p[2][i] for p in parts]) for i in range(4)]
+        self._pending = []
+        self._pending_bins = 0
+
+        # Порядок по (x, y, z) совпадает с порядком линейного индекса ячеек
+        order = np.lexsort(bins[::-1])
+        bins = [b[order] for b in bins]
+        changes = np.any([np.diff(b) != 0 for b in bins], axis=0)
+        starts = np.concatenate(([0], np.flatnonzero(changes) + 1))
+
+        self._bins = tuple(b[starts] for b in bins)
+        self._counts = np.add.reduceat(counts[order], starts)
+        self._sums = [np.add.reduceat(s[order], starts) for s in sums]
+
+    def result(self, output='centroid'):
+        """
+        Итог биннинга: DataFrame с колонками x, y, z, T и словарь с
+        параметрами сетки, как у BinningEngine.bin_points.
+        """
+        self._merge()
+        bins, counts, sums = self._bins, self._counts, self._sums
+        dtype = self.dtype or np.dtype(np.float64)
+
+        result = {}
+        for i, col in enumerate(['x', 'y', 'z']):
+            if output == 'center':
+                result[col] = (self.origin[i] + (bins[i] + 0.5) * self.bin_widths[i]).astype(dtype, copy=False)
+            else:
+                result[col] = (sums[i] / counts).astype(dtype, copy=False)
+        result['T'] = (sums[3] / counts).astype(dtype, copy=False)
+
+        shape = tuple(int(b.max() - b.min()) + 1 if len(b) else 1 for b in bins)
+        grid = {'origin': self.origin, 'shape': shape, 'bins': bins, 'counts': counts}
+        return pd.DataFrame(result), grid
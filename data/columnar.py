@@ -0,0 +1,421 @@
+import importlib
+import importlib.util
+import json
+import os
+import struct
+import zipfile
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['x', 'y', 'z', 'T']
+AXES = ['x', 'y', 'z']
+
+# Число строк в одном блоке (row group Parquet, пакет Feather, блок NPZ)
+CHUNK_ROWS = 65536
+
+# Разрядность ячеек пространственной сортировки по каждой оси
+SORT_BITS = 8
+
+# Ключ таблицы точек в HDF5 файле
+HDF5_KEY = 'points'
+
+# Ключ метаданных Feather с границами блоков
+FEATHER_BOUNDS_KEY = b'thermal.chunk_bounds'
+
+# Формат по расширению файла
+FORMATS = {
+    '.npz': 'npz',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.h5': 'hdf5',
+    '.hdf5': 'hdf5',
+}
+COLUMNAR_EXTENSIONS = tuple(FORMATS)
+
+# Необязательные пакеты для форматов: (модуль, пакет pip)
+REQUIREMENTS = {
+    'parquet': ('pyarrow', 'pyarrow'),
+    'feather': ('pyarrow', 'pyarrow'),
+    'hdf5': ('tables', 'tables'),
+}
+
+
+def columnar_format(file_path):
+    """Колоночный формат файла по расширению или None"""
+    return FORMATS.get(os.path.splitext(file_path)[1].lower())
+
+
+def available_formats():
+    """Форматы, которые можно читать и писать (NPZ доступен всегда)"""
+    return ['npz'] + [name for name, (module, _) in REQUIREMENTS.items()
+                      if importlib.util.find_spec(module) is not None]
+
+
+def _require(module, format_name):
+    """Импорт необязательного пакета с понятной ошибкой при его отсутствии"""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        package = REQUIREMENTS[format_name][1]
+        raise ImportError(f"Для формата {format_name} нужен пакет {package} (pip install {package})") from None
+
+
+def _overlaps(mins, maxs, bounds):
+    """Маска блоков, границы которых пересекают область bounds"""
+    mask = np.ones(len(mins), dtype=bool)
+    for i, axis in enumerate(AXES):
+        if axis in bounds:
+            lo, hi = bounds[axis]
+            mask &= (maxs[:, i] >= lo) & (mins[:, i] <= hi)
+    return mask
+
+
+def filter_rows(block, bounds):
+    """Строки блока (n, 4), попадающие в область bounds"""
+    if not bounds:
+        return block
+    mask = np.ones(len(block), dtype=bool)
+    for i, axis in enumerate(AXES):
+        if axis in bounds:
+            lo, hi = bounds[axis]
+            mask &= (block[:, i] >= lo) & (block[:, i] <= hi)
+    return block[mask]
+
+
+class ColumnarStore:
+    """
+    Чтение и запись точек в колоночных бинарных форматах.
+
+    NPZ работает всегда (только numpy), Parquet и Feather - при наличии
+    pyarrow, HDF5 - при наличии PyTables. Читаются только колонки x, y, z,
+    T. При записи точки упорядочиваются по ячейкам пространственной
+    сетки (код Мортона) и делятся на блоки не больше chunk_rows строк, для
+    каждого блока сохраняются границы x, y, z. Поэтому чтение с bounds -
+    словарем {ось: (min, max)}, например полосой вокруг плоскости среза, -
+    разбирает только блоки, пересекающие область: в NPZ и Feather по
+    сохраненным границам, в Parquet по статистике row group, в HDF5
+    запросом where к индексированным колонкам.
+
+    NPZ пишется без сжатия, и колонки отображаются в память прямо из
+    архива, так что сохраненный файл открывается почти мгновенно.
+    """
+
+    def __init__(self, chunk_rows=CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+
+    def load(self, file_path, bounds=None, progress=None):
+        """
+        Загрузка точек в DataFrame с колонками x, y, z, T.
+
+        bounds - словарь {ось: (min, max)}; без него NPZ файл не читается
+        целиком, а отображается в память. progress - см. data.progress.
+        """
+        if not bounds and columnar_format(file_path) == 'npz':
+            return self._map_npz(file_path)
+
+        blocks = list(self.iter_blocks(file_path, bounds, progress))
+        if not blocks:
+            return pd.DataFrame(columns=COLUMNS, dtype=np.float64)
+        data = np.concatenate(blocks)
+        return pd.DataFrame({col: data[:, i] for i, col in enumerate(COLUMNS)})
+
+    def iter_blocks(self, file_path, bounds=None, progress=None):
+        """
+        Генератор блоков точек (массивы формы (n, 4): x, y, z, T).
+
+        Блоки вне bounds не читаются, строки остальных блоков
+        фильтруются по bounds точно.
+        """
+        readers = {
+            'npz': self._iter_npz,
+            'parquet': self._iter_parquet,
+            'feather': self._iter_feather,
+            'hdf5': self._iter_hdf5,
+        }
+        file_format = columnar_format(file_path)
+        if file_format is None:
+            raise ValueError(f"Неподдерживаемый формат файла: {file_path}")
+
+        bounds = bounds or {}
+        read_bytes = 0
+        rows = 0
+        for block, count, num_selected in readers[file_format](file_path, bounds):
+            read_bytes += block.nbytes
+            block = filter_rows(block, bounds)
+            block = block[~np.isnan(block).any(axis=1)]
+            rows += len(block)
+            if progress is not None:
+                # Объем оставшихся блоков оценивается по уже прочитанным
+                progress(f"чтение {file_format}", read_bytes, read_bytes * num_selected // count, rows)
+            if len(block):
+                yield block
+
+    def save(self, df, file_path, file_format=None):
+        """Запись колонок x, y, z, T (формат по умолчанию - по расширению файла)"""
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Данные должны быть pandas DataFrame")
+        missing = [col for col in COLUMNS if col not in df.columns]
+        if missing:
+            raise ValueError(f"В данных нет колонок: {', '.join(missing)}")
+
+        writers = {
+            'npz': self._save_npz,
+            'parquet': self._save_parquet,
+            'feather': self._save_feather,
+            'hdf5': self._save_hdf5,
+        }
+        file_format = file_format or columnar_format(file_path)
+        if file_format not in writers:
+            raise ValueError(f"Неподдерживаемый формат файла: {file_path}")
+
+        columns, offsets = self._layout(df)
+        # Пишем во временный файл, чтобы недописанный файл не заменил прежний
+        tmp_path = file_path + '.tmp'
+        try:
+            writers[file_format](columns, offsets, tmp_path)
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        print(f"Данные сохранены в {file_path} ({len(df)} точек, {file_format})")
+
+    def _layout(self, df):
+        """
+        Колонки x, y, z, T, упорядоченные по коду Мортона ячеек, и границы
+        блоков: массив смещений длиной n_chunks + 1.
+
+        Блоки - это ячейки октодерева (или группы соседних ячеек) не больше
+        chunk_rows точек, поэтому каждый блок компактен по всем трем осям.
+        """
+        columns = {col: df[col].to_numpy() for col in COLUMNS}
+        num_rows = len(df)
+        if num_rows <= self.chunk_rows:
+            return columns, np.array([0, num_rows] if num_rows else [0], dtype=np.int64)
+
+        cells = (1 << SORT_BITS) - 1
+        code = np.zeros(num_rows, dtype=np.uint32)
+        for shift, axis in enumerate(AXES):
+            values = columns[axis]
+            lo, hi = np.nanmin(values), np.nanmax(values)
+            scale = cells / (hi - lo) if hi > lo else 0.0
+            cell = np.nan_to_num((values - lo) * scale).astype(np.uint32)
+            for bit in range(SORT_BITS):
+                code |= ((cell >> bit) & 1) << (3 * bit + shift)
+
+        order = np.argsort(code, kind='stable')
+        code = code[order]
+        columns = {col: values[order] for col, values in columns.items()}
+        return columns, self._chunk_offsets(code)
+
+    def _chunk_offsets(self, code):
+        """Смещения блоков в отсортированном по коду Мортона массиве"""
+        # Переполненные ячейки делятся на 8 дочерних, пока не уместятся в блок
+        segments = [(0, len(code))]
+        for level in range(1, SORT_BITS + 1):
+            shift = 3 * (SORT_BITS - level)
+            split = []
+            for start, end in segments:
+                if end - start <= self.chunk_rows:
+                    split.append((start, end))
+                    continue
+                prefix = code[start:end] >> shift
+                cuts = start + np.flatnonzero(np.diff(prefix)) + 1
+                bounds = [start, *cuts.tolist(), end]
+                split.extend(zip(bounds[:-1], bounds[1:]))
+            segments = split
+
+        # Соседние мелкие ячейки объединяются, ячейки самого подробного
+        # уровня, которые все еще больше блока, делятся поровну
+        offsets = [0]
+        for start, end in segments:
+            if end - offsets[-1] > self.chunk_rows and start > offsets[-1]:
+                offsets.append(start)
+            offsets.extend(range(offsets[-1] + self.chunk_rows, end, self.chunk_rows))
+        offsets.append(len(code))
+        return np.array(offsets, dtype=np.int64)
+
+    @staticmethod
+    def _chunk_bounds(columns, offsets):
+        """Минимумы и максимумы x, y, z по блокам: два массива (n_chunks, 3)"""
+        starts = offsets[:-1]
+        if len(columns['x']) == 0:
+            return np.empty((0, 3)), np.empty((0, 3))
+        mins = np.column_stack([np.fmin.reduceat(columns[axis], starts) for axis in AXES])
+        maxs = np.column_stack([np.fmax.reduceat(columns[axis], starts) for axis in AXES])
+        return mins, maxs
+
+    # --- NPZ ---
+
+    def _save_npz(self, columns, offsets, file_path):
+        mins, maxs = self._chunk_bounds(columns, offsets)
+        # Файловый объект: np.savez иначе добавит к имени расширение .npz
+        with open(file_path, 'wb') as file:
+            np.savez(file, **columns, chunk_offsets=offsets, chunk_mins=mins, chunk_maxs=maxs)
+
+    def _npz_member(self, file, archive, name):
+        """Колонка несжатого NPZ архива, отображенная в память, или None"""
+        info = archive.getinfo(name + '.npy')
+        if info.compress_type != zipfile.ZIP_STORED:
+            return None
+
+        # Данные члена архива начинаются после локального заголовка ZIP
+        file.seek(info.header_offset)
+        header = file.read(30)
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        file.seek(info.header_offset + 30 + name_length + extra_length)
+
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        if dtype.hasobject:
+            return None
+        if int(np.prod(shape)) == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(file.name, dtype=dtype, mode='r', offset=file.tell(), shape=shape,
+                         order='F' if fortran_order else 'C')
+
+    def _npz_columns(self, file_path):
+        """Колонки x, y, z, T NPZ файла (по возможности без чтения в память)"""
+        columns = {}
+        with open(file_path, 'rb') as file, zipfile.ZipFile(file) as archive:
+            names = {name[:-4] for name in archive.namelist() if name.endswith('.npy')}
+            missing = [col for col in COLUMNS if col not in names]
+            if missing:
+                raise ValueError(f"В файле {file_path} нет колонок: {', '.join(missing)}")
+            for col in COLUMNS:
+                columns[col] = self._npz_member(file, archive, col)
+
+        not_mapped = [col for col, values in columns.items() if values is None]
+        if not_mapped:
+            # Сжатый архив (np.savez_compressed) читается обычным способом
+            with np.load(file_path) as npz:
+                for col in not_mapped:
+                    columns[col] = npz[col]
+        return columns
+
+    def _map_npz(self, file_path):
+        columns = self._npz_columns(file_path)
+        return pd.DataFrame(columns, copy=False)
+
+    def _iter_npz(self, file_path, bounds):
+        columns = self._npz_columns(file_path)
+        num_rows = len(columns['x'])
+        with np.load(file_path) as npz:
+            if 'chunk_offsets' in npz.files:
+                offsets = npz['chunk_offsets']
+                selected = np.flatnonzero(_overlaps(npz['chunk_mins'], npz['chunk_maxs'], bounds))
+            else:
+                # Файл записан не этой программой - блоки без границ
+                offsets = np.append(np.arange(0, num_rows, self.chunk_rows), num_rows)
+                selected = np.arange(len(offsets) - 1)
+
+        for count, chunk in enumerate(selected, 1):
+            start, end = offsets[chunk], offsets[chunk + 1]
+            block = np.column_stack([columns[col][start:end] for col in COLUMNS])
+            yield block.astype(np.float64, copy=False), count, len(selected)
+
+    # --- Parquet ---
+
+    def _save_parquet(self, columns, offsets, file_path):
+        pa = _require('pyarrow', 'parquet')
+        pq = _require('pyarrow.parquet', 'parquet')
+        table = pa.table(columns)
+        # Каждый блок - отдельная row group, ее статистика min/max и есть границы блока
+        with pq.ParquetWriter(file_path, table.schema) as writer:
+            bounds_list = offsets.tolist()
+            for start, end in zip(bounds_list[:-1], bounds_list[1:]):
+                writer.write_table(table.slice(start, end - start), row_group_size=end - start)
+
+    def _iter_parquet(self, file_path, bounds):
+        pq = _require('pyarrow.parquet', 'parquet')
+        parquet = pq.ParquetFile(file_path)
+        metadata = parquet.metadata
+
+        selected = []
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            if self._row_group_overlaps(row_group, bounds):
+                selected.append(i)
+
+        for count, i in enumerate(selected, 1):
+            table = parquet.read_row_group(i, columns=COLUMNS)
+            block = np.column_stack([table.column(col).to_numpy() for col in COLUMNS])
+            yield block.astype(np.float64, copy=False), count, len(selected)
+
+    @staticmethod
+    def _row_group_overlaps(row_group, bounds):
+        """Пересекает ли row group область bounds (по статистике колонок)"""
+        for j in range(row_group.num_columns):
+            column = row_group.column(j)
+            axis = column.path_in_schema
+            if axis not in bounds:
+                continue
+            statistics = column.statistics
+            if statistics is None or not statistics.has_min_max:
+                continue
+            lo, hi = bounds[axis]
+            if statistics.max < lo or statistics.min > hi:
+                return False
+        return True
+
+    # --- Feather ---
+
+    def _save_feather(self, columns, offsets, file_path):
+        pa = _require('pyarrow', 'feather')
+        mins, maxs = self._chunk_bounds(columns, offsets)
+        bounds = json.dumps({'mins': mins.tolist(), 'maxs': maxs.tolist()})
+        table = pa.table(columns).replace_schema_metadata({FEATHER_BOUNDS_KEY: bounds})
+        # Feather V2 - это файл Arrow IPC; каждый блок - отдельный пакет. Без
+        # сжатия пакеты читаются из отображенного в память файла без копирования
+        with pa.ipc.new_file(file_path, table.schema) as writer:
+            bounds_list = offsets.tolist()
+            for start, end in zip(bounds_list[:-1], bounds_list[1:]):
+                writer.write_table(table.slice(start, end - start), max_chunksize=end - start)
+
+    def _iter_feather(self, file_path, bounds):
+        pa = _require('pyarrow', 'feather')
+        reader = pa.ipc.open_file(pa.memory_map(file_path, 'r'))
+        num_batches = reader.num_record_batches
+
+        metadata = reader.schema.metadata or {}
+        if FEATHER_BOUNDS_KEY in metadata:
+            chunk_bounds = json.loads(metadata[FEATHER_BOUNDS_KEY])
+            mins = np.array(chunk_bounds['mins'], dtype=np.float64).reshape(-1, 3)
+            maxs = np.array(chunk_bounds['maxs'], dtype=np.float64).reshape(-1, 3)
+            selected = np.flatnonzero(_overlaps(mins, maxs, bounds)) if len(mins) == num_batches \
+                else np.arange(num_batches)
+        else:
+            selected = np.arange(num_batches)
+
+        for count, i in enumerate(selected, 1):
+            batch = reader.get_batch(int(i))
+            block = np.column_stack([batch.column(col).to_numpy() for col in COLUMNS])
+            yield block.astype(np.float64, copy=False), count, len(selected)
+
+    # --- HDF5 ---
+
+    def _save_hdf5(self, columns, offsets, file_path):
+        _require('tables', 'hdf5')
+        # Координаты - индексируемые колонки, по ним работает запрос where
+        pd.DataFrame(columns, copy=False).to_hdf(file_path, key=HDF5_KEY, mode='w', format='table',
+                                                 data_columns=AXES, index=False,
+                                                 chunksize=self.chunk_rows)
+
+    def _iter_hdf5(self, file_path, bounds):
+        _require('tables', 'hdf5')
+        where = []
+        for axis in AXES:
+            if axis in bounds:
+                lo, hi = bounds[axis]
+                where += [f"{axis} >= {float(lo)!r}", f"{axis} <= {float(hi)!r}"]
+
+        with pd.HDFStore(file_path, mode='r') as store:
+            keys = store.keys()
+            key = HDF5_KEY if '/' + HDF5_KEY in keys else keys[0]
+            num_rows = store.get_storer(key).nrows
+            total = max((num_rows + self.chunk_rows - 1) // self.chunk_rows, 1)
+            frames = store.select(key, where=where or None, columns=COLUMNS, chunksize=self.chunk_rows)
+            for count, frame in enumerate(frames, 1):
+                yield frame[COLUMNS].to_numpy(dtype=np.float64), count, max(total, count)
@@ -0,0 +1,224 @@
+import json
+import os
+import shutil
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['x', 'y', 'z', 'T']
+
+# Файл блокировки сохранения; блокировка старше STALE_LOCK_SECONDS
+# считается оставшейся от прерванного процесса
+LOCK_NAME = 'save.lock'
+STALE_LOCK_SECONDS = 600
+
+
+class DataCache:
+    """
+    Бинарный кэш разобранных данных рядом с исходным файлом.
+
+    Каждая колонка хранится в отдельном .npy файле и открывается через
+    отображение в память. Кэш привязан к пути, размеру и времени изменения
+    исходного файла, а также к версии парсера; при несовпадении он
+    считается устаревшим и перестраивается. Колонки хранятся в типе dtype;
+    кэш float32 (компактный режим) лежит отдельно от кэша float64.
+
+    Каждое сохранение пишет колонки в новый подкаталог, а meta.json с его
+    именем заменяется последним. Файлы колонок, отображенные в память
+    живым набором данных, не перезаписываются (в Windows это невозможно);
+    старые подкаталоги удаляются, когда их уже никто не отображает.
+
+    Запись, замена метаданных и удаление старых подкаталогов выполняются
+    под файлом блокировки: если тот же файл одновременно сохраняет другой
+    процесс (например, рабочие процессы пакетной отрисовки), сохранение
+    пропускается.
+    """
+
+    def __init__(self, parser_version, cache_dir=None, dtype=np.float64):
+        self.parser_version = parser_version
+        # Если каталог не задан, кэш лежит рядом с файлом данных
+        self.cache_dir = cache_dir
+        self.dtype = np.dtype(dtype)
+
+    def get_cache_path(self, file_path):
+        """Каталог кэша для заданного файла"""
+        file_path = os.path.abspath(file_path)
+        suffix = ".cache" if self.dtype == np.float64 else f".{self.dtype.name}.cache"
+        name = f".{os.path.basename(file_path)}{suffix}"
+        if self.cache_dir:
+            return os.path.join(self.cache_dir, name)
+        return os.path.join(os.path.dirname(file_path), name)
+
+    def make_key(self, file_path):
+        """Ключ кэша: путь, размер, время изменения, версия парсера и тип колонок"""
+        stat = os.stat(file_path)
+        return {
+            'path': os.path.abspath(file_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'parser_version': self.parser_version,
+            'dtype': self.dtype.name
+        }
+
+    def load(self, file_path):
+        """Загрузка данных из кэша. Возвращает None, если кэш отсутствует или устарел"""
+        cache_path = self.get_cache_path(file_path)
+        meta_path = os.path.join(cache_path, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+
+        try:
+            start_time = time.perf_counter()
+            with open(meta_path, 'r', encoding='utf-8') as file:
+                meta = json.load(file)
+
+            if meta.get('key') != self.make_key(file_path) or 'columns_dir' not in meta:
+                print(f"Кэш для {file_path} устарел и будет перестроен")
+                return None
+
+            columns_path = os.path.join(cache_path, meta['columns_dir'])
+            columns = {
+                col: np.load(os.path.join(columns_path, f"{col}.npy"), mmap_mode='r')
+                for col in COLUMNS
+            }
+            df = pd.DataFrame(columns, copy=False)
+
+            elapsed = (time.perf_counter() - start_time) * 1000
+            print(f"Данные загружены из кэша за {elapsed:.1f} мс ({len(df)} точек)")
+            return df
+
+        except Exception as e:
+            print(f"Ошибка при чтении кэша {cache_path}: {e}")
+            return None
+
+    def save(self, file_path, df):
+        """Сохранение колонок x, y, z, T в кэш"""
+        cache_path = self.get_cache_path(file_path)
+        lock_path = None
+        try:
+            os.makedirs(cache_path, exist_ok=True)
+            lock_path = self._acquire_lock(cache_path)
+            if lock_path is None:
+                print(f"Кэш {cache_path} сохраняется другим процессом")
+                return
+            key = self.make_key(file_path)
+
+            # Колонки пишутся в новый подкаталог: прежние файлы могут быть
+            # отображены в память, и заменять их нельзя. Время в имени
+            # упорядочивает подкаталоги при удалении старых
+            columns_dir = f"columns.{time.time_ns()}.{os.getpid()}"
+            columns_path = os.path.join(cache_path, columns_dir)
+            os.makedirs(columns_path)
+            for col in COLUMNS:
+                np.save(os.path.join(columns_path, f"{col}.npy"),
+                        np.ascontiguousarray(df[col].to_numpy(dtype=self.dtype)))
+
+            # Метаданные заменяем последними, чтобы недописанный кэш не читался
+            meta_path = os.path.join(cache_path, 'meta.json')
+            tmp_path = os.path.join(cache_path, f"meta.{columns_dir}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({'key': key, 'rows': len(df), 'columns_dir': columns_dir}, file)
+            os.replace(tmp_path, meta_path)
+
+            self._remove_stale(cache_path, columns_dir)
+
+        except Exception as e:
+            print(f"Не удалось сохранить кэш {cache_path}: {e}")
+        finally:
+            if lock_path is not None:
+                try:
+                    os.remove(lock_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _acquire_lock(cache_path):
+        """
+        Создание файла блокировки сохранения. Возвращает его путь или None,
+        если кэш сейчас сохраняет другой процесс.
+        """
+        lock_path = os.path.join(cache_path, LOCK_NAME)
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) < STALE_LOCK_SECONDS:
+                        return None
+                    # Процесс, создавший блокировку, прервался
+                    os.remove(lock_path)
+                except OSError:
+                    pass
+                continue
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            return lock_path
+        return None
+
+    @staticmethod
+    def _columns_time(name):
+        """Время создания подкаталога колонок по его имени или None"""
+        parts = name.split('.')
+        if len(parts) != 3 or parts[0] != 'columns' or not parts[1].isdigit():
+            return None
+        return int(parts[1])
+
+    @classmethod
+    def _remove_stale(cls, cache_path, current):
+        """
+        Удаление подкаталогов колонок, созданных раньше текущего (и колонок
+        старого формата в корне кэша). Более новые подкаталоги не трогаются.
+        Отображенные в память файлы в Windows удалить нельзя - они остаются
+        до следующего сохранения.
+        """
+        current_time = cls._columns_time(current)
+        for name in os.listdir(cache_path):
+            path = os.path.join(cache_path, name)
+            created = cls._columns_time(name)
+            try:
+                if created is not None and created < current_time and os.path.isdir(path):
+                    shutil.rmtree(path)
+                elif name in {f"{col}.npy" for col in COLUMNS}:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def save_arrays(self, file_path, name, arrays):
+        """
+        Сохранение дополнительных массивов (например, пирамиды бинов) в
+        каталог кэша файла под именем name. Массивы привязаны к тому же
+        ключу, что и колонки кэша.
+        """
+        cache_path = self.get_cache_path(file_path)
+        try:
+            os.makedirs(cache_path, exist_ok=True)
+            key = json.dumps(self.make_key(file_path), sort_keys=True)
+            tmp_path = os.path.join(cache_path, f"{name}.{os.getpid()}.{threading.get_ident()}.tmp.npz")
+            with open(tmp_path, 'wb') as file:
+                np.savez(file, cache_key=np.array(key), **arrays)
+            os.replace(tmp_path, os.path.join(cache_path, f"{name}.npz"))
+        except Exception as e:
+            print(f"Не удалось сохранить {name} в кэш {cache_path}: {e}")
+
+    def load_arrays(self, file_path, name):
+        """Массивы, сохраненные save_arrays, или None, если их нет или они устарели"""
+        path = os.path.join(self.get_cache_path(file_path), f"{name}.npz")
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as npz:
+                if str(npz['cache_key']) != json.dumps(self.make_key(file_path), sort_keys=True):
+                    print(f"Кэш {name} для {file_path} устарел и будет перестроен")
+                    return None
+                return {key: npz[key] for key in npz.files if key != 'cache_key'}
+        except Exception as e:
+            print(f"Ошибка при чтении кэша {path}: {e}")
+            return None
+
+    def clear(self, file_path):
+        """Удаление кэша для заданного файла"""
+        cache_path = self.get_cache_path(file_path)
+        if not os.path.isdir(cache_path):
+            return
+        shutil.rmtree(cache_path)
@@ -1,105 +1,234 @@
+import importlib.util
+import os
+import time
 import pandas as pd
 import numpy as np
+from data.data_cache import DataCache
+from data.binning import BinningEngine, BinAccumulator
+from data.columnar import ColumnarStore, columnar_format, filter_rows
+from data.progress import LoadCancelled
+from data.structured_grid import StructuredGrid
+from utils.profiler import profiler
+
+# Версия парсера: при изменении формата разбора кэш перестраивается
+PARSER_VERSION = 2
+
+# Размер блока при потоковом чтении DAT файлов (байт)
+DAT_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Число строк в блоке при потоковом чтении CSV файлов
+CSV_CHUNK_ROWS = 1_000_000
+
+# CSV файлы больше этого размера читаются блоками (байт)
+CSV_SINGLE_READ_BYTES = 256 * 1024 * 1024
+
+# Сколько байт и строк начала CSV файла смотрим для определения формата
+CSV_SNIFF_BYTES = 64 * 1024
+CSV_SNIFF_LINES = 20
+
+# Парсер CSV: многопоточный pyarrow, если установлен, иначе C парсер pandas
+_csv_engine = None
+
+
+def csv_engine():
+    """Имя самого быстрого доступного парсера CSV для pd.read_csv"""
+    global _csv_engine
+    if _csv_engine is None:
+        # Наличие пакета проверяем без импорта: pyarrow загрузит сам pandas
+        _csv_engine = 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+    return _csv_engine
+
+
+def _is_number(token):
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
 
 class DataLoader:
-    def __init__(self):
-        pass
+    def __init__(self, cache_dir=None, compact=False):
+        # Компактный режим: колонки x, y, z, T хранятся как float32, что
+        # вдвое уменьшает память исходных и прореженных данных
+        self.compact = compact
+        self.dtype = np.dtype(np.float32 if compact else np.float64)
+        self.data_cache = DataCache(PARSER_VERSION, cache_dir, self.dtype)
+        self.binning_engine = BinningEngine()
+        self.columnar = ColumnarStore()
     
-    def load_from_csv(self, file_path):
-        """Загрузка данных из CSV файла с использованием pandas"""
+    def load_from_csv(self, file_path, chunk_rows=CSV_CHUNK_ROWS, progress=None):
+        """
+        Загрузка данных из CSV файла за один проход.
+
+        Заголовок и разделитель определяются по началу файла (sniff_csv),
+        затем читаются только колонки x, y, z, T сразу в типе self.dtype
+        (float64, в компактном режиме - float32).
+        Если установлен pyarrow, файл разбирается его многопоточным
+        парсером; большие файлы читаются блоками по chunk_rows строк.
+        С progress (см. data.progress) файл всегда читается блоками, чтобы
+        сообщать о ходе чтения и проверять отмену.
+        """
         try:
-            # Сначала попробуем прочитать с заголовком
-            try:
-                # Пробуем прочитать с заголовком
-                df = pd.read_csv(
-                    file_path,
-                    comment='#',
-                    skip_blank_lines=True,
-                    header=0,  # Первая строка - заголовок
-                    encoding='utf-8',
-                    on_bad_lines='warn'
-                )
-                
-                # Проверяем, есть ли нужные колонки (регистронезависимо)
-                df.columns = df.columns.str.strip().str.lower()
-                expected_columns = ['x', 'y', 'z', 't']
-                
-                # Проверяем наличие необходимых столбцов
-                if all(col in df.columns for col in expected_columns):
-                    # Оставляем только нужные колонки и переименовываем
-                    df = df[expected_columns].copy()
-                    df.columns = ['x', 'y', 'z', 'T']
-                else:
-                    # Если нужных колонок нет, возможно это данные без заголовка
-                    raise ValueError("Заголовок не содержит ожидаемых колонок")
-                    
-            except (ValueError, pd.errors.ParserError):
-                # Читаем как данные без заголовка
-                df = pd.read_csv(
-                    file_path,
-                    comment='#',
-                    skip_blank_lines=True,
-                    header=None,  # Нет заголовка
-                    names=['x', 'y', 'z', 'T'],  # Имена столбцов
-                    encoding='utf-8',
-                    on_bad_lines='warn'
-                )
-            
-            # Преобразуем столбцы к числовым типам
-            for col in ['x', 'y', 'z', 'T']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
+            layout = self.sniff_csv(file_path)
+            if layout is None:
+                print(f"Предупреждение: файл {file_path} не содержит числовых данных")
+                return pd.DataFrame(columns=['x', 'y', 'z', 'T'])
+
+            df = None
+            if progress is None and os.path.getsize(file_path) <= CSV_SINGLE_READ_BYTES:
+                engine = csv_engine()
+                if engine != 'c':
+                    try:
+                        df = self._read_csv_fast(file_path, layout, engine)
+                    except Exception:
+                        # Комментарии и некорректные строки разбирает только C парсер
+                        df = None
+                if df is None:
+                    frames = list(self._iter_csv_frames(file_path, layout, None))
+            else:
+                frames = list(self._iter_csv_frames(file_path, layout, chunk_rows, progress))
+            if df is None:
+                df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
             # Удаляем строки с NaN значениями
             df = df.dropna()
-            
+
             # Проверяем, есть ли данные
             if len(df) == 0:
                 print(f"Предупреждение: файл {file_path} не содержит числовых данных")
-            
+
             return df
-            
+
+        except LoadCancelled:
+            raise
         except Exception as e:
             print(f"Ошибка при загрузке CSV файла {file_path}: {e}")
             return pd.DataFrame(columns=['x', 'y', 'z', 'T'])
-    
-    def load_from_dat(self, file_path, fl_binning = False, bin_width_x=0.5, bin_width_y=0.5, bin_width_z=0.5):
-        """Загрузка данных из DAT файла"""
+
+    def sniff_csv(self, file_path, sample_size=CSV_SNIFF_BYTES):
+        """
+        Определение формата CSV файла по первым sample_size байтам.
+
+        Возвращает словарь с разделителем (sep), числом строк до данных
+        (skiprows: заголовок и комментарии перед ним), числом колонок
+        (num_fields) и номерами колонок x, y, z, T (usecols) или None,
+        если в начале файла нет строк.
+        """
+        with open(file_path, 'rb') as file:
+            sample = file.read(sample_size)
+        text = sample.decode('utf-8', errors='replace').lstrip('\ufeff')
+
+        # Номера и текст непустых строк без комментариев
+        lines = [(i, line.strip()) for i, line in enumerate(text.splitlines()[:CSV_SNIFF_LINES])]
+        lines = [(i, line) for i, line in lines if line and not line.startswith('#')]
+        if not lines:
+            return None
+        first_line, lines = lines[0][0], [line for _, line in lines]
+
+        # Разделитель - самый частый из кандидатов, иначе пробелы
+        counts = {candidate: sum(line.count(candidate) for line in lines) for candidate in (',', ';', '\t')}
+        sep = max(counts, key=counts.get)
+        if counts[sep] == 0:
+            sep = r'\s+'
+
+        tokens = lines[0].split() if sep == r'\s+' else lines[0].split(sep)
+        tokens = [token.strip().strip('"\'') for token in tokens]
+        if all(_is_number(token) for token in tokens if token):
+            return {'sep': sep, 'skiprows': 0, 'num_fields': len(tokens), 'usecols': [0, 1, 2, 3]}
+
+        # Заголовок: ищем колонки x, y, z, t без учета регистра
+        columns = [token.lower() for token in tokens]
+        expected_columns = ['x', 'y', 'z', 't']
+        if all(col in columns for col in expected_columns):
+            usecols = [columns.index(col) for col in expected_columns]
+        else:
+            # Заголовок без нужных колонок: как и раньше, берем первые четыре
+            usecols = [0, 1, 2, 3]
+        return {'sep': sep, 'skiprows': first_line + 1, 'num_fields': len(tokens), 'usecols': usecols}
+
+    def _csv_options(self, layout):
+        """Аргументы pd.read_csv для формата из sniff_csv (колонки по номерам)"""
+        usecols = layout['usecols']
+        return {
+            'sep': layout['sep'],
+            'header': None,
+            # Число колонок задается явно, чтобы короткая первая строка не
+            # определяла его за весь файл
+            'names': list(range(max(layout['num_fields'], 4))),
+            'index_col': False,
+            'skiprows': layout['skiprows'],
+            'usecols': usecols,
+            'dtype': {col: self.dtype for col in usecols},
+            'encoding': 'utf-8'
+        }
+
+    def _columns_in_order(self, df, layout):
+        """Колонки прочитанного блока в порядке x, y, z, T"""
+        return pd.DataFrame({name: df[col] for name, col in zip(['x', 'y', 'z', 'T'], layout['usecols'])},
+                            copy=False)
+
+    def _read_csv_fast(self, file_path, layout, engine):
+        """Чтение всего файла многопоточным парсером (без комментариев и ошибок в строках)"""
+        options = self._csv_options(layout)
+        # Заголовок пропускается строкой, пустые строки pyarrow пропускает сам
+        df = pd.read_csv(file_path, engine=engine, **options)
+        return self._columns_in_order(df, layout)
+
+    def _iter_csv_frames(self, file_path, layout, chunk_rows=None, progress=None):
+        """
+        Чтение C парсером целиком (chunk_rows=None) или блоками.
+
+        Если в блоке встретились нечисловые значения, он читается заново
+        строками с преобразованием через pd.to_numeric (значения -> NaN).
+        После каждого блока вызывается progress (если задан) с позицией
+        в файле и числом прочитанных строк.
+        """
+        options = self._csv_options(layout)
+        common = {'comment': '#', 'skip_blank_lines': True, 'on_bad_lines': 'warn'}
+        file_size = os.path.getsize(file_path)
+        done = 0
+        rows = 0
         try:
-            # Читаем файл построчно
-            with open(file_path, 'r') as file:
-                lines = file.readlines()
-            
-            # Фильтруем строки, которые начинаются с числа или минуса (данные)
-            data_lines = []
-            for line in lines:
-                stripped = line.strip()
-                if stripped and (stripped[0].isdigit() or stripped[0] == '-'):
-                    data_lines.append(stripped)
-            
+            if chunk_rows is None:
+                yield self._columns_in_order(pd.read_csv(file_path, **options, **common), layout)
+                return
+            # Файл открываем сами, чтобы знать позицию чтения для progress
+            with open(file_path, 'rb') as file, \
+                    pd.read_csv(file, chunksize=chunk_rows, **options, **common) as reader:
+                for chunk in reader:
+                    rows += len(chunk)
+                    if progress is not None:
+                        progress("чтение CSV", file.tell(), file_size, rows)
+                    yield self._columns_in_order(chunk, layout)
+                    done += 1
+        except ValueError:
+            # Медленный путь для файлов с некорректными значениями; блоки,
+            # которые уже прочитаны, пропускаются (границы блоков те же)
+            options.pop('dtype')
+            with open(file_path, 'rb') as file, \
+                    pd.read_csv(file, chunksize=chunk_rows or CSV_CHUNK_ROWS, dtype=str, **options,
+                                **common) as reader:
+                for i, chunk in enumerate(reader):
+                    if i < done:
+                        continue
+                    for col in layout['usecols']:
+                        chunk[col] = pd.to_numeric(chunk[col], errors='coerce').astype(self.dtype)
+                    rows += len(chunk)
+                    if progress is not None:
+                        progress("чтение CSV", file.tell(), file_size, rows)
+                    yield self._columns_in_order(chunk, layout)
+
+    def load_from_dat(self, file_path, fl_binning = False, bin_width_x=0.5, bin_width_y=0.5, bin_width_z=0.5,
+                      dtype=None, chunk_size=DAT_CHUNK_SIZE):
+        """Загрузка данных из DAT файла (dtype=None - тип колонок self.dtype)"""
+        try:
+            df = self.read_dat_columns(file_path, dtype=dtype, chunk_size=chunk_size)
+
             # Если нет данных, возвращаем пустой DataFrame
-            if not data_lines:
-                return pd.DataFrame(columns=['x', 'y', 'z', 'T'])
-            
-            # Создаем DataFrame из отфильтрованных строк
-            # Используем регулярное выражение для разделения по пробелам
-            df = pd.DataFrame([line.split() for line in data_lines])
-            print(f"Есть {len(df)} записей в DAT")
-            
-            # Обрабатываем разное количество столбцов
-            if df.shape[1] >= 4:
-                df = df.iloc[:, :4]  # Берем только первые 4 столбца
-                df.columns = ['x', 'y', 'z', 'T']
-            else:
-                raise ValueError(f"Недостаточно столбцов в данных. Найдено: {df.shape[1]}")
-            
-            # Преобразуем к числовым типам
-            numeric_cols = ['x', 'y', 'z', 'T']
-            for col in numeric_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # Удаляем строки с NaN после преобразования
-            df = df.dropna()
-            
+            if df.empty:
+                return df
+
             if fl_binning:
                 return self.get_data_with_binning(df, bin_width_x, bin_width_y, bin_width_z)
             else:
@@ -109,15 +238,382 @@ class DataLoader:
         except Exception as e:
             print(f"Ошибка при загрузке DAT файла: {e}")
             return pd.DataFrame(columns=['x', 'y', 'z', 'T'])
+
+    def read_dat_columns(self, file_path, dtype=None, chunk_size=DAT_CHUNK_SIZE, progress=None):
+        """
+        Потоковое чтение DAT файла в DataFrame с колонками x, y, z, T.
+
+        Файл читается блоками по chunk_size байт, строки заголовков и
+        комментариев отбрасываются векторно, а значения записываются
+        сразу в заранее выделенные массивы колонок типа dtype (None -
+        self.dtype). После каждого блока вызывается progress (если задан,
+        см. data.progress).
+        """
+        dtype = self.dtype if dtype is None else np.dtype(dtype)
+        start_time = time.perf_counter()
+        file_size = os.path.getsize(file_path)
+
+        columns = None
+        num_rows = 0
+        num_lines = 0
+        max_tokens = 0
+
+        for num_blocks, (block, lines_in_block, tokens_in_block) in enumerate(
+                self.iter_dat_blocks(file_path, dtype, chunk_size), 1):
+            num_lines += lines_in_block
+            max_tokens = max(max_tokens, tokens_in_block)
+
+            if columns is None:
+                # Оцениваем число строк по первому блоку и размеру файла
+                capacity = max(len(block), int(file_size / max(chunk_size, 1) * len(block) * 1.1) + 1)
+                columns = [np.empty(capacity, dtype=dtype) for _ in range(4)]
+
+            if num_rows + len(block) > len(columns[0]):
+                capacity = max(2 * len(columns[0]), num_rows + len(block))
+                columns = [np.resize(column, capacity) for column in columns]
+
+            for i, column in enumerate(columns):
+                column[num_rows:num_rows + len(block)] = block[:, i]
+            num_rows += len(block)
+
+            if progress is not None:
+                # Блоки без строк данных не возвращаются, поэтому позиция приблизительная
+                progress("чтение DAT", min(file_size, num_blocks * chunk_size), file_size, num_rows)
+
+        if num_lines == 0:
+            return pd.DataFrame(columns=['x', 'y', 'z', 'T'])
+
+        print(f"Есть {num_lines} записей в DAT")
+
+        # Обрабатываем разное количество столбцов
+        if max_tokens < 4:
+            raise ValueError(f"Недостаточно столбцов в данных. Найдено: {max_tokens}")
+
+        df = pd.DataFrame({
+            name: columns[i][:num_rows] for i, name in enumerate(['x', 'y', 'z', 'T'])
+        })
+
+        # Удаляем строки с NaN после преобразования
+        df = df.dropna()
+
+        elapsed = time.perf_counter() - start_time
+        size_mb = file_size / (1024 * 1024)
+        speed = size_mb / elapsed if elapsed > 0 else float('inf')
+        print(f"Прочитано {size_mb:.1f} МБ за {elapsed:.2f} с ({speed:.1f} МБ/с)")
+
+        return df
+
+    def iter_dat_blocks(self, file_path, dtype=np.float64, chunk_size=DAT_CHUNK_SIZE):
+        """
+        Генератор блоков данных DAT файла.
+
+        Возвращает кортежи (block, lines, max_tokens), где block - массив
+        формы (n, 4) со значениями x, y, z, T, lines - число строк данных
+        в блоке, max_tokens - наибольшее число столбцов в строке блока.
+        """
+        with open(file_path, 'rb') as file:
+            tail = b''
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    break
+
+                buffer = tail + chunk
+                # Обрабатываем только целые строки, остаток переносим в следующий блок
+                last_newline = buffer.rfind(b'\n')
+                if last_newline < 0:
+                    tail = buffer
+                    continue
+                tail = buffer[last_newline + 1:]
+
+                result = self._parse_dat_chunk(buffer[:last_newline + 1], dtype)
+                if result[1]:
+                    yield result
+
+            if tail:
+                result = self._parse_dat_chunk(tail, dtype)
+                if result[1]:
+                    yield result
+
+    def _parse_dat_chunk(self, buffer, dtype=np.float64):
+        """Векторный разбор блока байтов DAT файла"""
+        raw = np.frombuffer(buffer, dtype=np.uint8)
+        is_space = (raw == 32) | (raw == 9) | (raw == 10) | (raw == 13) | (raw == 11) | (raw == 12)
+
+        # Границы строк
+        newlines = np.flatnonzero(raw == 10)
+        line_starts = np.concatenate(([0], newlines + 1))
+        line_ends = np.concatenate((newlines, [len(raw)]))
+
+        # Первый непробельный символ каждой строки
+        non_space = np.flatnonzero(~is_space)
+        if len(non_space) == 0:
+            return np.empty((0, 4), dtype=dtype), 0, 0
+        first = np.searchsorted(non_space, line_starts)
+        has_text = first < len(non_space)
+        first_pos = non_space[np.minimum(first, len(non_space) - 1)]
+        has_text &= first_pos < line_ends
+        first_char = raw[first_pos]
+
+        # Строки данных начинаются с цифры или минуса
+        is_data = has_text & (((first_char >= 48) & (first_char <= 57)) | (first_char == 45))
+        num_lines = int(np.count_nonzero(is_data))
+        if num_lines == 0:
+            return np.empty((0, 4), dtype=dtype), 0, 0
+
+        # Число столбцов в каждой строке: начало токена - непробельный символ после пробельного
+        token_starts = non_space[np.concatenate(([True], np.diff(non_space) > 1))]
+        token_line = np.searchsorted(line_starts, token_starts, side='right') - 1
+        tokens_per_line = np.bincount(token_line, minlength=len(line_starts))[is_data]
+        max_tokens = int(tokens_per_line.max())
+
+        # Отбираем байты строк данных
+        line_mask = np.repeat(is_data, line_ends - line_starts + 1)[:len(raw)]
+        data_bytes = raw[line_mask].tobytes()
+
+        if max_tokens >= 4 and np.all(tokens_per_line == max_tokens):
+            try:
+                values = np.fromstring(data_bytes, dtype=np.float64, sep=' ')
+            except ValueError:
+                values = None
+            if values is not None and len(values) == num_lines * max_tokens:
+                block = values.reshape(num_lines, max_tokens)[:, :4].astype(dtype, copy=False)
+                return block, num_lines, max_tokens
+
+        # Неоднородный блок: разбираем построчно как раньше
+        return self._parse_dat_lines(data_bytes, dtype), num_lines, max_tokens
+
+    def _parse_dat_lines(self, data_bytes, dtype=np.float64):
+        """Построчный разбор блока с неоднородными или некорректными строками"""
+        rows = [line.split()[:4] for line in data_bytes.decode('utf-8', errors='replace').splitlines()]
+        df = pd.DataFrame(rows)
+        df = df.reindex(columns=range(4))
+        block = np.empty((len(df), 4), dtype=dtype)
+        for i in range(4):
+            block[:, i] = pd.to_numeric(df[i], errors='coerce')
+        return block
     
-    def load_data(self, file_path, fl_binning = False, bin_width_x=0.5, bin_width_y=0.5, bin_width_z=0.5):
-        """Универсальный метод загрузки данных по расширению файла"""
+    def iter_csv_blocks(self, file_path, chunk_rows=CSV_CHUNK_ROWS):
+        """
+        Генератор блоков CSV файла: массивы формы (n, 4) со значениями
+        x, y, z, T. Формат определяется так же, как в load_from_csv,
+        строки с нечисловыми значениями отбрасываются.
+        """
+        layout = self.sniff_csv(file_path)
+        if layout is None:
+            return
+        for frame in self._iter_csv_frames(file_path, layout, chunk_rows):
+            block = frame.to_numpy(dtype=self.dtype)
+            block = block[~np.isnan(block).any(axis=1)]
+            if len(block):
+                yield block
+
+    def iter_blocks(self, file_path, chunk_size=DAT_CHUNK_SIZE):
+        """
+        Генератор блоков точек (массивы формы (n, 4): x, y, z, T) из DAT,
+        CSV или колоночного файла без загрузки всего файла в память.
+        Значения в типе self.dtype, как у исходных данных load_raw, чтобы
+        потоковый биннинг давал те же ячейки, что и биннинг в памяти.
+        """
+        if columnar_format(file_path):
+            for block in self.columnar.iter_blocks(file_path):
+                yield block.astype(self.dtype, copy=False)
+        elif file_path.endswith('.csv'):
+            yield from self.iter_csv_blocks(file_path)
+        elif file_path.endswith('.dat'):
+            for block, _, max_tokens in self.iter_dat_blocks(file_path, self.dtype, chunk_size):
+                if max_tokens < 4:
+                    raise ValueError(f"Недостаточно столбцов в данных. Найдено: {max_tokens}")
+                block = block[~np.isnan(block).any(axis=1)]
+                if len(block):
+                    yield block
+        else:
+            raise ValueError(f"Неподдерживаемый формат файла: {file_path}")
+
+    def scan_bounds(self, file_path, chunk_size=DAT_CHUNK_SIZE):
+        """
+        Быстрый проход по файлу: минимумы и максимумы x, y, z и число точек.
+        """
+        mins = np.full(3, np.inf)
+        maxs = np.full(3, -np.inf)
+        num_points = 0
+        for block in self.iter_blocks(file_path, chunk_size):
+            np.minimum(mins, block[:, :3].min(axis=0), out=mins)
+            np.maximum(maxs, block[:, :3].max(axis=0), out=maxs)
+            num_points += len(block)
+        return tuple(mins), tuple(maxs), num_points
+
+    def bin_file_streaming(self, file_path, bin_width_x=0.5, bin_width_y=0.5, bin_width_z=0.5,
+                           output='centroid', origin=None, chunk_size=DAT_CHUNK_SIZE):
+        """
+        Биннинг файла, не помещающегося в память.
+
+        Файл читается блоками, а в памяти хранятся только число точек и
+        суммы x, y, z, T по занятым бинам. Если origin не задан, начало
+        сетки (минимумы координат) находится отдельным проходом по файлу;
+        тогда результат совпадает с get_data_with_binning для того же файла.
+        """
+        start_time = time.perf_counter()
+        bin_widths = (bin_width_x, bin_width_y, bin_width_z)
+
+        if origin is None:
+            with profiler.stage("поиск границ"):
+                origin, _, num_points = self.scan_bounds(file_path, chunk_size)
+            if num_points == 0:
+                return pd.DataFrame(columns=['x', 'y', 'z', 'T'], dtype=self.dtype)
+
+        accumulator = BinAccumulator(bin_widths, origin, self.binning_engine)
+        with profiler.stage("потоковый биннинг"):
+            for block in self.iter_blocks(file_path, chunk_size):
+                accumulator.add(block[:, 0], block[:, 1], block[:, 2], block[:, 3])
+
+        if accumulator.num_points == 0:
+            return pd.DataFrame(columns=['x', 'y', 'z', 'T'], dtype=self.dtype)
+
+        result_df, grid = accumulator.result(output)
+        num_bins_x, num_bins_y, num_bins_z = grid['shape']
+
+        print(f"Количество бинов: X={num_bins_x}, Y={num_bins_y}, Z={num_bins_z}")
+        print(f"Количество точек после бининга: {len(result_df)}")
+        print(f"Степень сжатия: {accumulator.num_points / len(result_df):.1f}:1")
+        print(f"Потоковый бининг выполнен за {time.perf_counter() - start_time:.2f} с")
+
+        return result_df
+
+    def load_data(self, file_path, fl_binning = False, bin_width_x=0.5, bin_width_y=0.5, bin_width_z=0.5,
+                  use_cache=True, streaming=False):
+        """
+        Универсальный метод загрузки данных по расширению файла.
+
+        streaming=True вместе с fl_binning - потоковый биннинг без загрузки
+        исходных точек в память (для файлов больше оперативной памяти).
+        """
+        if streaming and fl_binning:
+            return self.bin_file_streaming(file_path, bin_width_x, bin_width_y, bin_width_z)
+
+        if file_path.endswith('.csv') or columnar_format(file_path):
+            return self.load_raw(file_path, use_cache)
+        elif file_path.endswith('.dat'):
+            df = self.load_raw(file_path, use_cache)
+            if df.empty:
+                return df
+            try:
+                if fl_binning:
+                    return self.get_data_with_binning(df, bin_width_x, bin_width_y, bin_width_z)
+                else:
+                    return self.get_data_without_binning(df)
+            except Exception as e:
+                print(f"Ошибка при загрузке DAT файла: {e}")
+                return pd.DataFrame(columns=['x', 'y', 'z', 'T'])
+        else:
+            raise ValueError(f"Неподдерживаемый формат файла: {file_path}")
+
+    def load_files(self, source, method=None, bin_widths=(0.5, 0.5, 0.5), precision=0,
+                   bin_output='centroid', max_workers=None, use_cache=True, progress=None):
+        """
+        Параллельная загрузка нескольких файлов (каталог, шаблон glob или
+        список путей) в пуле процессов, включая прореживание. progress -
+        отчет после каждого файла и отмена (см. data.progress).
+
+        Возвращает DatasetCollection - данные по путям файлов. Колонки
+        результатов передаются из рабочих процессов через общую память.
+        """
+        # Импорт здесь: parallel_loader использует Dataset, который импортирует DataLoader
+        from data.parallel_loader import load_files_parallel
+        return load_files_parallel(source, method, bin_widths, precision, bin_output, max_workers, use_cache,
+                                   self.compact, progress)
+
+    def load_raw(self, file_path, use_cache=True, progress=None):
+        """
+        Загрузка исходных (непрореженных) точек x, y, z, T.
+
+        При use_cache=True разобранные колонки берутся из бинарного кэша
+        рядом с файлом, а при его отсутствии или устаревании файл
+        разбирается заново и кэш перестраивается. progress - отчет о
+        ходе чтения и отмена (см. data.progress). Колоночные форматы
+        (NPZ, Parquet, Feather, HDF5) читаются напрямую, без кэша.
+        Колонки результата имеют тип self.dtype.
+        """
+        if columnar_format(file_path):
+            with profiler.stage("чтение колонок"):
+                df = self.as_dtype(self.columnar.load(file_path, progress=progress))
+            profiler.count("точек прочитано", len(df))
+            return df
+
+        if use_cache:
+            with profiler.stage("чтение кэша"):
+                df = self.data_cache.load(file_path)
+            if df is not None:
+                profiler.count("точек прочитано", len(df))
+                return df
+
         if file_path.endswith('.csv'):
-            return self.load_from_csv(file_path)
+            with profiler.stage("разбор CSV"):
+                df = self.as_dtype(self.load_from_csv(file_path, progress=progress))
         elif file_path.endswith('.dat'):
-            return self.load_from_dat(file_path, fl_binning, bin_width_x, bin_width_y, bin_width_z)
+            try:
+                with profiler.stage("разбор DAT"):
+                    df = self.read_dat_columns(file_path, dtype=self.dtype, progress=progress)
+            except LoadCancelled:
+                raise
+            except Exception as e:
+                print(f"Ошибка при загрузке DAT файла: {e}")
+                return pd.DataFrame(columns=['x', 'y', 'z', 'T'])
         else:
             raise ValueError(f"Неподдерживаемый формат файла: {file_path}")
+        profiler.count("точек прочитано", len(df))
+        profiler.count("байт прочитано", os.path.getsize(file_path))
+
+        if use_cache and not df.empty:
+            if progress is not None:
+                progress("запись кэша")
+            with profiler.stage("запись кэша"):
+                self.data_cache.save(file_path, df)
+
+        return df
+
+    def as_dtype(self, df):
+        """Колонки x, y, z, T в типе self.dtype (копируются, только если тип другой)"""
+        if df.empty or all(df[col].dtype == self.dtype for col in df.columns):
+            return df
+        return df.astype(self.dtype)
+
+    def detect_structured_grid(self, df):
+        """
+        Проверка, лежат ли точки на структурированной решетке.
+
+        Возвращает StructuredGrid (плотный трехмерный массив T и векторы
+        координат осей) или None для рассеянных данных.
+        """
+        with profiler.stage("поиск решетки"):
+            grid = StructuredGrid.detect(df)
+        if grid is not None:
+            nx, ny, nz = grid.shape
+            stagger = f", сдвиг рядов по {grid.stagger_axis.upper()}" if grid.stagger_axis else ""
+            print(f"Обнаружена структурированная сетка {nx}x{ny}x{nz}{stagger}")
+        return grid
+
+    def load_region(self, file_path, bounds, progress=None):
+        """
+        Загрузка только точек внутри области bounds - словаря
+        {ось: (min, max)}, например {'z': (z0 - 0.5, z0 + 0.5)} для полосы
+        вокруг плоскости среза.
+
+        Из колоночных файлов читаются только блоки, пересекающие область;
+        текстовые файлы просматриваются блоками без загрузки целиком.
+        """
+        if columnar_format(file_path):
+            with profiler.stage("чтение колонок"):
+                df = self.as_dtype(self.columnar.load(file_path, bounds, progress))
+            profiler.count("точек прочитано", len(df))
+            return df
+
+        blocks = [block for block in (filter_rows(block, bounds) for block in self.iter_blocks(file_path))
+                  if len(block)]
+        if not blocks:
+            return pd.DataFrame(columns=['x', 'y', 'z', 'T'], dtype=self.dtype)
+        data = np.concatenate(blocks).astype(self.dtype, copy=False)
+        return pd.DataFrame({col: data[:, i] for i, col in enumerate(['x', 'y', 'z', 'T'])})
 
     def save_to_csv(self, df, file_path):
         """Сохранение DataFrame в CSV файл"""
@@ -127,33 +623,46 @@ class DataLoader:
         df.to_csv(file_path, index=False, encoding='utf-8')
         print(f"Данные сохранены в {file_path}")
 
-    def get_data_without_binning(self, df):
+    def save_to_npz(self, df, file_path):
+        """Сохранение x, y, z, T в NPZ файл (без сжатия, открывается мгновенно)"""
+        self.columnar.save(df, file_path, 'npz')
+
+    def save_to_parquet(self, df, file_path):
+        """Сохранение x, y, z, T в Parquet файл (нужен pyarrow)"""
+        self.columnar.save(df, file_path, 'parquet')
+
+    def save_to_feather(self, df, file_path):
+        """Сохранение x, y, z, T в Feather файл (нужен pyarrow)"""
+        self.columnar.save(df, file_path, 'feather')
+
+    def save_to_hdf5(self, df, file_path):
+        """Сохранение x, y, z, T в HDF5 файл (нужен PyTables)"""
+        self.columnar.save(df, file_path, 'hdf5')
+
+    def save_data(self, df, file_path):
+        """Сохранение данных в формате по расширению файла (CSV или колоночный)"""
+        if columnar_format(file_path):
+            self.columnar.save(df, file_path)
+        elif file_path.endswith('.csv'):
+            self.save_to_csv(df, file_path)
+        else:
+            raise ValueError(f"Неподдерживаемый формат файла: {file_path}")
+
+    def get_data_without_binning(self, df, precision=0):
         '''
         Для прореживания точек использует 
         округление и группировку координат
         с взятием средней температуры
+
+        precision - число знаков после запятой при округлении (0 - целые)
         '''
-        # Округляем координаты и группируем
-        rounded_cols = ['x_rounded', 'y_rounded', 'z_rounded']
-        for i, col in enumerate(['x', 'y', 'z']):
-            df[rounded_cols[i]] = df[col].round().astype(int)
-        
-        # Группируем по округленным координатам
-        grouped_df = df.groupby(
-            ['x_rounded', 'y_rounded', 'z_rounded'],
-            as_index=False
-        )['T'].mean()
-        
-        # Переименовываем столбцы
-        grouped_df = grouped_df.rename(columns={
-            'x_rounded': 'x',
-            'y_rounded': 'y', 
-            'z_rounded': 'z'
-        })
-        
-        return grouped_df
+        # Исходный DataFrame не изменяется: ключи группировки считаются в BinningEngine
+        with profiler.stage("округление"):
+            result_df = self.binning_engine.round_points(df['x'], df['y'], df['z'], df['T'], precision)
+        profiler.count("точек после прореживания", len(result_df))
+        return result_df
 
-    def get_data_with_binning(self, df, bin_width_x=0.5, bin_width_y=0.5, bin_width_z=0.5):
+    def get_data_with_binning(self, df, bin_width_x=0.5, bin_width_y=0.5, bin_width_z=0.5, output='centroid'):
         """
         Для прореживания точек использует бинирование.
 
@@ -161,65 +670,23 @@ class DataLoader:
         ----------
         bin_width_x, bin_width_y, bin_width_z : float
             Ширина бинов по каждой оси (по умолчанию 0,5)
+        output : str
+            'centroid' - средние координаты точек бина (реальные центроиды),
+            'center' - центры бинов (равномерная сетка)
         """
-        # ВАРИАНТ 1: Биннинг с вычислением центроидов бинов
-        # Создаем бины для каждой оси
-        x_min, x_max = df['x'].min(), df['x'].max()
-        y_min, y_max = df['y'].min(), df['y'].max()
-        z_min, z_max = df['z'].min(), df['z'].max()
+        with profiler.stage("биннинг"):
+            result_df, grid = self.binning_engine.bin_points(
+                df['x'], df['y'], df['z'], df['T'],
+                bin_widths=(bin_width_x, bin_width_y, bin_width_z),
+                output=output
+            )
+        profiler.count("точек после прореживания", len(result_df))
 
-        # Вычисляем количество бинов
-        num_bins_x = int(np.ceil((x_max - x_min) / bin_width_x)) + 1
-        num_bins_y = int(np.ceil((y_max - y_min) / bin_width_y)) + 1
-        num_bins_z = int(np.ceil((z_max - z_min) / bin_width_z)) + 1
+        x_min, y_min, z_min = grid['origin']
+        x_max, y_max, z_max = df['x'].max(), df['y'].max(), df['z'].max()
+        num_bins_x, num_bins_y, num_bins_z = grid['shape']
 
         print(f"Количество бинов: X={num_bins_x}, Y={num_bins_y}, Z={num_bins_z}")
-
-        # Присваиваем каждой точке номер бина
-        df['x_bin'] = ((df['x'] - x_min) // bin_width_x).astype(int)
-        df['y_bin'] = ((df['y'] - y_min) // bin_width_y).astype(int)
-        df['z_bin'] = ((df['z'] - z_min) // bin_width_z).astype(int)
-
-        # Группируем по бинам и вычисляем средние значения
-        grouped_df = df.groupby(['x_bin', 'y_bin', 'z_bin']).agg({
-            'T': 'mean',
-            'x': 'mean',  # Можно также использовать 'first', 'min', 'max' или вычислять центроид
-            'y': 'mean',
-            'z': 'mean'
-        }).reset_index()
-
-        # Переименовываем столбцы
-        grouped_df = grouped_df.rename(columns={
-            'x': 'x_centroid',
-            'y': 'y_centroid',
-            'z': 'z_centroid'
-        })
-
-        # ВАРИАНТ 2: Альтернативный подход - вычисление центров бинов
-        # Этот вариант создает равномерную сетку с центрами бинов
-        # def calculate_bin_centers(df, coord_col, min_val, bin_width):
-        #     """Вычисляет центры бинов на основе номеров бинов"""
-        #     return min_val + (df[f'{coord_col}_bin'] + 0.5) * bin_width
-        #
-        # # Добавляем центры бинов
-        # grouped_df['x_center'] = calculate_bin_centers(grouped_df, 'x', x_min, bin_width_x)
-        # grouped_df['y_center'] = calculate_bin_centers(grouped_df, 'y', y_min, bin_width_y)
-        # grouped_df['z_center'] = calculate_bin_centers(grouped_df, 'z', z_min, bin_width_z)
-
-        # Выбираем нужные столбцы для сохранения
-        # Можно выбрать либо центроиды (реальные средние координаты), либо центры бинов (равномерная сетка)
-        # Поменять *_x_centroid -> *_center и раскомитеть сверху
-        result_df = grouped_df[['x_centroid', 'y_centroid', 'z_centroid', 'T']].copy()
-        result_df = result_df.rename(columns={
-            'x_centroid': 'x',
-            'y_centroid': 'y',
-            'z_centroid': 'z'
-        })
-
-        # Альтернатива: использовать центры бинов вместо центроидов
-        # result_df = grouped_df[['x_center', 'y_center', 'z_center', 'T']].copy()
-        # result_df = result_df.rename(columns={'x_center': 'x', 'y_center': 'y', 'z_center': 'z'})
-
         print(f"Количество точек после бининга: {len(result_df)}")
         print(f"Степень сжатия: {len(df) / len(result_df):.1f}:1")
 
@@ -246,6 +713,10 @@ if __name__ == "__main__":
     print(f"Загружено {len(dat_data)} записей из DAT")
     print(dat_data.head(5))
     
+    # Параллельная загрузка всех месяцев с прореживанием
+    #collection = loader.load_files("C:/Users/vkval/Documents/arctica/god0mes*.dat", method="rounding")
+    #print(f"Загружено файлов: {len(collection)}, точек: {collection.total_points()}")
+
     # Использование универсального метода
     #data = loader.load_data("data.csv")
     #print(f"DataFrame columns: {data.columns.tolist()}")
@@ -1,57 +1,156 @@
 import numpy as np
 
-class DataProcessor:
-    def __init__(self):
-        pass
-    
-    def calculate_statistics(self, data):
-        """Расчет статистики по данным"""
-        if not data or not data['T']:
-            return {}
-        
-        T_min = min(data['T'])
-        T_max = max(data['T'])
-        T_avg = np.mean(data['T'])
-        
+AXES = ['x', 'y', 'z']
+COLUMNS = AXES + ['T']
+
+# Число строк в блоке статистики: блок помещается в кэш процессора, поэтому
+# минимум, максимум, среднее и M2 считаются за один проход по памяти
+STATS_CHUNK_ROWS = 1 << 16
+
+
+class RunningStats:
+    """
+    Потоковая статистика по столбцам (алгоритм Уэлфорда для блоков).
+
+    Для каждого блока считаются количество, минимум, максимум, среднее и
+    сумма квадратов отклонений M2, которые затем объединяются с накопленными
+    по формулам Чана. Данные не обязаны помещаться в память целиком.
+    """
+
+    def __init__(self, columns=COLUMNS):
+        self.columns = list(columns)
+        width = len(self.columns)
+        self.count = 0
+        self.min = np.full(width, np.inf)
+        self.max = np.full(width, -np.inf)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+
+    def update(self, block):
+        """
+        Добавление блока: последовательность столбцов одинаковой длины
+        или двумерный массив (строки x столбцы)
+        """
+        if isinstance(block, np.ndarray) and block.ndim == 2:
+            block = block.T
+        n = len(block[0])
+        if n == 0:
+            return
+
+        total = self.count + n
+        for i, values in enumerate(block):
+            values = np.asarray(values, dtype=np.float64)
+            block_mean = values.mean()
+            deviation = values - block_mean
+            block_m2 = np.dot(deviation, deviation)
+            self.min[i] = np.minimum(self.min[i], values.min())
+            self.max[i] = np.maximum(self.max[i], values.max())
+
+            delta = block_mean - self.mean[i]
+            self.mean[i] += delta * (n / total)
+            self.m2[i] += block_m2 + delta ** 2 * (self.count * n / total)
+        self.count = total
+
+    def std(self, ddof=1):
+        """Стандартное отклонение по столбцам"""
+        if self.count <= ddof:
+            return np.full(len(self.columns), np.nan)
+        return np.sqrt(self.m2 / (self.count - ddof))
+
+    def result(self):
+        """Статистика по столбцам: {столбец: {count, min, max, mean, std}}"""
+        std = self.std()
         return {
-            'min': T_min,
-            'max': T_max,
-            'avg': T_avg,
-            'count': len(data['x']),
-            'x_range': (min(data['x']), max(data['x'])),
-            'y_range': (min(data['y']), max(data['y'])),
-            'z_range': (min(data['z']), max(data['z']))
+            col: {'count': self.count, 'min': self.min[i], 'max': self.max[i],
+                  'mean': self.mean[i], 'std': std[i]}
+            for i, col in enumerate(self.columns)
         }
-    
+
+
+class DataProcessor:
+    def __init__(self, chunk_rows=STATS_CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+
+    def _column_arrays(self, data, columns, rows=None):
+        """Массивы NumPy столбцов DataFrame или словаря (для rows - только эти строки)"""
+        arrays = [np.asarray(data[col]) for col in columns]
+        if rows is not None:
+            arrays = [values[rows] for values in arrays]
+        return arrays
+
+    def calculate_statistics(self, data, rows=None, columns=COLUMNS):
+        """
+        Расчет статистики по данным за один проход.
+
+        data - DataFrame или словарь массивов; rows - массив индексов строк
+        (например, результат get_slice_data), по которым считается статистика.
+        """
+        if data is None or len(data[columns[0]]) == 0:
+            return {}
+
+        arrays = self._column_arrays(data, columns, rows)
+        stats = RunningStats(columns)
+        for start in range(0, len(arrays[0]), self.chunk_rows):
+            stop = start + self.chunk_rows
+            stats.update([values[start:stop] for values in arrays])
+
+        return self._summary(stats)
+
+    def calculate_statistics_chunked(self, blocks, columns=COLUMNS):
+        """
+        Статистика по данным, не помещающимся в память.
+
+        blocks - итератор блоков: двумерных массивов со столбцами columns
+        (например, из DataLoader.iter_dat_blocks) или DataFrame.
+        """
+        stats = RunningStats(columns)
+        for block in blocks:
+            if hasattr(block, 'columns'):
+                block = self._column_arrays(block, columns)
+            stats.update(block)
+
+        if stats.count == 0:
+            return {}
+        return self._summary(stats)
+
+    def _summary(self, stats: RunningStats):
+        """Словарь статистики в формате calculate_statistics"""
+        columns = stats.result()
+        summary = {'count': stats.count, 'columns': columns}
+        if 'T' in columns:
+            T = columns['T']
+            summary.update({'min': T['min'], 'max': T['max'], 'avg': T['mean'], 'std': T['std']})
+        for axis in AXES:
+            if axis in columns:
+                summary[f'{axis}_range'] = (columns[axis]['min'], columns[axis]['max'])
+        return summary
+
     def get_data_preview(self, data, num_points=10):
         """Получить превью данных"""
         preview_lines = []
-        
-        for i in range(min(num_points, len(data['x']))):
+        x, y, z, T = self._column_arrays(data, COLUMNS, slice(0, num_points))
+
+        for i in range(len(x)):
             preview_lines.append(
-                f"Точка {i+1}: x={data['x'][i]:.6f}, "
-                f"y={data['y'][i]:.6f}, z={data['z'][i]:.6f}, "
-                f"T={data['T'][i]:.6f}"
+                f"Точка {i+1}: x={x[i]:.6f}, "
+                f"y={y[i]:.6f}, z={z[i]:.6f}, "
+                f"T={T[i]:.6f}"
             )
-        
+
         return preview_lines
-    
-    def get_slice_data(self, data, axis, value, tolerance=0.1):
-        """Получить данные для среза"""
-        if axis == 'x':
-            indices = [i for i, x in enumerate(data['x']) if abs(x - value) <= tolerance]
-        elif axis == 'y':
-            indices = [i for i, y in enumerate(data['y']) if abs(y - value) <= tolerance]
-        elif axis == 'z':
-            indices = [i for i, z in enumerate(data['z']) if abs(z - value) <= tolerance]
-        else:
-            return {}
-        
-        slice_data = {
-            'x': [data['x'][i] for i in indices],
-            'y': [data['y'][i] for i in indices],
-            'z': [data['z'][i] for i in indices],
-            'T': [data['T'][i] for i in indices]
-        }
-        
-        return slice_data
+
+    def get_slice_data(self, data, axis, value, tolerance=0.1, slice_index=None):
+        """
+        Получить индексы строк среза (массив NumPy).
+
+        Если передан индекс срезов для этих данных, используется бинарный
+        поиск по нему, иначе - векторизованное сравнение по столбцу.
+        """
+        if axis not in AXES:
+            return np.empty(0, dtype=np.int64)
+
+        if slice_index is not None and slice_index.data is data:
+            return slice_index.query(axis, value, tolerance)
+
+        values = np.asarray(data[axis])
+        return np.flatnonzero(np.abs(values - value) <= tolerance)
@@ -0,0 +1,88 @@
+from types import MappingProxyType
+import numpy as np
+import pandas as pd
+from data.data_processor import DataProcessor
+
+AXES = ['x', 'y', 'z']
+COLUMNS = AXES + ['T']
+
+# Число интервалов гистограммы температур
+HISTOGRAM_BINS = 50
+
+
+def _frozen(values):
+    """Массив только для чтения"""
+    values = np.asarray(values)
+    values.setflags(write=False)
+    return values
+
+
+class DataSummary:
+    """
+    Неизменяемая сводка по набору данных.
+
+    Строится один раз при загрузке или прореживании данных: статистика по
+    столбцам (min/max/mean/std), уникальные значения по осям, гистограмма
+    температур и признак корректности данных. Окно, панель информации и
+    построение графика читают готовые значения вместо повторного прохода
+    по всем точкам.
+    """
+
+    def __init__(self, data, count, columns, unique, histogram, valid):
+        object.__setattr__(self, 'data', data)
+        object.__setattr__(self, 'count', count)
+        object.__setattr__(self, 'columns', MappingProxyType(
+            {col: MappingProxyType(values) for col, values in columns.items()}))
+        object.__setattr__(self, 'unique', MappingProxyType(unique))
+        object.__setattr__(self, 'histogram', histogram)
+        object.__setattr__(self, 'valid', valid)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DataSummary нельзя изменять")
+
+    @classmethod
+    def from_data(cls, data: pd.DataFrame, slice_index=None, processor: DataProcessor = None,
+                  bins=HISTOGRAM_BINS):
+        """
+        Построение сводки.
+
+        slice_index - индекс срезов тех же данных: уникальные значения
+        берутся из его отсортированных осей за линейный проход (оси заодно
+        готовы для срезов).
+        """
+        processor = processor or DataProcessor()
+
+        has_columns = isinstance(data, pd.DataFrame) and all(col in data.columns for col in COLUMNS)
+        if not has_columns or len(data) == 0:
+            return cls(data, 0, {}, {}, None, False)
+
+        stats = processor.calculate_statistics(data)
+        columns = {col: dict(values) for col, values in stats['columns'].items()}
+
+        # NaN в столбце дает NaN в минимуме и максимуме
+        valid = not any(np.isnan(columns[col]['min']) or np.isnan(columns[col]['max']) for col in COLUMNS)
+
+        unique = {}
+        for axis in AXES:
+            if slice_index is not None and slice_index.data is data:
+                _, sorted_values = slice_index._build_axis(axis)
+            else:
+                sorted_values = np.sort(data[axis].to_numpy())
+            first = np.concatenate(([True], sorted_values[1:] != sorted_values[:-1]))
+            unique[axis] = _frozen(sorted_values[first])
+
+        histogram = None
+        if valid:
+            T = columns['T']
+            counts, edges = np.histogram(data['T'].to_numpy(), bins=bins, range=(T['min'], T['max']))
+            histogram = (_frozen(counts), _frozen(edges))
+
+        return cls(data, stats['count'], columns, unique, histogram, valid)
+
+    def matches(self, data):
+        """Относится ли сводка к этим данным"""
+        return self.data is data
+
+    def range(self, col):
+        """(минимум, максимум) столбца"""
+        return self.columns[col]['min'], self.columns[col]['max']
@@ -0,0 +1,225 @@
+import mmap
+import threading
+from collections import OrderedDict
+import numpy as np
+from data.bin_pyramid import BinPyramid
+from data.data_loader import DataLoader
+from data.data_summary import DataSummary
+from utils.profiler import profiler
+
+# Предельный объем памяти под кэш прореженных данных (байт)
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+
+
+class Dataset:
+    """
+    Набор данных, загруженный из одного файла.
+
+    Исходные точки читаются один раз и хранятся в памяти, а результаты
+    прореживания кэшируются с вытеснением давно не использованных
+    (LRU) в пределах заданного объема памяти. Кэш защищен блокировкой:
+    прореживание может выполняться в фоновом потоке загрузки.
+
+    Для частой смены ширины бинов можно построить пирамиду бинов
+    (build_pyramid): тогда биннинг с шириной, кратной базовой, считается
+    по ней без обращения к исходным точкам, а остальные ширины - как
+    обычно, через DataLoader.get_data_with_binning.
+    """
+
+    def __init__(self, raw, file_path=None, data_loader=None, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.raw = raw
+        self.file_path = file_path
+        self.data_loader = data_loader or DataLoader()
+        self.memory_budget = memory_budget
+
+        # Прореживание применяется только к DAT файлам, как и в DataLoader.load_data
+        self.thinning_enabled = file_path is None or file_path.endswith('.dat')
+
+        self._thinned = OrderedDict()
+        self._thinned_bytes = 0
+        self._summaries = {}
+        self._lock = threading.RLock()
+        self.pyramid = None # BinPyramid или None
+
+    @classmethod
+    def from_file(cls, file_path, data_loader=None, memory_budget=DEFAULT_MEMORY_BUDGET, use_cache=True,
+                  progress=None):
+        """Создание набора данных из CSV, DAT или колоночного файла (progress - см. data.progress)"""
+        data_loader = data_loader or DataLoader()
+        raw = data_loader.load_raw(file_path, use_cache, progress)
+        return cls(raw, file_path, data_loader, memory_budget)
+
+    def __len__(self):
+        return len(self.raw)
+
+    @staticmethod
+    def make_key(method, bin_widths=(0.5, 0.5, 0.5), precision=0, bin_output='centroid'):
+        """Ключ кэша прореживания"""
+        if method == "binning":
+            return (method, tuple(float(w) for w in bin_widths), bin_output)
+        return (method, None, int(precision))
+
+    def get_thinned(self, method="rounding", bin_widths=(0.5, 0.5, 0.5), precision=0, bin_output='centroid'):
+        """
+        Получение прореженных данных.
+
+        Параметры:
+        ----------
+        method : str
+            "binning" или "rounding"
+        bin_widths : tuple
+            Ширина бинов по осям X, Y, Z (для биннинга)
+        precision : int
+            Число знаков после запятой (для округления)
+        bin_output : str
+            'centroid' или 'center' - координаты результата биннинга
+        """
+        if not self.thinning_enabled or self.raw.empty:
+            return self.raw
+
+        key = self.make_key(method, bin_widths, precision, bin_output)
+        with self._lock:
+            if key in self._thinned:
+                self._thinned.move_to_end(key)
+                return self._thinned[key]
+
+            if method == "binning":
+                result = None
+                if self.pyramid is not None:
+                    with profiler.stage("биннинг из пирамиды"):
+                        result = self.pyramid.query(bin_widths, bin_output)
+                if result is not None:
+                    profiler.count("точек после прореживания", len(result))
+                    print(f"Биннинг {bin_widths} по пирамиде бинов: {len(result)} точек")
+                else:
+                    result = self.data_loader.get_data_with_binning(self.raw, *bin_widths, output=bin_output)
+            elif method == "rounding":
+                result = self.data_loader.get_data_without_binning(self.raw, precision)
+            else:
+                raise ValueError(f"Неизвестный метод прореживания: {method}")
+
+            self._store(key, result)
+            return result
+
+    def build_pyramid(self, base_widths, use_cache=True):
+        """
+        Построение пирамиды бинов с базовой шириной base_widths (один раз
+        на набор данных). При use_cache=True пирамида сохраняется в кэш
+        рядом с файлом и при следующей загрузке файла читается оттуда.
+        """
+        base_widths = tuple(float(w) for w in base_widths)
+        if not self.thinning_enabled or self.raw.empty:
+            return None
+
+        with self._lock:
+            if self.pyramid is not None and self.pyramid.base_widths == base_widths:
+                return self.pyramid
+
+            name = "pyramid_" + "_".join(f"{w:g}" for w in base_widths)
+            use_cache = use_cache and self.file_path is not None
+            pyramid = None
+            if use_cache:
+                with profiler.stage("чтение пирамиды"):
+                    arrays = self.data_loader.data_cache.load_arrays(self.file_path, name)
+                if arrays is not None:
+                    pyramid = BinPyramid.from_arrays(arrays, self.data_loader.binning_engine)
+
+            if pyramid is None:
+                with profiler.stage("пирамида бинов"):
+                    pyramid = BinPyramid.build(self.raw['x'], self.raw['y'], self.raw['z'], self.raw['T'],
+                                               base_widths, self.data_loader.binning_engine)
+                print(f"Пирамида бинов {base_widths}: {len(pyramid.levels[0][1])} базовых бинов")
+                if use_cache:
+                    self.data_loader.data_cache.save_arrays(self.file_path, name, pyramid.to_arrays())
+
+            self.pyramid = pyramid
+            return pyramid
+
+    def drop_pyramid(self):
+        """Освобождение пирамиды бинов (биннинг снова считается по исходным точкам)"""
+        with self._lock:
+            self.pyramid = None
+
+    def get_summary(self, data, slice_index=None) -> DataSummary:
+        """
+        Сводка по исходным или прореженным данным этого набора.
+
+        Строится один раз на результат прореживания и вытесняется из кэша
+        вместе с ним.
+        """
+        with self._lock:
+            if data is self.raw:
+                key = None
+            else:
+                key = next((key for key, result in self._thinned.items() if result is data), False)
+                if key is False:
+                    # Данные не из этого набора - сводку не кэшируем
+                    return DataSummary.from_data(data, slice_index)
+
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = DataSummary.from_data(data, slice_index)
+                self._summaries[key] = summary
+            return summary
+
+    def memory_report(self):
+        """
+        Память набора по этапам: список (этап, байт) - исходные точки,
+        каждый результат прореживания в кэше и пирамида бинов. Колонки,
+        отображенные в память из кэша или NPZ файла, занимают страничный
+        кэш ОС, а не память процесса; это отмечается в названии этапа.
+        """
+        with self._lock:
+            label = "исходные точки"
+            if self._is_mapped(self.raw):
+                label += " (отображены из файла)"
+            report = [(label, self._memory_usage(self.raw))]
+            for key, result in self._thinned.items():
+                report.append((f"прореживание: {self.describe_key(key)}", self._memory_usage(result)))
+            if self.pyramid is not None:
+                widths = "x".join(f"{w:g}" for w in self.pyramid.base_widths)
+                report.append((f"пирамида бинов {widths}", self.pyramid.memory_usage()))
+            return report
+
+    @staticmethod
+    def describe_key(key):
+        """Описание ключа кэша прореживания для отчетов"""
+        method, bin_widths, parameter = key
+        if method == "binning":
+            widths = "x".join(f"{w:g}" for w in bin_widths)
+            return f"биннинг {widths}" + (", центры" if parameter == 'center' else "")
+        return f"округление до {parameter} зн."
+
+    def clear_cache(self):
+        """Очистка кэша прореженных данных"""
+        with self._lock:
+            self._thinned.clear()
+            self._thinned_bytes = 0
+            self._summaries = {k: v for k, v in self._summaries.items() if k is None}
+
+    def _store(self, key, result):
+        """Добавление результата в кэш с вытеснением старых записей"""
+        self._thinned[key] = result
+        self._thinned_bytes += self._memory_usage(result)
+
+        # Последний результат сохраняем всегда, даже если он больше бюджета
+        while self._thinned_bytes > self.memory_budget and len(self._thinned) > 1:
+            evicted_key, evicted = self._thinned.popitem(last=False)
+            self._thinned_bytes -= self._memory_usage(evicted)
+            self._summaries.pop(evicted_key, None)
+
+    @staticmethod
+    def _memory_usage(df):
+        return int(df.memory_usage(index=True).sum())
+
+    @staticmethod
+    def _is_mapped(df):
+        """Отображены ли колонки в память из файла"""
+        if df.empty:
+            return False
+        values = df[df.columns[0]].to_numpy()
+        while values is not None:
+            if isinstance(values, (np.memmap, mmap.mmap)):
+                return True
+            values = getattr(values, 'base', None)
+        return False
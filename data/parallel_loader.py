@@ -0,0 +1,253 @@
+import glob
+import os
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import pandas as pd
+from data.columnar import COLUMNAR_EXTENSIONS
+from data.data_loader import DataLoader
+from data.dataset import Dataset
+
+COLUMNS = ['x', 'y', 'z', 'T']
+
+# В Windows блок общей памяти существует, пока открыт хотя бы один его
+# дескриптор: блок, закрытый рабочим процессом, исчезает раньше, чем его
+# откроет родительский. Там колонки возвращаются массивом через pickle.
+USE_SHARED_MEMORY = os.name != 'nt'
+
+# Расширения файлов, которые ищутся в каталоге
+DATA_EXTENSIONS = ('.dat', '.csv') + COLUMNAR_EXTENSIONS
+
+
+def natural_sort_key(path):
+    """Ключ сортировки с учетом чисел в имени: god0mes2 раньше god0mes10"""
+    name = os.path.basename(path)
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+def find_data_files(source):
+    """
+    Список файлов данных: каталог (все DAT, CSV и колоночные файлы в нем), шаблон
+    glob или список путей. Файлы упорядочены по имени с учетом чисел.
+    """
+    if isinstance(source, (list, tuple)):
+        paths = list(source)
+    elif os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)
+                 if name.lower().endswith(DATA_EXTENSIONS)]
+    else:
+        paths = glob.glob(source)
+    return sorted(paths, key=natural_sort_key)
+
+
+def _load_to_shared_memory(file_path, method, bin_widths, precision, bin_output, use_cache, compact=False):
+    """
+    Загрузка и прореживание одного файла в рабочем процессе.
+
+    Колонки результата записываются в блок общей памяти, а родительскому
+    процессу возвращаются только имя блока и размеры - сам DataFrame не
+    сериализуется. Без общей памяти (USE_SHARED_MEMORY) вместо имени блока
+    возвращается сам массив колонок (len(COLUMNS), N).
+    """
+    start_time = time.perf_counter()
+    data_loader = DataLoader(compact=compact)
+    dataset = Dataset.from_file(file_path, data_loader, use_cache=use_cache)
+    if method is None:
+        df = dataset.raw
+    else:
+        df = dataset.get_thinned(method, bin_widths, precision, bin_output)
+
+    num_rows = len(df)
+    if num_rows == 0:
+        return file_path, None, 0, len(dataset), time.perf_counter() - start_time
+
+    dtype = data_loader.dtype
+    if not USE_SHARED_MEMORY:
+        columns = np.stack([df[col].to_numpy(dtype=dtype) for col in COLUMNS])
+        return file_path, columns, num_rows, len(dataset), time.perf_counter() - start_time
+
+    # Трекер ресурсов общий с родительским процессом (см. load_files_parallel),
+    # регистрацию блока снимает unlink в _read_shared_memory
+    block = shared_memory.SharedMemory(create=True, size=num_rows * len(COLUMNS) * dtype.itemsize)
+    try:
+        columns = np.ndarray((len(COLUMNS), num_rows), dtype=dtype, buffer=block.buf)
+        for i, col in enumerate(COLUMNS):
+            columns[i] = df[col].to_numpy(dtype=dtype)
+        del columns
+    finally:
+        block.close()
+
+    return file_path, block.name, num_rows, len(dataset), time.perf_counter() - start_time
+
+
+def _result_to_frame(result, num_rows, dtype):
+    """DataFrame из результата _load_to_shared_memory: имени блока, массива колонок или None"""
+    if result is None:
+        return pd.DataFrame(columns=COLUMNS)
+    if isinstance(result, np.ndarray):
+        return _columns_to_frame(result)
+    return _read_shared_memory(result, num_rows, dtype)
+
+
+def _discard_results(futures):
+    """
+    Отмена еще не начатых задач и освобождение блоков общей памяти задач,
+    которые уже выполняются или выполнены (результаты не нужны)
+    """
+    for future in futures:
+        future.cancel()
+    for future in futures:
+        if future.cancelled():
+            continue
+        try:
+            result = future.result()[1]
+        except Exception:
+            continue
+        if isinstance(result, str):
+            block = shared_memory.SharedMemory(name=result)
+            block.close()
+            block.unlink()
+
+
+def _columns_to_frame(columns):
+    """DataFrame из массива колонок (len(COLUMNS), N) без копирования"""
+    return pd.DataFrame({col: columns[i] for i, col in enumerate(COLUMNS)}, copy=False)
+
+
+def _read_shared_memory(name, num_rows, dtype=np.float64):
+    """Копирование колонок из блока общей памяти в DataFrame и освобождение блока"""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        shared = np.ndarray((len(COLUMNS), num_rows), dtype=dtype, buffer=block.buf)
+        columns = shared.copy()
+        del shared
+    finally:
+        block.close()
+        block.unlink()
+    return _columns_to_frame(columns)
+
+
+class DatasetCollection:
+    """
+    Набор данных из нескольких файлов (например, по одному файлу на месяц).
+
+    Результаты хранятся по путям файлов в порядке имен; для файлов, которые
+    не удалось загрузить, сохраняется текст ошибки.
+    """
+
+    def __init__(self, frames=None, raw_counts=None, errors=None):
+        self.frames = OrderedDict(frames or {})
+        self.raw_counts = dict(raw_counts or {})
+        self.errors = dict(errors or {})
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __iter__(self):
+        return iter(self.frames)
+
+    def __contains__(self, file_path):
+        return file_path in self.frames
+
+    def __getitem__(self, key):
+        """Данные по пути файла или по номеру в порядке файлов"""
+        if isinstance(key, int):
+            key = self.paths[key]
+        return self.frames[key]
+
+    @property
+    def paths(self):
+        return list(self.frames.keys())
+
+    def items(self):
+        return self.frames.items()
+
+    def total_points(self):
+        """Суммарное число точек во всех файлах"""
+        return sum(len(df) for df in self.frames.values())
+
+    def concat(self):
+        """Все точки одним DataFrame с колонкой file - номером файла"""
+        frames = [df.assign(file=i) for i, df in enumerate(self.frames.values())]
+        if not frames:
+            return pd.DataFrame(columns=COLUMNS + ['file'])
+        return pd.concat(frames, ignore_index=True)
+
+
+def load_files_parallel(source, method=None, bin_widths=(0.5, 0.5, 0.5), precision=0,
+                        bin_output='centroid', max_workers=None, use_cache=True,
+                        compact=False, progress=None) -> DatasetCollection:
+    """
+    Параллельная загрузка файлов в пуле процессов.
+
+    method - метод прореживания ("binning", "rounding") или None для
+    исходных точек; прореживание выполняется в рабочих процессах.
+    compact=True - колонки float32 (компактный режим DataLoader).
+    progress - отчет после каждого загруженного файла (см. data.progress):
+    объем загруженных файлов в байтах из общего и число точек. Если
+    progress выбрасывает LoadCancelled, оставшиеся файлы не загружаются.
+    """
+    paths = find_data_files(source)
+    if not paths:
+        print(f"Не найдено файлов данных: {source}")
+        return DatasetCollection()
+
+    start_time = time.perf_counter()
+    max_workers = max_workers or min(len(paths), os.cpu_count() or 1)
+
+    if USE_SHARED_MEMORY:
+        # Трекер ресурсов запускается до пула, и рабочие процессы наследуют
+        # его: иначе при запуске через spawn у каждого процесса свой трекер,
+        # который при завершении пула считает блоки утекшими
+        resource_tracker.ensure_running()
+
+    sizes = {path: os.path.getsize(path) for path in paths}
+    total_size = sum(sizes.values())
+    done_size = 0
+    total_rows = 0
+    dtype = np.float32 if compact else np.float64
+
+    frames = {}
+    raw_counts = {}
+    errors = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_load_to_shared_memory, path, method, tuple(bin_widths), precision,
+                            bin_output, use_cache, compact): path
+            for path in paths
+        }
+        pending = set(futures)
+        try:
+            for future in as_completed(futures):
+                path = futures[future]
+                pending.remove(future)
+                try:
+                    _, result, num_rows, raw_count, elapsed = future.result()
+                    frames[path] = _result_to_frame(result, num_rows, dtype)
+                except Exception as e:
+                    print(f"Ошибка при загрузке файла {path}: {e}")
+                    errors[path] = str(e)
+                else:
+                    raw_counts[path] = raw_count
+                    total_rows += num_rows
+                    print(f"{os.path.basename(path)}: {raw_count} -> {num_rows} точек за {elapsed:.2f} с")
+
+                done_size += sizes[path]
+                if progress is not None:
+                    progress("загрузка серии", done_size, total_size, total_rows)
+        except BaseException:
+            # Загрузка прервана (LoadCancelled из progress): блоки общей
+            # памяти еще не прочитанных результатов иначе остались бы в памяти
+            _discard_results(pending)
+            raise
+
+    ordered = [(path, frames[path]) for path in paths if path in frames]
+    collection = DatasetCollection(ordered, raw_counts, errors)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Загружено файлов: {len(collection)} из {len(paths)} за {elapsed:.2f} с "
+          f"({max_workers} процессов)")
+    return collection
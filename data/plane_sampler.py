@@ -0,0 +1,224 @@
+import threading
+import numpy as np
+
+AXES = ['x', 'y', 'z']
+
+# Методы интерполяции: ближайшая точка и обратно взвешенные расстояния
+METHODS = ['nearest', 'idw']
+
+# Число соседей и показатель степени для обратно взвешенных расстояний
+DEFAULT_NEIGHBORS = 8
+IDW_POWER = 2.0
+
+# Нормали плоскостей, перпендикулярных осям, и координаты на таких срезах
+# (те же, что у срезов полосой: для X - (Y, Z), для Y - (X, Z), для Z - (X, Y))
+AXIS_NORMALS = {'x': (1.0, 0.0, 0.0), 'y': (0.0, 1.0, 0.0), 'z': (0.0, 0.0, 1.0)}
+AXIS_PLANE_COORDS = {'x': ('y', 'z'), 'y': ('x', 'z'), 'z': ('x', 'y')}
+
+
+def plane_basis(normal):
+    """
+    Единичная нормаль n и ортонормированные векторы u, v в плоскости.
+
+    Для нормали вдоль оси u и v - оставшиеся оси в порядке AXIS_PLANE_COORDS;
+    для наклонной плоскости u горизонтален (лежит в плоскости XY), а v
+    направлен вверх.
+    """
+    n = np.asarray(normal, dtype=np.float64)
+    length = np.linalg.norm(n)
+    if not np.isfinite(length) or length == 0:
+        raise ValueError(f"Некорректная нормаль плоскости: {tuple(normal)}")
+    n = n / length
+
+    for axis, axis_normal in AXIS_NORMALS.items():
+        if abs(np.dot(n, axis_normal)) > 1 - 1e-12:
+            u_axis, v_axis = AXIS_PLANE_COORDS[axis]
+            return (np.array(AXIS_NORMALS[axis]) * np.sign(np.dot(n, axis_normal)),
+                    np.array(AXIS_NORMALS[u_axis]), np.array(AXIS_NORMALS[v_axis]))
+
+    u = np.cross((0.0, 0.0, 1.0), n)
+    u /= np.linalg.norm(u)
+    v = np.cross(n, u)
+    return n, u, v
+
+
+def plane_extent(bounds, u, v):
+    """
+    Диапазоны (u_min, u_max), (v_min, v_max) координат плоскости (проекций
+    на u и v), покрывающие параллелепипед границ данных bounds
+    {'x': (min, max), ...}
+    """
+    corners = np.array(np.meshgrid(*(bounds[axis] for axis in AXES), indexing='ij')).reshape(3, -1).T
+    pu, pv = corners @ u, corners @ v
+    return (pu.min(), pu.max()), (pv.min(), pv.max())
+
+
+def plane_points(origin, u, v, U, V):
+    """Точки плоскости с координатами U, V (проекциями на u и v): массив (..., 3)"""
+    U = np.asarray(U, dtype=np.float64) - np.dot(origin, u)
+    V = np.asarray(V, dtype=np.float64) - np.dot(origin, v)
+    return origin + U[..., None] * u + V[..., None] * v
+
+
+def plane_origin(bounds, axis, value):
+    """Точка плоскости: центр границ данных со значением value по оси axis"""
+    origin = np.array([sum(bounds[a]) / 2 for a in AXES], dtype=np.float64)
+    origin[AXES.index(axis)] = value
+    return origin
+
+
+def plane_polygon(bounds, origin, normal):
+    """
+    Сечение параллелепипеда границ данных плоскостью: вершины
+    многоугольника (от 3 до 6) по порядку обхода, массив (M, 3). Если
+    плоскость не пересекает параллелепипед, массив пустой (0, 3).
+    """
+    origin = np.asarray(origin, dtype=np.float64)
+    n, u, v = plane_basis(normal)
+    corners = np.array(np.meshgrid(*(bounds[axis] for axis in AXES), indexing='ij'),
+                       dtype=np.float64).reshape(3, -1).T
+    distances = (corners - origin) @ n
+
+    # Ребра соединяют вершины, индексы которых (биты x, y, z) отличаются одним битом
+    points = [corners[distances == 0]]
+    for i in range(8):
+        for bit in (1, 2, 4):
+            j = i | bit
+            if j != i and distances[i] * distances[j] < 0:
+                t = distances[i] / (distances[i] - distances[j])
+                points.append(corners[i] + t * (corners[j] - corners[i]))
+    points = np.unique(np.vstack(points), axis=0)
+    if len(points) < 3:
+        return np.empty((0, 3))
+
+    # Обход по углу вокруг центра многоугольника в плоскости
+    offsets = points - points.mean(axis=0)
+    return points[np.argsort(np.arctan2(offsets @ v, offsets @ u))]
+
+
+class PlaneSampler:
+    """
+    Интерполированные срезы по произвольным плоскостям.
+
+    По точкам набора один раз строится KD-дерево (scipy.spatial.cKDTree),
+    после чего температура на плоскости считается в узлах регулярной
+    сетки grid_size x grid_size: для каждого узла ищутся k ближайших точек
+    за O(k log N). Время среза зависит от размера сетки, а не от числа
+    точек, и срез не бывает пустым между слоями данных, как срез полосой.
+
+    Плоскость задается точкой origin и нормалью; узлы вне параллелепипеда
+    границ данных (и, при заданном max_distance, дальше него от ближайшей
+    точки) получают NaN.
+
+    Дерево строится лениво при первом срезе под блокировкой, так как
+    срезы готовятся и в фоновом потоке.
+    """
+
+    def __init__(self, columns):
+        """columns - словарь массивов с колонками x, y, z, T"""
+        self._columns = columns
+        self._tree = None
+        self._lock = threading.Lock()
+        self.bounds = {axis: (float(columns[axis].min()), float(columns[axis].max())) if len(columns[axis])
+                       else (0.0, 0.0) for axis in AXES}
+
+    def __len__(self):
+        return len(self._columns['T'])
+
+    @property
+    def tree(self):
+        """KD-дерево точек (строится при первом обращении)"""
+        with self._lock:
+            if self._tree is None:
+                # scipy нужен только для интерполированных срезов
+                from scipy.spatial import cKDTree
+                points = np.column_stack([self._columns[axis] for axis in AXES])
+                self._tree = cKDTree(points, balanced_tree=False, compact_nodes=False)
+            return self._tree
+
+    def memory_usage(self):
+        """Объем KD-дерева в байтах (0, пока оно не построено)"""
+        tree = self._tree
+        if tree is None:
+            return 0
+        # Копия координат в float64, перестановка точек и узлы (по оценке,
+        # около 80 байт на узел при 16 точках в листе)
+        return tree.data.nbytes + tree.indices.nbytes + 80 * (2 * tree.n // tree.leafsize + 1)
+
+    def default_origin(self, axis, value):
+        """Точка плоскости: центр данных со значением value по оси axis"""
+        return plane_origin(self.bounds, axis, value)
+
+    def sample(self, origin, normal, grid_size=100, method='nearest', k=DEFAULT_NEIGHBORS,
+               max_distance=None, workers=-1):
+        """
+        Температура в узлах регулярной сетки на плоскости.
+
+        Параметры:
+        ----------
+        origin : точка плоскости (x, y, z)
+        normal : нормаль плоскости (x, y, z), не обязательно единичная
+        method : 'nearest' или 'idw' (обратно взвешенные расстояния по k соседям)
+        max_distance : узлы дальше этого от ближайшей точки получают NaN
+
+        Возвращает словарь: U, V - координаты узлов в плоскости, то есть
+        проекции на u и v (массивы grid_size x grid_size; для среза,
+        перпендикулярного оси, - значения двух других осей), X, Y, Z - те
+        же узлы в пространстве, T - температура в узлах, basis - (n, u, v).
+        """
+        if method not in METHODS:
+            raise ValueError(f"Неизвестный метод интерполяции: {method}")
+        origin = np.asarray(origin, dtype=np.float64)
+        n, u, v = plane_basis(normal)
+        (u_min, u_max), (v_min, v_max) = plane_extent(self.bounds, u, v)
+
+        U, V = np.meshgrid(np.linspace(u_min, u_max, grid_size), np.linspace(v_min, v_max, grid_size))
+        nodes = plane_points(origin, u, v, U, V).reshape(-1, 3)
+
+        # Для наклонной плоскости прямоугольник выходит за границы данных:
+        # в углах за пределами параллелепипеда интерполяция не выполняется
+        inside = np.ones(len(nodes), dtype=bool)
+        for i, axis in enumerate(AXES):
+            lo, hi = self.bounds[axis]
+            margin = (hi - lo) * 1e-9
+            inside &= (nodes[:, i] >= lo - margin) & (nodes[:, i] <= hi + margin)
+
+        values = np.full(len(nodes), np.nan)
+        if len(self) and inside.any():
+            values[inside] = self._interpolate(nodes[inside], method, k, max_distance, workers)
+
+        shape = U.shape
+        return {
+            'U': U, 'V': V,
+            'X': nodes[:, 0].reshape(shape), 'Y': nodes[:, 1].reshape(shape), 'Z': nodes[:, 2].reshape(shape),
+            'T': values.reshape(shape),
+            'basis': (n, u, v)
+        }
+
+    def _interpolate(self, nodes, method, k, max_distance, workers):
+        """Значения T в узлах по ближайшим точкам"""
+        T = self._columns['T']
+        k = 1 if method == 'nearest' else max(1, min(int(k), len(self)))
+        upper = np.inf if max_distance is None else max_distance
+        distances, indices = self.tree.query(nodes, k=k, distance_upper_bound=upper, workers=workers)
+        if k == 1:
+            distances, indices = distances[:, None], indices[:, None]
+
+        # Соседи дальше max_distance возвращаются с индексом len(T)
+        found = indices < len(T)
+        neighbours = np.where(found, T[np.minimum(indices, len(T) - 1)], 0.0)
+        if k == 1:
+            return np.where(found[:, 0], neighbours[:, 0], np.nan)
+
+        with np.errstate(divide='ignore'):
+            weights = np.where(found, 1.0 / distances ** IDW_POWER, 0.0)
+        # Узел совпадает с точкой данных: берем ее значение
+        exact = distances[:, 0] == 0
+        weights[exact] = 0.0
+        weights[exact, 0] = 1.0
+
+        total = weights.sum(axis=1)
+        with np.errstate(invalid='ignore'):
+            result = (weights * neighbours).sum(axis=1) / total
+        result[total == 0] = np.nan
+        return result
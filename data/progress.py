@@ -0,0 +1,16 @@
+"""
+Отчет о ходе загрузки.
+
+Функции загрузки DataLoader принимают необязательный progress -
+функцию progress(stage, done=None, total=None, rows=None): название
+этапа, прочитано байт из total и число разобранных строк. Она
+вызывается после каждого блока файла; чтобы прервать загрузку,
+progress выбрасывает LoadCancelled.
+
+Модуль не зависит от numpy и pandas, чтобы окно могло импортировать
+его при запуске.
+"""
+
+
+class LoadCancelled(Exception):
+    """Загрузка отменена пользователем"""
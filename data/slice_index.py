@@ -0,0 +1,120 @@
+import itertools
+import numpy as np
+import pandas as pd
+from data.plane_sampler import AXIS_NORMALS, DEFAULT_NEIGHBORS, PlaneSampler
+from data.structured_grid import StructuredGrid
+
+AXES = ['x', 'y', 'z']
+
+# Счетчик версий наборов данных: у каждого индекса своя версия
+_versions = itertools.count(1)
+
+
+class SliceIndex:
+    """
+    Индекс для быстрых срезов по осям.
+
+    Для каждой оси один раз строится перестановка сортировки (argsort),
+    после чего точки в полосе |axis - value| <= tolerance находятся двумя
+    бинарными поисками за O(log N + k), без полного прохода по данным.
+    Перестановки строятся лениво - только для используемых осей.
+
+    Если данные лежат на структурированной решетке (grid), срез по одному
+    слою решетки берется индексированием плотного массива за O(k).
+
+    Интерполированные срезы по произвольным плоскостям считаются через
+    sampler (PlaneSampler), KD-дерево которого строится при первом таком
+    срезе.
+    """
+
+    def __init__(self, data: pd.DataFrame, grid: StructuredGrid = None):
+        self.data = data
+        self.grid = grid
+        # Версия набора данных - часть ключа кэшей, зависящих от данных
+        self.version = next(_versions)
+        self._columns = {col: data[col].to_numpy() for col in data.columns}
+        self.sampler = PlaneSampler(self._columns)
+        self._order = {}
+        self._sorted = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    def memory_usage(self):
+        """
+        Объем построенных перестановок, решетки и KD-дерева в байтах
+        (колонки данных не копируются и не учитываются)
+        """
+        total = sum(a.nbytes for a in self._order.values()) + sum(a.nbytes for a in self._sorted.values())
+        total += self.sampler.memory_usage()
+        if self.grid is not None:
+            total += self.grid.memory_usage()
+        return total
+
+    def _build_axis(self, axis):
+        """Построение перестановки сортировки для оси"""
+        if axis not in self._order:
+            values = self._columns[axis]
+            order = np.argsort(values, kind='stable')
+            if len(order) < 2 ** 31:
+                # Перестановка хранится все время работы с данными: int32 вдвое меньше
+                order = order.astype(np.int32)
+            self._order[axis] = order
+            self._sorted[axis] = values[order]
+        return self._order[axis], self._sorted[axis]
+
+    def query(self, axis: str, value: float, tolerance=0.1) -> np.ndarray:
+        """
+        Позиции точек среза (массив индексов строк).
+
+        Возвращается представление (view) перестановки сортировки без
+        копирования; точки упорядочены по значению оси. Для среза по слою
+        решетки возвращаются строки этого слоя.
+        """
+        if axis not in AXES:
+            raise ValueError(f"Неизвестная ось среза: {axis}")
+
+        if self.grid is not None:
+            rows = self.grid.slice_rows(axis, value, tolerance, self.data)
+            if rows is not None:
+                return rows
+
+        order, sorted_values = self._build_axis(axis)
+
+        # Границы полосы берем с небольшим запасом, а затем уточняем тем же
+        # условием |v - value| <= tolerance, что и при полном проходе
+        margin = (abs(value) + abs(tolerance)) * 1e-12
+        lo = np.searchsorted(sorted_values, value - tolerance - margin, side='left')
+        hi = np.searchsorted(sorted_values, value + tolerance + margin, side='right')
+
+        inside = np.flatnonzero(np.abs(sorted_values[lo:hi] - value) <= tolerance)
+        if len(inside) == 0:
+            return order[lo:lo]
+        return order[lo + inside[0]:lo + inside[-1] + 1]
+
+    def count(self, axis: str, value: float, tolerance=0.1) -> int:
+        """Число точек в срезе"""
+        return len(self.query(axis, value, tolerance))
+
+    def get_slice_data(self, axis: str, value: float, tolerance=0.1) -> pd.DataFrame:
+        """DataFrame с точками среза (собираются только k строк среза)"""
+        return self.take(self.query(axis, value, tolerance))
+
+    def sample_plane(self, axis: str, value: float, normal=None, grid_size=100, method='nearest',
+                     k=DEFAULT_NEIGHBORS) -> dict:
+        """
+        Интерполированный срез по плоскости через центр данных со значением
+        value по оси axis (см. PlaneSampler.sample). normal=None - плоскость,
+        перпендикулярная оси, иначе - наклонная плоскость с этой нормалью.
+        """
+        if axis not in AXES:
+            raise ValueError(f"Неизвестная ось среза: {axis}")
+        normal = AXIS_NORMALS[axis] if normal is None else normal
+        return self.sampler.sample(self.sampler.default_origin(axis, value), normal, grid_size, method, k)
+
+    def take(self, indices) -> pd.DataFrame:
+        """DataFrame из строк с заданными позициями"""
+        return pd.DataFrame(
+            {col: values[indices] for col, values in self._columns.items()},
+            copy=False
+        )
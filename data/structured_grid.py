@@ -0,0 +1,220 @@
+import numpy as np
+import pandas as pd
+
+AXES = ['x', 'y', 'z']
+
+# Число знаков, до которого округляются координаты при поиске узлов решетки
+# (значения в файлах решателя записаны с 6 знаками)
+DEFAULT_DECIMALS = 6
+
+# Минимальная доля занятых узлов, при которой данные считаются сеткой
+MIN_FILL_RATIO = 0.5
+
+# Размер выборки для быстрой проверки рассеянных данных
+SAMPLE_SIZE = 20000
+
+# Оси двумерной панели среза: (горизонтальная, вертикальная)
+PLANE_AXES = {'x': ('y', 'z'), 'y': ('x', 'z'), 'z': ('x', 'y')}
+
+
+def _unique_close(values, tolerance):
+    """
+    Уникальные значения с объединением соседних, отличающихся не больше
+    чем на tolerance (ошибки округления при записи и вычитании сдвига).
+    Возвращает значения и индекс значения для каждого элемента.
+    """
+    unique, inverse = np.unique(values, return_inverse=True)
+    first = np.concatenate(([True], np.diff(unique) > tolerance))
+    group = np.cumsum(first) - 1
+    return unique[first], group[inverse]
+
+
+class StructuredGrid:
+    """
+    Данные на регулярной решетке в виде плотного трехмерного массива.
+
+    values[i, j, k] - температура в узле с координатами coords['x'][i],
+    coords['y'][j], coords['z'][k] (NaN, если узла нет в данных), а
+    rows[i, j, k] - номер соответствующей строки исходного DataFrame (-1).
+
+    Поддерживаются решетки со сдвигом рядов (как в примере
+    FileUtils.create_example_csv): координата по оси stagger_axis равна
+    coords[stagger_axis][i] + shifts[j], где j - индекс по оси shift_axis.
+    """
+
+    def __init__(self, coords, values, rows, stagger_axis=None, shift_axis=None, shifts=None):
+        self.coords = coords
+        self.values = values
+        self.rows = rows
+        self.stagger_axis = stagger_axis
+        self.shift_axis = shift_axis
+        self.shifts = shifts
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def memory_usage(self):
+        """Объем плотных массивов решетки в байтах"""
+        total = self.values.nbytes + self.rows.nbytes + sum(c.nbytes for c in self.coords.values())
+        if self.shifts is not None:
+            total += np.asarray(self.shifts).nbytes
+        return total
+
+    @property
+    def fill_ratio(self):
+        """Доля узлов решетки, для которых есть точки"""
+        return np.count_nonzero(self.rows >= 0) / self.rows.size
+
+    @classmethod
+    def detect(cls, data: pd.DataFrame, decimals=DEFAULT_DECIMALS, min_fill_ratio=MIN_FILL_RATIO):
+        """
+        Определение, лежат ли точки на структурированной решетке.
+
+        Возвращает StructuredGrid или None для рассеянных данных.
+        """
+        if len(data) == 0:
+            return None
+
+        columns = {axis: np.round(data[axis].to_numpy(dtype=np.float64), decimals) for axis in AXES}
+        # Координаты записаны с decimals знаками, а сдвиг ряда вычитается
+        # из округленных значений: допускаем ошибку в две единицы разряда
+        tolerance = 2 * 10.0 ** -decimals
+        max_nodes = len(data) / min_fill_ratio
+
+        # Быстрая проверка по прореженной выборке: число уникальных значений
+        # в выборке не больше, чем во всех данных, поэтому рассеянные точки
+        # отбрасываются без сортировки всех координат
+        step = max(1, len(data) // SAMPLE_SIZE)
+        sample_counts = {axis: len(np.unique(columns[axis][::step])) for axis in AXES}
+
+        # Прямоугольная решетка: узлы - декартово произведение уникальных координат
+        best = None
+        if np.prod([sample_counts[axis] for axis in AXES], dtype=np.float64) <= max_nodes:
+            best = cls._build(data, columns, min_fill_ratio, tolerance)
+
+        # Решетка со сдвигом рядов: вычитаем из координаты сдвиг ряда.
+        # Сдвинутые ряды дают и прямоугольную решетку с пустыми узлами,
+        # поэтому выбираем вариант с наибольшей долей занятых узлов
+        for stagger_axis in sorted(AXES, key=lambda a: -sample_counts[a]):
+            for shift_axis in AXES:
+                if best is not None and best.fill_ratio >= 1.0:
+                    return best
+                if shift_axis == stagger_axis:
+                    continue
+                other_axis = next(a for a in AXES if a not in (stagger_axis, shift_axis))
+                if sample_counts[stagger_axis] * sample_counts[other_axis] > max_nodes:
+                    continue
+
+                row_values, row_index = np.unique(columns[shift_axis], return_inverse=True)
+                shifts = np.full(len(row_values), np.inf)
+                np.minimum.at(shifts, row_index, columns[stagger_axis])
+                if np.allclose(shifts, shifts[0]):
+                    continue
+
+                shifted = dict(columns)
+                shifted[stagger_axis] = np.round(columns[stagger_axis] - shifts[row_index], decimals)
+                grid = cls._build(data, shifted, min_fill_ratio, tolerance)
+                if grid is not None and (best is None or grid.fill_ratio > best.fill_ratio):
+                    grid.stagger_axis = stagger_axis
+                    grid.shift_axis = shift_axis
+                    grid.shifts = shifts
+                    best = grid
+
+        return best
+
+    @classmethod
+    def _build(cls, data, columns, min_fill_ratio, tolerance=0.0):
+        """Построение плотного массива, если координаты образуют решетку без повторов"""
+        coords = {}
+        indices = []
+        for axis in AXES:
+            coords[axis], index = _unique_close(columns[axis], tolerance)
+            indices.append(index)
+
+        shape = tuple(len(coords[axis]) for axis in AXES)
+        num_nodes = shape[0] * shape[1] * shape[2]
+        if len(data) < min_fill_ratio * num_nodes:
+            return None
+
+        flat = np.ravel_multi_index(indices, shape)
+        # Номера строк - самый узкий знаковый тип, вмещающий число точек
+        rows = np.full(num_nodes, -1, dtype=np.int32 if len(data) < 2 ** 31 else np.int64)
+        rows[flat] = np.arange(len(data))
+        # Два узла в одной ячейке - это не решетка
+        if np.count_nonzero(rows >= 0) != len(data):
+            return None
+
+        # Температуры в типе данных: float32 в компактном режиме
+        T = data['T'].to_numpy()
+        values = np.full(num_nodes, np.nan, dtype=T.dtype if T.dtype.kind == 'f' else np.float64)
+        values[flat] = T
+        return cls(coords, values.reshape(shape), rows.reshape(shape))
+
+    def _layer(self, axis, value, tolerance):
+        """Индекс единственного слоя решетки в полосе среза или None"""
+        if axis == self.stagger_axis:
+            # Сечение поперек сдвинутых рядов не является слоем решетки
+            return None
+        layers = np.flatnonzero(np.abs(self.coords[axis] - value) <= tolerance)
+        if len(layers) != 1:
+            return None
+        return int(layers[0])
+
+    def slice_rows(self, axis, value, tolerance, data: pd.DataFrame = None):
+        """
+        Строки исходных данных в срезе за O(k) по одному слою решетки.
+
+        Возвращает None, если полоса среза не совпадает ровно с одним
+        слоем решетки; тогда нужно использовать обычный поиск по точкам.
+        Если передан data, попадание точек слоя в полосу проверяется по
+        точным (неокругленным) координатам.
+        """
+        layer = self._layer(axis, value, tolerance)
+        if layer is None:
+            return None
+
+        axis_pos = AXES.index(axis)
+        rows = np.take(self.rows, layer, axis=axis_pos).ravel()
+        rows = rows[rows >= 0]
+
+        if data is not None:
+            exact = data[axis].to_numpy()[rows]
+            if not np.all(np.abs(exact - value) <= tolerance):
+                return None
+        return rows
+
+    def slice_plane(self, axis, value, tolerance):
+        """
+        Двумерная сетка среза для изотерм без интерполяции.
+
+        Возвращает (X, Y, T) - двумерные массивы координат панели среза
+        (оси PLANE_AXES[axis]) и температуры, или None. Слой с пустыми
+        узлами (решетка заполнена не полностью, например после
+        округления сдвинутых рядов) не возвращается: контуры по нему
+        получаются с разрывами, и изотермы нужно строить интерполяцией.
+        """
+        layer = self._layer(axis, value, tolerance)
+        if layer is None:
+            return None
+
+        h_axis, v_axis = PLANE_AXES[axis]
+        T = np.take(self.values, layer, axis=AXES.index(axis))
+        if np.isnan(T).any():
+            return None
+        X, Y = np.meshgrid(self.coords[h_axis], self.coords[v_axis], indexing='ij')
+
+        # Учитываем сдвиг рядов решетки
+        if self.stagger_axis is not None:
+            if self.shift_axis == axis:
+                shift = self.shifts[layer]
+            elif self.shift_axis == h_axis:
+                shift = self.shifts[:, None]
+            else:
+                shift = self.shifts[None, :]
+            if self.stagger_axis == h_axis:
+                X = X + shift
+            else:
+                Y = Y + shift
+
+        return X, Y, T
@@ -0,0 +1,108 @@
+import queue
+import threading
+from data.progress import LoadCancelled
+
+
+class LoadWorker:
+    """
+    Загрузка данных в фоновом потоке с отчетом о ходе и отменой.
+
+    Функция загрузки получает report(stage, done=None, total=None,
+    rows=None) и вызывает ее после каждого блока файла. Сообщения
+    передаются в главный цикл Tk через потокобезопасную очередь, которая
+    опрашивается по таймеру root.after. После отмены (или запуска новой
+    загрузки) очередной вызов report выбрасывает LoadCancelled, и чтение
+    прерывается; результаты прежних загрузок отбрасываются.
+    """
+
+    def __init__(self, root, on_progress, on_done, on_error=None, on_cancelled=None, poll_ms=50):
+        """
+        on_progress(stage, done, total, rows) - ход загрузки (главный поток)
+        on_done(result) - результат загрузки (главный поток)
+        on_error(error) - исключение из функции загрузки (главный поток)
+        on_cancelled() - загрузка прервана (главный поток)
+        """
+        self.root = root
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancelled = on_cancelled
+        self.poll_ms = poll_ms
+
+        self._generation = 0
+        self._active = None # поколение последней незавершенной загрузки
+        self._running = 0 # число живых рабочих потоков, включая отмененные
+        self._poll_id = None
+        self._messages = queue.Queue()
+
+    def start(self, load):
+        """Запуск load(report) в рабочем потоке; текущая загрузка отменяется"""
+        self._generation += 1
+        generation = self._generation
+
+        def report(stage, done=None, total=None, rows=None):
+            if generation != self._generation:
+                raise LoadCancelled()
+            self._messages.put((generation, 'progress', (stage, done, total, rows)))
+
+        self._active = generation
+        self._running += 1
+        thread = threading.Thread(target=self._run, args=(generation, load, report), daemon=True)
+        thread.start()
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def cancel(self):
+        """Отмена текущей загрузки (прервется на следующем вызове report)"""
+        if self._active is not None:
+            self._generation += 1
+            self._active = None
+            if self.on_cancelled is not None:
+                self.on_cancelled()
+
+    def is_busy(self):
+        """Идет ли загрузка, результат которой еще нужен"""
+        return self._active is not None
+
+    def _run(self, generation, load, report):
+        """Тело рабочего потока"""
+        try:
+            result = load(report)
+            self._messages.put((generation, 'done', result))
+        except LoadCancelled:
+            # Об отмене главный поток уже знает из cancel или start
+            self._messages.put((generation, 'cancelled', None))
+        except Exception as e:
+            self._messages.put((generation, 'error', e))
+
+    def _poll(self):
+        """Передача сообщений рабочих потоков в главный поток"""
+        self._poll_id = None
+        latest_progress = None
+        while True:
+            try:
+                generation, kind, payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'progress':
+                if generation == self._generation:
+                    latest_progress = payload
+                continue
+
+            self._running -= 1
+            if generation != self._active:
+                continue
+            self._active = None
+            latest_progress = None
+            if kind == 'done':
+                self.on_done(payload)
+            elif kind == 'error' and self.on_error is not None:
+                self.on_error(payload)
+
+        # Показываем только последнее состояние, промежуточные не нужны
+        if latest_progress is not None:
+            self.on_progress(*latest_progress)
+
+        if self._running > 0:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
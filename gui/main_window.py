@@ -1,27 +1,46 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
-from data.data_loader import DataLoader
-from visualization.plot_3d import Plot3D
+from gui.load_worker import LoadWorker
+from gui.playback import FrameCache, PlaybackController, FRAME_CACHE_SIZE
+from gui.startup import ModuleWarmer
+from gui.update_scheduler import UpdateScheduler
 from utils.file_utils import FileUtils
-import pandas as pd
-import numpy as np
+from utils.profiler import profiler
+
+# Задержка перед фоновой загрузкой тяжелых модулей (окно уже отрисовано)
+WARM_UP_DELAY_MS = 100
 
 class Graph3DApp:
     def __init__(self, root):
         self.root = root
         self.root.title("3D Graph Viewer")
-        self.root.geometry("700x850") # ширина х высота
+        self.root.geometry("700x910") # ширина х высота
         
-        self.data_loader = DataLoader()
-        self.plot_3d = Plot3D()
+        # pandas, matplotlib и scipy загружаются при первом обращении или
+        # в фоне после появления окна (см. warm_up)
+        self._data_loader = None
+        self._data_processor = None
+        self._plot_3d = None
+        self.module_warmer = ModuleWarmer()
         self.file_utils = FileUtils()
         
         self.file_path = None
+        self.dataset = None # исходные точки файла и кэш прореживания
         self.data = None
+        self.slice_index = None # индекс срезов для текущих данных
+        self.summary = None # сводка по текущим данным (DataSummary)
         self.slice_value = tk.DoubleVar(value=0.0)
         self.tolerance_value = tk.DoubleVar(value=0.1)
         self.slice_axis = tk.StringVar(value="z")
+        # Интерполированный срез по KD-дереву вместо полосы погрешности
+        self.slice_interpolated = tk.BooleanVar(value=False)
+        self.interpolation_method = tk.StringVar(value="nearest") # "nearest", "idw"
+        self.interpolation_neighbors = tk.IntVar(value=8) # соседей для "idw"
+        self.slice_oblique = tk.BooleanVar(value=False) # наклонная плоскость с нормалью ниже
+        self.normal_x = tk.DoubleVar(value=0.0)
+        self.normal_y = tk.DoubleVar(value=0.0)
+        self.normal_z = tk.DoubleVar(value=1.0)
         self.show_isotherms = tk.BooleanVar(value=True)
         self.num_isotherms = tk.IntVar(value=10)
         self.current_figure = None
@@ -31,8 +50,74 @@ class Graph3DApp:
         self.bin_width_y = tk.DoubleVar(value=0.5)
         self.bin_width_z = tk.DoubleVar(value=0.5)
         self.round_precision = tk.IntVar(value=0) # 0 - целые, 1 - один знак и т.д.
+        self.bin_centers = tk.BooleanVar(value=False) # центры бинов вместо центроидов
+        self.use_pyramid = tk.BooleanVar(value=True) # пирамида бинов для смены ширины без пересчета
+        self.compact_mode = tk.BooleanVar(value=False) # колонки float32 вместо float64
+
+        # Серия файлов по шагам времени и ее проигрывание
+        self.collection = None # DatasetCollection
+        self.series_source = None # каталог серии
+        self.frame_states = FrameCache(2 * FRAME_CACHE_SIZE) # данные, индекс срезов и сводка кадров
+        self.playback_fps = tk.IntVar(value=5)
+        self.playback_info = tk.StringVar(value="Серия не загружена")
+
+        # Замер времени по этапам (разбивка последнего действия в строке состояния)
+        self.profiling = tk.BooleanVar(value=profiler.enabled)
+
+        # Загрузка и прореживание файла в фоне; прежние данные остаются
+        # на экране и доступны, пока новые не готовы
+        self.load_worker = LoadWorker(
+            self.root,
+            on_progress=self._on_load_progress,
+            on_done=self._on_load_done,
+            on_error=self._on_load_error,
+            on_cancelled=self._on_load_cancelled
+        )
+        self.load_info = tk.StringVar(value="")
+        
+        # Фоновые обновления графика при движении ползунка и смене настроек
+        self.update_scheduler = UpdateScheduler(
+            self.root,
+            compute=self._compute_plot_update,
+            apply=self._apply_plot_update,
+            on_error=self._on_plot_update_error
+        )
+        
+        self.playback = PlaybackController(
+            self.root,
+            frame_count=lambda: len(self.collection) if self.collection is not None else 0,
+            prepare_frame=self._prepare_playback_frame,
+            show_frame=self._show_playback_frame,
+            get_params=self._playback_settings
+        )
         
         self.create_widgets()
+        self.root.after(WARM_UP_DELAY_MS, self.warm_up)
+
+    @property
+    def data_loader(self):
+        if self._data_loader is None:
+            from data.data_loader import DataLoader
+            self._data_loader = DataLoader(compact=self.compact_mode.get())
+        return self._data_loader
+
+    @property
+    def data_processor(self):
+        if self._data_processor is None:
+            from data.data_processor import DataProcessor
+            self._data_processor = DataProcessor()
+        return self._data_processor
+
+    @property
+    def plot_3d(self):
+        if self._plot_3d is None:
+            from visualization.plot_3d import Plot3D
+            self._plot_3d = Plot3D()
+        return self._plot_3d
+
+    def warm_up(self):
+        """Фоновая загрузка модулей для данных и графиков"""
+        self.module_warmer.start()
         
     def create_widgets(self):
         # Заголовок
@@ -86,6 +171,10 @@ class Graph3DApp:
         tk.Radiobutton(method_frame, text="Округление", 
                       variable=self.thinning_method, value="rounding",
                       command=self.on_thinning_method_change).pack(side=tk.LEFT, padx=10)
+
+        tk.Checkbutton(method_frame, text="Компактно (float32)",
+                      variable=self.compact_mode,
+                      command=self.on_compact_mode_change).pack(side=tk.RIGHT, padx=10)
         
         # Фрейм для настроек биннинга
         self.binning_frame = tk.Frame(thinning_frame)
@@ -110,9 +199,27 @@ class Graph3DApp:
                                    width=6, font=("Arial", 9))
         self.bin_z_entry.pack(side=tk.LEFT, padx=2)
         self.bin_z_entry.bind('<Return>', self.on_thinning_method_change)
+
+        tk.Checkbutton(self.binning_frame, text="Центры бинов",
+                      variable=self.bin_centers,
+                      command=self.on_thinning_method_change).pack(side=tk.LEFT, padx=10)
+
+        tk.Checkbutton(self.binning_frame, text="Пирамида",
+                      variable=self.use_pyramid,
+                      command=self.on_thinning_method_change).pack(side=tk.LEFT)
         
         self.binning_frame.pack_forget()
 
+        # Фрейм для настроек округления
+        self.rounding_frame = tk.Frame(thinning_frame)
+        self.rounding_frame.pack(fill=tk.X, pady=5)
+
+        tk.Label(self.rounding_frame, text="Знаков после запятой:", font=("Arial", 9)).pack(side=tk.LEFT)
+        self.round_entry = tk.Entry(self.rounding_frame, textvariable=self.round_precision,
+                                   width=6, font=("Arial", 9))
+        self.round_entry.pack(side=tk.LEFT, padx=2)
+        self.round_entry.bind('<Return>', self.on_thinning_method_change)
+
         # Фрейм для управления срезом
         slice_frame = tk.LabelFrame(self.root, text="Управление срезом", font=("Arial", 10))
         slice_frame.pack(pady=10, padx=20, fill=tk.X)
@@ -157,6 +264,36 @@ class Graph3DApp:
         self.tolerance_entry.pack(side=tk.LEFT, padx=5)
         self.tolerance_entry.bind('<Return>', self.on_slice_entry_change)
 
+        # Интерполированный срез: значения в узлах сетки на плоскости по
+        # ближайшим точкам, без полосы погрешности
+        interpolation_frame = tk.Frame(slice_frame)
+        interpolation_frame.pack(fill=tk.X, pady=5)
+
+        tk.Checkbutton(interpolation_frame, text="Интерполяция (KD-дерево)",
+                      variable=self.slice_interpolated,
+                      command=self.on_slice_mode_change).pack(side=tk.LEFT)
+        tk.Radiobutton(interpolation_frame, text="Ближайшая", variable=self.interpolation_method,
+                      value="nearest", command=self.on_slice_mode_change).pack(side=tk.LEFT, padx=5)
+        tk.Radiobutton(interpolation_frame, text="ОВР", variable=self.interpolation_method,
+                      value="idw", command=self.on_slice_mode_change).pack(side=tk.LEFT, padx=5)
+        tk.Label(interpolation_frame, text="Соседей:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(10, 2))
+        neighbors_spin = tk.Spinbox(interpolation_frame, from_=1, to=64, textvariable=self.interpolation_neighbors,
+                                    width=4, command=self.on_slice_mode_change)
+        neighbors_spin.pack(side=tk.LEFT)
+        neighbors_spin.bind('<Return>', self.on_slice_mode_change)
+
+        # Наклонная плоскость проходит через значение среза на выбранной оси
+        normal_frame = tk.Frame(slice_frame)
+        normal_frame.pack(fill=tk.X, pady=5)
+
+        tk.Checkbutton(normal_frame, text="Наклонная плоскость, нормаль:",
+                      variable=self.slice_oblique,
+                      command=self.on_slice_mode_change).pack(side=tk.LEFT)
+        for variable in (self.normal_x, self.normal_y, self.normal_z):
+            normal_entry = tk.Entry(normal_frame, textvariable=variable, width=6, font=("Arial", 9))
+            normal_entry.pack(side=tk.LEFT, padx=2)
+            normal_entry.bind('<Return>', self.on_slice_mode_change)
+
 
         # Фрейм для настроек изотерм
         isotherm_frame = tk.LabelFrame(self.root, text="Настройки изотерм", font=("Arial", 10))
@@ -182,10 +319,58 @@ class Graph3DApp:
         # Привязываем событие изменения текста в Spinbox
         self.isotherm_spin.bind('<KeyRelease>', self.on_isotherm_spin_change)
         
+        # Фрейм для проигрывания серии файлов
+        playback_frame = tk.LabelFrame(self.root, text="Анимация по файлам", font=("Arial", 10))
+        playback_frame.pack(pady=5, padx=20, fill=tk.X)
+        
+        playback_controls = tk.Frame(playback_frame)
+        playback_controls.pack(fill=tk.X, pady=5)
+        
+        tk.Button(playback_controls, text="Загрузить серию", 
+                 command=self.load_series).pack(side=tk.LEFT, padx=5)
+        tk.Button(playback_controls, text="<", width=3,
+                 command=lambda: self.step_playback(-1)).pack(side=tk.LEFT, padx=2)
+        self.play_btn = tk.Button(playback_controls, text="Пуск", width=7,
+                                 command=self.toggle_playback)
+        self.play_btn.pack(side=tk.LEFT, padx=2)
+        tk.Button(playback_controls, text=">", width=3,
+                 command=lambda: self.step_playback(1)).pack(side=tk.LEFT, padx=2)
+        
+        tk.Label(playback_controls, text="Кадров/с:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(20, 5))
+        tk.Spinbox(playback_controls, from_=1, to=30, textvariable=self.playback_fps, width=4,
+                  command=self.on_playback_fps_change).pack(side=tk.LEFT, padx=5)
+        
+        tk.Label(playback_frame, textvariable=self.playback_info, font=("Arial", 9),
+                anchor=tk.W).pack(fill=tk.X, padx=5)
+        
         # Область для отображения информации
         self.info_text = tk.Text(self.root, height=12, width=70, font=("Courier", 10))
         self.info_text.pack(pady=10, padx=20, fill=tk.BOTH, expand=True)
         
+        # Ход загрузки файла и отмена
+        load_frame = tk.Frame(self.root)
+        load_frame.pack(fill=tk.X, padx=20)
+        
+        self.load_progress = ttk.Progressbar(load_frame, length=200, mode='determinate', maximum=100)
+        self.load_progress.pack(side=tk.LEFT, padx=(0, 5))
+        tk.Label(load_frame, textvariable=self.load_info, font=("Arial", 9),
+                anchor=tk.W).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.cancel_load_btn = tk.Button(load_frame, text="Отмена", state=tk.DISABLED,
+                                        command=self.load_worker.cancel)
+        self.cancel_load_btn.pack(side=tk.RIGHT)
+        
+        # Замер времени по этапам
+        profiling_frame = tk.Frame(self.root)
+        profiling_frame.pack(fill=tk.X, padx=20)
+        
+        tk.Checkbutton(profiling_frame, text="Замер времени по этапам",
+                      variable=self.profiling,
+                      command=self.on_profiling_change).pack(side=tk.LEFT)
+        tk.Button(profiling_frame, text="Сохранить трассировку",
+                 command=self.save_trace).pack(side=tk.RIGHT)
+        tk.Button(profiling_frame, text="Сохранить данные",
+                 command=self.save_data).pack(side=tk.RIGHT, padx=5)
+        
         # Статус бар
         self.status_var = tk.StringVar()
         self.status_var.set("Готов к работе")
@@ -200,10 +385,13 @@ class Graph3DApp:
         
         # Скрываем все фреймы настроек
         self.binning_frame.pack_forget()
+        self.rounding_frame.pack_forget()
         
         # Показываем нужный фрейм
         if method == "binning":
             self.binning_frame.pack(fill=tk.X, pady=5)
+        else:
+            self.rounding_frame.pack(fill=tk.X, pady=5)
         
         # Обновляем статус
         method_names = {
@@ -211,14 +399,19 @@ class Graph3DApp:
             "rounding": "округление"
         }
         self.status_var.set(f"Метод прореживания: {method_names[method]}")
-        self.update_data()
-        if self.current_figure:
-            self.update_plot()
+        # График обновляется, когда прореженные данные будут готовы
+        self.update_data(update_plot=True)
+
+    def on_compact_mode_change(self):
+        """Переключение компактного режима: данные перечитываются в новом типе"""
+        self._data_loader = None
+        if self.file_path or self.collection is not None:
+            self.update_data(reload=True, update_plot=True)
 
     def on_isotherm_settings_change(self):
         """Обработчик изменения настроек изотерм"""
         if self.data is not None and self.current_figure:
-            self.update_plot()
+            self.request_plot_update()
 
     def on_isotherm_spin_change(self, event=None):
         """Обработчик ручного ввода в Spinbox"""
@@ -228,7 +421,7 @@ class Graph3DApp:
             if 3 <= value <= 50:  # Проверяем диапазон
                 self.num_isotherms.set(value)
                 if self.data is not None and self.current_figure:
-                    self.update_plot()
+                    self.request_plot_update()
         except ValueError:
             # Игнорируем некорректный ввод
             pass
@@ -239,8 +432,21 @@ class Graph3DApp:
             self.update_slider_range()
             self.show_slice_info()
             if self.current_figure:
-                self.update_plot()
+                self.request_plot_update()
     
+    def on_slice_mode_change(self, event=None):
+        """Обработчик смены режима среза, метода интерполяции или нормали"""
+        if self.data is None:
+            return
+        try:
+            self._slice_params()
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Ошибка", "Введите корректные параметры интерполяции и ненулевую нормаль")
+            return
+        self.show_slice_info()
+        if self.current_figure:
+            self.request_plot_update()
+
     def on_slice_entry_change(self, event=None):
         """Обработчик изменения значения в поле ввода"""
         try:
@@ -250,67 +456,203 @@ class Graph3DApp:
             self.tolerance_value.set(tolerance)
             self.show_slice_info()
             if self.data is not None and self.current_figure:
-                self.update_plot()
+                self.request_plot_update()
         except ValueError:
             messagebox.showerror("Ошибка", "Введите корректное числовое значение")
     
     def on_slider_value_change(self, value):
         """Обработчик изменения ползунка"""
         if self.data is not None and self.current_figure:
-            self.update_plot()
+            self.request_plot_update()
 
     def on_slider_tolerance_change(self, value):
         """Обработчик изменения ползунка"""
         if self.data is not None and self.current_figure:
-            self.update_plot()
+            self.request_plot_update()
     
     def update_slider_range(self):
         """Обновление диапазона ползунка в зависимости от данных и выбранной оси"""
-        if self.data is None:
+        if self.data is None or self.data.empty:
             return
             
         axis = self.slice_axis.get()
-        min_val = self.data[axis].min()
-        max_val = self.data[axis].max()
+        min_val, max_val = self.summary.range(axis)
         
         self.slice_slider.config(from_=min_val, to=max_val)
         # Устанавливаем среднее значение по умолчанию
         self.slice_value.set((min_val + max_val) // 2)
     
     def load_data(self):
-        """Загрузка данных из CSV файла"""
-        self.file_path = filedialog.askopenfilename(
-            title="Выберите DAT или CSV файл с данными",
-            filetypes=[("DAT files", "*.dat"), ("CSV files", "*.csv"), ("All files", "*.*")]
+        """Загрузка данных из DAT, CSV или колоночного файла"""
+        file_path = filedialog.askopenfilename(
+            title="Выберите файл с данными",
+            filetypes=[("DAT files", "*.dat"), ("CSV files", "*.csv"),
+                       ("Binary files", "*.npz *.parquet *.feather *.h5 *.hdf5"), ("All files", "*.*")]
         )
+        if not file_path:
+            return
 
-        self.update_data()
+        # Новый выбор файла всегда перечитывает данные
+        self.update_data(file_path, reload=True)
         
-    def update_data(self):
-        if self.file_path:
-            try:
-                # Получаем выбранный метод прореживания
-                method = self.thinning_method.get()
-                if method == "binning":
-                    self.data = self.data_loader.load_data(
-                        self.file_path, 
-                        fl_binning=True,
-                        bin_width_x=self.bin_width_x.get(),
-                        bin_width_y=self.bin_width_y.get(),
-                        bin_width_z=self.bin_width_z.get()
-                    )
-                else:
-                    self.data = self.data_loader.load_data(self.file_path)
-                self.show_data_info()
-                self.update_slider_range()
-                self.show_slice_info()
-                self.status_var.set(f"Данные загружены из: {os.path.basename(self.file_path)}")
-                
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Не удалось загрузить данные: {str(e)}")
-                self.status_var.set("Ошибка загрузки данных")
-        else:
+    def update_data(self, file_path=None, reload=False, update_plot=False):
+        """
+        Загрузка и прореживание файла в фоновом потоке.
+
+        Файл читается только при смене файла (или reload=True), иначе
+        заново прореживаются уже загруженные точки. Текущие данные
+        заменяются, когда новые готовы (_on_load_done).
+        """
+        if file_path is None and self.collection is not None:
+            # Серия файлов прореживается заново при загрузке
+            self.load_series(self.series_source)
+            return
+        file_path = file_path or self.file_path
+        if not file_path:
             self.load_data()
+            return
+
+        try:
+            params = {
+                'file_path': file_path,
+                'dataset': None if reload or self.dataset is None or self.dataset.file_path != file_path
+                           else self.dataset,
+                'data_loader': self.data_loader,
+                'method': self.thinning_method.get(),
+                'bin_widths': (self.bin_width_x.get(), self.bin_width_y.get(), self.bin_width_z.get()),
+                'precision': self.round_precision.get(),
+                'bin_output': 'center' if self.bin_centers.get() else 'centroid',
+                'use_pyramid': self.use_pyramid.get(),
+                'update_plot': update_plot
+            }
+        except tk.TclError as e:
+            messagebox.showerror("Ошибка", f"Некорректные параметры прореживания: {str(e)}")
+            return
+
+        self.cancel_load_btn.config(state=tk.NORMAL)
+        self.load_progress.config(mode='determinate', value=0)
+        self.load_info.set(f"Загрузка {os.path.basename(file_path)}...")
+        self.status_var.set(f"Загрузка данных из: {os.path.basename(file_path)}")
+        self.load_worker.start(lambda report: self._load_dataset(params, report))
+
+    def _load_dataset(self, params, report):
+        """Чтение, прореживание и индексирование файла (выполняется в рабочем потоке)"""
+        with profiler.operation("Загрузка данных") as record:
+            dataset = params['dataset']
+            data_loader = params['data_loader']
+            if dataset is None:
+                from data.dataset import Dataset
+                report("чтение файла")
+                dataset = Dataset.from_file(params['file_path'], data_loader, progress=report)
+
+            if params['method'] == "binning" and params['use_pyramid']:
+                # Пирамида строится один раз (или читается из кэша); дальше
+                # ширины, кратные базовой, считаются по ней
+                if dataset.pyramid is None:
+                    from data.bin_pyramid import BASE_SUBDIVISION
+                    report("пирамида бинов")
+                    dataset.build_pyramid(tuple(w / BASE_SUBDIVISION for w in params['bin_widths']))
+            elif not params['use_pyramid']:
+                dataset.drop_pyramid()
+
+            report("прореживание")
+            data = dataset.get_thinned(
+                params['method'],
+                bin_widths=params['bin_widths'],
+                precision=params['precision'],
+                bin_output=params['bin_output']
+            )
+
+            # Данные на решетке срезаются индексированием плотного массива
+            from data.slice_index import SliceIndex
+            report("поиск решетки")
+            grid = data_loader.detect_structured_grid(data)
+            report("индекс срезов")
+            with profiler.stage("индекс срезов"):
+                slice_index = SliceIndex(data, grid)
+            report("сводка")
+            with profiler.stage("сводка"):
+                summary = dataset.get_summary(data, slice_index)
+
+        return dict(params, dataset=dataset, data=data, slice_index=slice_index, summary=summary,
+                    profile=record)
+
+    def _on_load_progress(self, stage, done=None, total=None, rows=None):
+        """Ход фоновой загрузки (главный поток)"""
+        text = stage
+        if total:
+            if str(self.load_progress.cget('mode')) != 'determinate':
+                self.load_progress.stop()
+                self.load_progress.config(mode='determinate')
+            self.load_progress.config(value=100.0 * done / total)
+            text += f": {done / (1024 * 1024):.1f} из {total / (1024 * 1024):.1f} МБ"
+        elif str(self.load_progress.cget('mode')) != 'indeterminate':
+            # Этап без известного объема работы
+            self.load_progress.config(mode='indeterminate')
+            self.load_progress.start(15)
+        if rows:
+            text += f", строк: {rows}"
+        self.load_info.set(text)
+
+    def _finish_load_progress(self, text=""):
+        self.load_progress.stop()
+        self.load_progress.config(mode='determinate', value=0)
+        self.load_info.set(text)
+        self.cancel_load_btn.config(state=tk.DISABLED)
+
+    def _on_load_done(self, result):
+        """Замена текущих данных загруженными: файлом или серией (главный поток)"""
+        progress_text = ""
+        try:
+            if 'collection' in result:
+                progress_text = self._show_loaded_series(result)
+            else:
+                progress_text = self._show_loaded_file(result)
+        except Exception as e:
+            # Вызывается из опроса LoadWorker: без обработки ошибка ушла бы
+            # в обработчик Tk, а индикатор загрузки остался бы запущенным
+            messagebox.showerror("Ошибка", f"Не удалось показать загруженные данные: {str(e)}")
+            self.status_var.set("Ошибка загрузки данных")
+        finally:
+            self._finish_load_progress(progress_text)
+
+    def _show_loaded_file(self, result):
+        """Показ загруженного файла; возвращает текст для строки хода загрузки"""
+        if result['data'].empty:
+            # Прежние данные остаются на экране
+            messagebox.showwarning("Предупреждение",
+                                   f"Файл не содержит данных: {os.path.basename(result['file_path'])}")
+            self.status_var.set("Файл не содержит данных")
+            return ""
+
+        # Загрузка отдельного файла завершает режим серии
+        self.close_series()
+        self.file_path = result['file_path']
+        self.dataset = result['dataset']
+        self.data = result['data']
+        self.slice_index = result['slice_index']
+        self.summary = result['summary']
+
+        with profiler.operation("Загрузка данных", result['profile']) as record:
+            self.show_data_info()
+            self.update_slider_range()
+            self.show_slice_info()
+        self.set_status(f"Данные загружены из: {os.path.basename(self.file_path)}", record)
+
+        if result['update_plot'] and self.current_figure:
+            self.update_plot()
+        return f"Загружено точек: {len(self.data)}"
+
+    def _on_load_error(self, error):
+        """Ошибка фоновой загрузки (главный поток)"""
+        self._finish_load_progress()
+        messagebox.showerror("Ошибка", f"Не удалось загрузить данные: {str(error)}")
+        self.status_var.set("Ошибка загрузки данных")
+
+    def _on_load_cancelled(self):
+        """Загрузка отменена; на экране остаются прежние данные"""
+        self._finish_load_progress("Загрузка отменена")
+        self.status_var.set("Загрузка отменена")
 
     
     def show_data_info(self):
@@ -324,17 +666,35 @@ class Graph3DApp:
             preview_data = self.data.head(5)
             self.info_text.insert(tk.END, preview_data.to_string() + "\n")
             
-            # Добавляем статистику
-            T_min = self.data['T'].min()
-            T_max = self.data['T'].max()
-            T_mean = self.data['T'].mean()
-            self.info_text.insert(tk.END, f"\nВсего точек: {len(self.data['x'])}\n")
+            # Добавляем статистику из сводки, посчитанной при загрузке
+            T = self.summary.columns['T']
+            self.info_text.insert(tk.END, f"\nВсего точек: {self.summary.count}\n")
             self.info_text.insert(tk.END, 
-                f"Температура: мин={T_min:.3f}, макс={T_max:.3f}, средн={T_mean:.3f}\n")
+                f"Температура: мин={T['min']:.3f}, макс={T['max']:.3f}, средн={T['mean']:.3f}\n")
+            self.show_memory_info()
+
+    def show_memory_info(self):
+        """Отчет о памяти по этапам: исходные точки, прореживание, индекс срезов"""
+        if self.dataset is not None:
+            report = self.dataset.memory_report()
+        else:
+            # Кадр серии: исходные точки в рабочих процессах не сохраняются
+            report = [("прореженные данные", int(self.data.memory_usage(index=True).sum()))]
+        if self.slice_index is not None:
+            report.append(("индекс срезов", self.slice_index.memory_usage()))
+
+        dtype = self.data['x'].dtype
+        self.info_text.insert(tk.END, f"\nПамять (колонки {dtype}):\n")
+        for stage, size in report:
+            self.info_text.insert(tk.END, f"  {stage:<40} {size / (1024 * 1024):>9.1f} МБ\n")
+        total = sum(size for _, size in report)
+        self.info_text.insert(tk.END, f"  {'итого':<40} {total / (1024 * 1024):>9.1f} МБ\n")
 
     def show_slice_info(self):
         """Отображение информации о загруженных данных"""
-        if self.data is not None and not self.data.empty:
+        if self.data is not None and not self.data.empty and self.slice_interpolated.get():
+            self.show_interpolated_slice_info()
+        elif self.data is not None and not self.data.empty:
             axis = self.slice_axis.get()
             value = float(self.slice_value.get())
             tolerance = float(self.tolerance_value.get())
@@ -342,21 +702,22 @@ class Graph3DApp:
             self.info_text.insert(tk.END, f"Информация по срезу. Ось: {axis.upper()}, значение среза: {value:.3f}, значение погрешности: {tolerance:.3f}\n")
 
 
-            slice_data = self.get_slice_data(axis, value)
+            if self.slice_index is None or self.slice_index.data is not self.data:
+                from data.slice_index import SliceIndex
+                self.slice_index = SliceIndex(self.data)
+            rows = self.data_processor.get_slice_data(self.data, axis, value, tolerance, self.slice_index)
 
-            if slice_data is not None and len(slice_data) > 0:
+            if len(rows) > 0:
                 # Статистика по точкам в срезе
-                T_min = slice_data['T'].min()
-                T_max = slice_data['T'].max()
-                T_mean = slice_data['T'].mean()
-                T_std = slice_data['T'].std()
+                with profiler.stage("статистика среза"):
+                    stats = self.data_processor.calculate_statistics(self.data, rows)
                 
                 self.info_text.insert(tk.END, "\nСТАТИСТИКА ТЕМПЕРАТУР:\n")
-                self.info_text.insert(tk.END, f"  Всего точек в срезе: {len(slice_data)}\n")
-                self.info_text.insert(tk.END, f"  Минимальная: {T_min:.3f}\n")
-                self.info_text.insert(tk.END, f"  Максимальная: {T_max:.3f}\n")
-                self.info_text.insert(tk.END, f"  Средняя: {T_mean:.3f}\n")
-                self.info_text.insert(tk.END, f"  Стандартное отклонение: {T_std:.3f}\n")
+                self.info_text.insert(tk.END, f"  Всего точек в срезе: {stats['count']}\n")
+                self.info_text.insert(tk.END, f"  Минимальная: {stats['min']:.3f}\n")
+                self.info_text.insert(tk.END, f"  Максимальная: {stats['max']:.3f}\n")
+                self.info_text.insert(tk.END, f"  Средняя: {stats['avg']:.3f}\n")
+                self.info_text.insert(tk.END, f"  Стандартное отклонение: {stats['std']:.3f}\n")
 
             else:
                 self.info_text.insert(tk.END, "СРЕЗ НЕ СОДЕРЖИТ ДАННЫХ\n")
@@ -365,9 +726,47 @@ class Graph3DApp:
                 self.info_text.insert(tk.END, "Попробуйте изменить значение или ось.\n")
 
                 self.info_text.insert(tk.END, "\nВозможные точки среза на выбранной оси:.\n")
-                unique_values = sorted(self.data[axis].unique())
-                for value in unique_values:
+                for value in self.summary.unique[axis]:
                     self.info_text.insert(tk.END, f"{value:.3f}, ")
+
+    def show_interpolated_slice_info(self):
+        """Статистика температур в узлах сетки интерполированного среза"""
+        import numpy as np
+        self.info_text.insert(tk.END, "\n" + "="*50 + "\n")
+        try:
+            params = self._slice_params()
+        except (tk.TclError, ValueError):
+            self.info_text.insert(tk.END, "Некорректные параметры интерполированного среза\n")
+            return
+        axis, value = params['axis'], params['value']
+        plane = f"Ось: {axis.upper()}, значение среза: {value:.3f}"
+        if params['normal'] is not None:
+            plane += ", нормаль: ({:g}, {:g}, {:g})".format(*params['normal'])
+        method = "ближайшая точка" if params['method'] == "nearest" else f"ОВР по {params['k']} соседям"
+        self.info_text.insert(tk.END, f"Интерполированный срез. {plane}, метод: {method}\n")
+
+        if self.slice_index is None or self.slice_index.data is not self.data:
+            from data.slice_index import SliceIndex
+            self.slice_index = SliceIndex(self.data)
+        with profiler.stage("интерполяция среза"):
+            sample = self.slice_index.sample_plane(axis, value, params['normal'],
+                                                   method=params['method'], k=params['k'])
+        T = sample['T']
+        T = T[~np.isnan(T)]
+
+        if len(T) > 0:
+            with profiler.stage("статистика среза"):
+                stats = self.data_processor.calculate_statistics({'T': T}, columns=['T'])
+
+            self.info_text.insert(tk.END, "\nСТАТИСТИКА ТЕМПЕРАТУР:\n")
+            self.info_text.insert(tk.END, f"  Узлов сетки с данными: {stats['count']} из {sample['T'].size}\n")
+            self.info_text.insert(tk.END, f"  Минимальная: {stats['min']:.3f}\n")
+            self.info_text.insert(tk.END, f"  Максимальная: {stats['max']:.3f}\n")
+            self.info_text.insert(tk.END, f"  Средняя: {stats['avg']:.3f}\n")
+            self.info_text.insert(tk.END, f"  Стандартное отклонение: {stats['std']:.3f}\n")
+        else:
+            self.info_text.insert(tk.END, "ПЛОСКОСТЬ НЕ ПЕРЕСЕКАЕТ ДАННЫЕ\n")
+            self.info_text.insert(tk.END, "Попробуйте изменить значение, ось или нормаль.\n")
             
 
     def get_slice_data(self, axis, value):
@@ -375,10 +774,12 @@ class Graph3DApp:
         if self.data is None or self.data.empty:
             return None
         
-        # Создаем маску для фильтрации точек в срезе
-        mask = np.abs(self.data[axis] - value) <= self.tolerance_value.get()
+        if self.slice_index is None or self.slice_index.data is not self.data:
+            from data.slice_index import SliceIndex
+            self.slice_index = SliceIndex(self.data)
         
-        return self.data[mask].copy()
+        # Точки среза находятся бинарным поиском по отсортированной оси
+        return self.slice_index.get_slice_data(axis, value, self.tolerance_value.get())
 
     def plot_3d_graph(self):
         """Создание нового 3D графика со срезом"""
@@ -387,19 +788,18 @@ class Graph3DApp:
             return
         
         try:
-            slice_params = {
-                'axis': self.slice_axis.get(),
-                'value': self.slice_value.get(),
-                'tolerance': self.tolerance_value.get()
-            }
+            slice_params = self._slice_params()
             
-            self.current_figure = self.plot_3d.create_3d_plot_with_slice(
-                self.data, 
-                slice_params,
-                show_isotherms=self.show_isotherms.get(),
-                num_isotherms=self.num_isotherms.get()
-            )
-            self.status_var.set("3D график и срез построены успешно")
+            with profiler.operation("Построение графика") as record:
+                self.current_figure = self.plot_3d.create_3d_plot_with_slice(
+                    self.data, 
+                    slice_params,
+                    show_isotherms=self.show_isotherms.get(),
+                    num_isotherms=self.num_isotherms.get(),
+                    slice_index=self.slice_index,
+                    summary=self.summary
+                )
+            self.set_status("3D график и срез построены успешно", record)
             
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось построить график: {str(e)}")
@@ -409,27 +809,392 @@ class Graph3DApp:
         """Обновление существующего графика"""
         if self.data is None or not self.current_figure:
             return
+
+        # Синхронное обновление заменяет все отложенные фоновые запросы
+        self.update_scheduler.cancel()
         
         try:
-            slice_params = {
-                'axis': self.slice_axis.get(),
-                'value': self.slice_value.get(),
-                'tolerance': self.tolerance_value.get()
-            }
+            slice_params = self._slice_params()
             
-            self.plot_3d.update_3d_plot_with_slice(
-                self.current_figure, 
-                self.data, 
-                slice_params,
-                show_isotherms=self.show_isotherms.get(),
-                num_isotherms=self.num_isotherms.get()
-            )
-            self.status_var.set(f"График обновлен. Срез по {slice_params['axis'].upper()} = {slice_params['value']:.3f}")
+            with profiler.operation("Обновление графика") as record:
+                self.plot_3d.update_3d_plot_with_slice(
+                    self.current_figure, 
+                    self.data, 
+                    slice_params,
+                    show_isotherms=self.show_isotherms.get(),
+                    num_isotherms=self.num_isotherms.get(),
+                    slice_index=self.slice_index,
+                    summary=self.summary
+                )
+            self.set_status(f"График обновлен. Срез по {slice_params['axis'].upper()} = {slice_params['value']:.3f}",
+                            record)
             
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось обновить график: {str(e)}")
             self.status_var.set("Ошибка обновления графика")
+
+    def request_plot_update(self):
+        """
+        Фоновое обновление графика.
+
+        Частые запросы (например, при перетаскивании ползунка) сворачиваются
+        в один: срез и интерполяция считаются в рабочем потоке, а в главном
+        потоке выполняется только отрисовка последнего запроса.
+        """
+        if self.data is None or not self.current_figure:
+            return
+
+        params = self._current_slice_settings()
+        if params is None:
+            # Некорректный ввод в одном из полей - дождемся исправления
+            return
+        params['data'] = self.data
+        params['slice_index'] = self.slice_index
+
+        self.status_var.set("График обновляется...")
+        self.update_scheduler.request(params)
+
+    def _current_slice_settings(self):
+        """
+        Параметры среза и изотерм из полей окна или None при некорректном
+        вводе. Значения переменных Tk читаем только в главном потоке.
+        """
+        try:
+            return {
+                'slice_params': self._slice_params(),
+                'show_isotherms': self.show_isotherms.get(),
+                'num_isotherms': self.num_isotherms.get()
+            }
+        except (tk.TclError, ValueError):
+            return None
+
+    def _slice_params(self):
+        """
+        Параметры среза из полей окна. В режиме интерполяции добавляются
+        метод, число соседей и нормаль (None - плоскость, перпендикулярная
+        оси); нулевая нормаль - ValueError.
+        """
+        params = {
+            'axis': self.slice_axis.get(),
+            'value': self.slice_value.get(),
+            'tolerance': self.tolerance_value.get()
+        }
+        if self.slice_interpolated.get():
+            normal = None
+            if self.slice_oblique.get():
+                normal = (self.normal_x.get(), self.normal_y.get(), self.normal_z.get())
+                if not any(normal):
+                    raise ValueError("Нормаль плоскости не может быть нулевой")
+            params.update({
+                'mode': 'interpolated',
+                'method': self.interpolation_method.get(),
+                'k': max(1, self.interpolation_neighbors.get()),
+                'normal': normal
+            })
+        return params
+
+    def _compute_plot_update(self, params, is_cancelled):
+        """Подготовка среза и изотерм (выполняется в рабочем потоке)"""
+        with profiler.operation("Обновление среза") as record:
+            # Отрисовка в главном потоке продолжит ту же разбивку
+            params['profile'] = record
+            return self.plot_3d.prepare_slice(
+                params['data'],
+                params['slice_params'],
+                show_isotherms=params['show_isotherms'],
+                num_isotherms=params['num_isotherms'],
+                slice_index=params['slice_index'],
+                is_cancelled=is_cancelled
+            )
+
+    def _apply_plot_update(self, params, prepared):
+        """Отрисовка подготовленного среза (выполняется в главном потоке)"""
+        # Данные могли смениться, пока шел расчет
+        if params['data'] is not self.data or not self.current_figure:
+            return
+
+        slice_params = params['slice_params']
+        try:
+            with profiler.operation("Обновление среза", params.get('profile')) as record:
+                self.plot_3d.update_3d_plot_with_slice(
+                    self.current_figure,
+                    params['data'],
+                    slice_params,
+                    show_isotherms=params['show_isotherms'],
+                    num_isotherms=params['num_isotherms'],
+                    slice_index=params['slice_index'],
+                    prepared=prepared,
+                    summary=self.summary
+                )
+            self.set_status(f"График обновлен. Срез по {slice_params['axis'].upper()} = {slice_params['value']:.3f}",
+                            record)
+
+        except Exception as e:
+            self._on_plot_update_error(e)
+
+    def _on_plot_update_error(self, error):
+        """Обработка ошибки фонового обновления"""
+        messagebox.showerror("Ошибка", f"Не удалось обновить график: {str(error)}")
+        self.status_var.set("Ошибка обновления графика")
     
+    def load_series(self, directory=None):
+        """
+        Загрузка серии файлов (по одному на шаг времени) из каталога в
+        фоновом потоке. Файлы загружаются и прореживаются в пуле процессов;
+        текущие данные заменяются, когда серия готова (_on_load_done).
+        """
+        if directory is None:
+            directory = filedialog.askdirectory(title="Выберите каталог с DAT или CSV файлами серии")
+            if not directory:
+                return
+
+        try:
+            params = {
+                'directory': directory,
+                'data_loader': self.data_loader,
+                'method': self.thinning_method.get(),
+                'bin_widths': (self.bin_width_x.get(), self.bin_width_y.get(), self.bin_width_z.get()),
+                'precision': self.round_precision.get(),
+                'bin_output': 'center' if self.bin_centers.get() else 'centroid'
+            }
+        except tk.TclError as e:
+            messagebox.showerror("Ошибка", f"Некорректные параметры прореживания: {str(e)}")
+            return
+
+        # Загрузка, начатая раньше, отменяется при запуске новой
+        self.cancel_load_btn.config(state=tk.NORMAL)
+        self.load_progress.config(mode='determinate', value=0)
+        self.load_info.set(f"Загрузка серии {os.path.basename(directory)}...")
+        self.status_var.set("Загрузка серии файлов...")
+        self.load_worker.start(lambda report: self._load_series(params, report))
+
+    def _load_series(self, params, report):
+        """Загрузка серии и индексирование первого кадра (выполняется в рабочем потоке)"""
+        with profiler.operation("Загрузка серии") as record:
+            with profiler.stage("параллельная загрузка"):
+                collection = params['data_loader'].load_files(
+                    params['directory'],
+                    method=params['method'],
+                    bin_widths=params['bin_widths'],
+                    precision=params['precision'],
+                    bin_output=params['bin_output'],
+                    progress=report
+                )
+            profiler.count("файлов", len(collection))
+            profiler.count("точек", collection.total_points())
+
+            first_frame = None
+            if len(collection):
+                report("индекс срезов")
+                first_frame = self._build_frame_state(params['data_loader'], collection[0])
+
+        return dict(params, collection=collection, first_frame=first_frame, profile=record)
+
+    def _show_loaded_series(self, result):
+        """Показ загруженной серии; возвращает текст для строки хода загрузки"""
+        collection = result['collection']
+        if collection.total_points() == 0:
+            # Прежние данные остаются на экране
+            messagebox.showwarning("Предупреждение", "В каталоге нет файлов с данными")
+            self.status_var.set("Серия не содержит данных")
+            return ""
+
+        # Кадры прежней серии готовились по другим данным
+        self.playback.reset()
+        self.play_btn.config(text="Пуск")
+        self.frame_states.clear()
+        self.collection = collection
+        self.series_source = result['directory']
+        self.file_path = None
+        self.dataset = None
+
+        # Первый кадр показываем сразу, с информацией и диапазоном ползунка
+        state = result['first_frame']
+        self.frame_states.put(0, state)
+        self.data, self.slice_index, self.summary = state['data'], state['slice_index'], state['summary']
+        with profiler.operation("Загрузка серии", result['profile']) as record:
+            self.show_data_info()
+            self.update_slider_range()
+            self.show_slice_info()
+        self.playback_info.set(f"Кадр 1/{len(collection)}: {os.path.basename(collection.paths[0])}")
+        self.set_status(f"Загружена серия из {len(collection)} файлов: {os.path.basename(self.series_source)}",
+                        record)
+        if self.current_figure:
+            self.update_plot()
+        return f"Загружено файлов: {len(collection)}, точек: {collection.total_points()}"
+
+    def close_series(self):
+        """Выход из режима серии файлов"""
+        if self.collection is None:
+            return
+        self.playback.reset()
+        self.frame_states.clear()
+        self.collection = None
+        self.series_source = None
+        self.play_btn.config(text="Пуск")
+        self.playback_info.set("Серия не загружена")
+
+    def toggle_playback(self):
+        """Запуск и остановка проигрывания серии"""
+        if self.collection is None:
+            messagebox.showwarning("Предупреждение", "Сначала загрузите серию файлов!")
+            return
+
+        if self.playback.playing:
+            self.playback.pause()
+            self.play_btn.config(text="Пуск")
+            self.status_var.set("Проигрывание остановлено")
+        else:
+            if not self.current_figure:
+                self.plot_3d_graph()
+            self.play_btn.config(text="Пауза")
+            self.playback.play(self.playback_fps.get())
+
+    def step_playback(self, delta):
+        """Переход к соседнему кадру серии"""
+        if self.collection is not None:
+            self.playback.step(delta)
+
+    def on_playback_fps_change(self):
+        """Обработчик изменения частоты кадров"""
+        try:
+            self.playback.fps = self.playback_fps.get()
+        except tk.TclError:
+            pass
+
+    def _playback_settings(self):
+        """
+        Параметры кадров серии (главный поток): параметры среза и загрузчик.
+        Свойство data_loader читает переменную Tk, поэтому загрузчик берем
+        здесь и передаем в рабочий поток вместе с параметрами.
+        """
+        params = self._current_slice_settings()
+        if params is not None:
+            params['data_loader'] = self.data_loader
+        return params
+
+    def _get_frame_state(self, index, data_loader):
+        """Данные кадра, индекс срезов и сводка (строятся один раз на кадр)"""
+        state = self.frame_states.get(index)
+        if state is None:
+            state = self._build_frame_state(data_loader, self.collection[index])
+            self.frame_states.put(index, state)
+        return state
+
+    @staticmethod
+    def _build_frame_state(data_loader, data):
+        """Индекс срезов и сводка по данным кадра"""
+        from data.data_summary import DataSummary
+        from data.slice_index import SliceIndex
+        grid = data_loader.detect_structured_grid(data)
+        with profiler.stage("индекс срезов"):
+            slice_index = SliceIndex(data, grid)
+        with profiler.stage("сводка"):
+            summary = DataSummary.from_data(data, slice_index)
+        return {'data': data, 'slice_index': slice_index, 'summary': summary}
+
+    def _prepare_playback_frame(self, index, params, is_cancelled):
+        """Подготовка кадра серии: срез и изотермы (выполняется в рабочем потоке)"""
+        with profiler.operation("Кадр серии") as record:
+            state = self._get_frame_state(index, params['data_loader'])
+            prepared = self.plot_3d.prepare_slice(
+                state['data'],
+                params['slice_params'],
+                show_isotherms=params['show_isotherms'],
+                num_isotherms=params['num_isotherms'],
+                slice_index=state['slice_index'],
+                is_cancelled=is_cancelled
+            )
+        if prepared is None:
+            return None
+        return dict(state, prepared=prepared, profile=record)
+
+    def _show_playback_frame(self, index, frame, fps):
+        """Показ подготовленного кадра серии (выполняется в главном потоке)"""
+        self.data, self.slice_index, self.summary = frame['data'], frame['slice_index'], frame['summary']
+        path = self.collection.paths[index]
+
+        try:
+            if not self.current_figure:
+                self.plot_3d_graph()
+            else:
+                with profiler.operation("Кадр серии", frame['profile']) as record:
+                    self.plot_3d.update_3d_plot_with_slice(
+                        self.current_figure,
+                        self.data,
+                        frame['prepared']['slice_params'],
+                        show_isotherms=self.show_isotherms.get(),
+                        num_isotherms=self.num_isotherms.get(),
+                        slice_index=self.slice_index,
+                        prepared=frame['prepared'],
+                        summary=self.summary
+                    )
+                if record is not None:
+                    self.set_status(f"Кадр {index + 1}: {os.path.basename(path)}", record)
+        except Exception as e:
+            self.playback.pause()
+            self.play_btn.config(text="Пуск")
+            self._on_plot_update_error(e)
+            return
+
+        fps_text = f", {fps:.1f} кадр/с" if self.playback.playing and fps > 0 else ""
+        self.playback_info.set(f"Кадр {index + 1}/{len(self.collection)}: {os.path.basename(path)}{fps_text}")
+
+    def set_status(self, message, record=None):
+        """
+        Сообщение в строке состояния; при включенном замере к нему
+        добавляется разбивка действия record по этапам, а подробная
+        разбивка выводится в консоль.
+        """
+        if record is not None:
+            message = f"{message} | {record.summary()}"
+            print(record.report())
+        self.status_var.set(message)
+
+    def on_profiling_change(self):
+        """Включение и выключение замера времени по этапам"""
+        if self.profiling.get():
+            profiler.enable()
+            self.status_var.set("Замер времени включен: разбивка действий выводится здесь и в консоль")
+        else:
+            profiler.disable()
+            self.status_var.set("Замер времени выключен")
+
+    def save_trace(self):
+        """Сохранение событий замера в файл Chrome trace (chrome://tracing, Perfetto)"""
+        file_path = filedialog.asksaveasfilename(
+            title="Сохранить трассировку",
+            defaultextension=".json",
+            filetypes=[("Chrome trace", "*.json")]
+        )
+        if file_path:
+            try:
+                profiler.save_trace(file_path)
+                self.status_var.set(f"Трассировка сохранена: {os.path.basename(file_path)}")
+            except Exception as e:
+                messagebox.showerror("Ошибка", f"Не удалось сохранить трассировку: {str(e)}")
+
+    def save_data(self):
+        """Сохранение текущих (прореженных) данных, чтобы потом открывать их без разбора"""
+        if self.data is None:
+            messagebox.showwarning("Предупреждение", "Сначала загрузите данные!")
+            return
+
+        from data.columnar import available_formats
+        patterns = {'npz': ("NumPy NPZ", "*.npz"), 'parquet': ("Parquet", "*.parquet"),
+                    'feather': ("Feather", "*.feather"), 'hdf5': ("HDF5", "*.h5 *.hdf5")}
+        file_path = filedialog.asksaveasfilename(
+            title="Сохранить данные",
+            defaultextension=".npz",
+            filetypes=[patterns[name] for name in available_formats()] + [("CSV files", "*.csv")]
+        )
+        if file_path:
+            try:
+                self.data_loader.save_data(self.data, file_path)
+                self.status_var.set(f"Данные сохранены: {os.path.basename(file_path)} ({len(self.data)} точек)")
+            except Exception as e:
+                messagebox.showerror("Ошибка", f"Не удалось сохранить данные: {str(e)}")
+
     def create_example_file(self):
         """Создание примера CSV файла с данными"""
         file_path = filedialog.asksaveasfilename(
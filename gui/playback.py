@@ -0,0 +1,247 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Число следующих кадров, которые готовятся заранее
+PREFETCH_FRAMES = 3
+
+# Предельное число подготовленных кадров в кэше
+FRAME_CACHE_SIZE = 8
+
+# Число последних кадров, по которым измеряется частота кадров
+FPS_WINDOW = 10
+
+
+class FrameCache:
+    """Ограниченный кэш кадров с вытеснением давно не использованных (LRU)"""
+
+    def __init__(self, max_frames=FRAME_CACHE_SIZE):
+        self.max_frames = max_frames
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._frames
+
+    def get(self, key):
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self._frames.move_to_end(key)
+            return frame
+
+    def put(self, key, frame):
+        with self._lock:
+            self._frames[key] = frame
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+
+
+class FramePrefetcher:
+    """
+    Фоновый поток подготовки кадров.
+
+    Получает список кадров, которые понадобятся следующими, и готовит их
+    по очереди в кэш. Новый список заменяет старый: кадр, подготовка
+    которого уже не нужна, прерывается через is_cancelled.
+    """
+
+    def __init__(self, prepare, cache: FrameCache):
+        """prepare(index, params, is_cancelled) - подготовка кадра в рабочем потоке"""
+        self.prepare = prepare
+        self.cache = cache
+
+        self._condition = threading.Condition()
+        self._pending = []
+        self._generation = 0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def request(self, items):
+        """items - список (key, index, params) в порядке показа"""
+        with self._condition:
+            self._generation += 1
+            self._pending = [item for item in items if item[0] not in self.cache]
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._generation += 1
+            self._pending = []
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                key, index, params = self._pending.pop(0)
+                generation = self._generation
+
+            if key in self.cache:
+                continue
+
+            def is_cancelled():
+                # Кадр все еще нужен, если он остался в новом списке
+                return generation != self._generation and not any(
+                    item[0] == key for item in self._pending)
+
+            try:
+                frame = self.prepare(index, params, is_cancelled)
+            except Exception as e:
+                print(f"Ошибка при подготовке кадра {index}: {e}")
+                continue
+            if frame is not None:
+                self.cache.put(key, frame)
+
+
+class PlaybackController:
+    """
+    Проигрывание набора кадров (файлов по шагам времени) как анимации.
+
+    Кадры показываются по таймеру главного цикла Tk. Пока показывается
+    текущий кадр, следующие PREFETCH_FRAMES кадров готовятся в фоновом
+    потоке; если кадр еще не готов, показ ждет его, не блокируя окно.
+    Частота кадров измеряется по времени показа последних кадров.
+    """
+
+    def __init__(self, root, frame_count, prepare_frame, show_frame, get_params,
+                 prefetch=PREFETCH_FRAMES, cache_size=FRAME_CACHE_SIZE, wait_ms=10):
+        """
+        frame_count() - число кадров
+        prepare_frame(index, params, is_cancelled) - подготовка кадра (рабочий поток)
+        show_frame(index, frame, fps) - показ кадра (главный поток)
+        get_params() - текущие параметры среза и изотерм (словарь)
+        """
+        self.root = root
+        self.frame_count = frame_count
+        self.show_frame = show_frame
+        self.get_params = get_params
+        self.prefetch = prefetch
+        self.wait_ms = wait_ms
+
+        self.cache = FrameCache(cache_size)
+        self.prefetcher = FramePrefetcher(prepare_frame, self.cache)
+
+        self.index = 0
+        self.fps = 10.0
+        self.playing = False
+        self._after_id = None
+        self._shown_times = deque(maxlen=FPS_WINDOW)
+
+    @staticmethod
+    def make_key(index, params):
+        """Ключ кадра: номер и параметры, от которых зависит подготовка"""
+        slice_params = params['slice_params']
+        normal = slice_params.get('normal')
+        return (index, slice_params['axis'], float(slice_params['value']), float(slice_params['tolerance']),
+                bool(params['show_isotherms']), int(params['num_isotherms']),
+                slice_params.get('mode'), slice_params.get('method'), slice_params.get('k'),
+                None if normal is None else tuple(float(c) for c in normal))
+
+    def measured_fps(self):
+        """Измеренная частота кадров"""
+        if len(self._shown_times) < 2:
+            return 0.0
+        elapsed = self._shown_times[-1] - self._shown_times[0]
+        return (len(self._shown_times) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def play(self, fps=None):
+        if fps:
+            self.fps = fps
+        if self.frame_count() == 0:
+            return
+        self.playing = True
+        self._shown_times.clear()
+        self._schedule(0)
+
+    def pause(self):
+        self.playing = False
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def seek(self, index):
+        """Показ кадра index (без запуска проигрывания)"""
+        count = self.frame_count()
+        if count == 0:
+            return
+        self.index = index % count
+        if not self.playing:
+            self._schedule(0)
+
+    def step(self, delta=1):
+        self.seek(self.index + delta)
+
+    def reset(self):
+        """Сброс кэша (например, после загрузки новой серии файлов)"""
+        self.pause()
+        self.cache.clear()
+        self.index = 0
+        self._shown_times.clear()
+
+    def close(self):
+        self.pause()
+        self.prefetcher.stop()
+
+    def _schedule(self, delay_ms):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after(int(delay_ms), self._tick)
+
+    def _upcoming(self, params):
+        """Текущий и следующие кадры для подготовки"""
+        count = self.frame_count()
+        items = []
+        for offset in range(min(self.prefetch + 1, count)):
+            index = (self.index + offset) % count
+            items.append((self.make_key(index, params), index, params))
+        return items
+
+    def _tick(self):
+        self._after_id = None
+        if self.frame_count() == 0:
+            return
+
+        params = self.get_params()
+        if params is None:
+            # Некорректный ввод в полях среза - пробуем позже
+            self._schedule(self.wait_ms * 10)
+            return
+
+        key = self.make_key(self.index, params)
+        frame = self.cache.get(key)
+        if frame is None:
+            # Кадр еще готовится: ждем, не блокируя главный цикл
+            self.prefetcher.request(self._upcoming(params))
+            self._schedule(self.wait_ms)
+            return
+
+        started = time.perf_counter()
+        self._shown_times.append(started)
+        self.show_frame(self.index, frame, self.measured_fps())
+
+        if not self.playing:
+            self.prefetcher.request(self._upcoming(params))
+            return
+
+        # Следующий кадр; пока показывается текущий, готовим следующие
+        self.index = (self.index + 1) % self.frame_count()
+        self.prefetcher.request(self._upcoming(params))
+
+        interval_ms = 1000.0 / max(self.fps, 0.1)
+        spent_ms = (time.perf_counter() - started) * 1000
+        self._schedule(max(1, interval_ms - spent_ms))
@@ -0,0 +1,57 @@
+import importlib
+import threading
+import time
+
+# Модули, которые нужны только для загрузки данных и построения графиков.
+# Окно создается без них, а загружаются они в фоне после его появления.
+HEAVY_MODULES = (
+    'numpy',
+    'pandas',
+    'matplotlib.pyplot',
+    'mpl_toolkits.mplot3d',
+    'data.dataset',
+    'data.slice_index',
+    'visualization.plot_3d',
+    'scipy.spatial',
+    'scipy.interpolate',
+)
+
+
+class ModuleWarmer:
+    """
+    Фоновая загрузка тяжелых модулей после первой отрисовки окна.
+
+    Если пользователь раньше времени нажмет кнопку, которой нужен еще не
+    загруженный модуль, главный поток просто дождется окончания его
+    импорта в фоновом потоке (импорт одного модуля защищен блокировкой).
+    """
+
+    def __init__(self, modules=HEAVY_MODULES):
+        self.modules = modules
+        self.elapsed = None
+        self.errors = {}
+        self._done = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="module-warmer", daemon=True)
+            self._thread.start()
+
+    def is_done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Ожидание окончания загрузки; True, если все загружено"""
+        return self._done.wait(timeout)
+
+    def _run(self):
+        start_time = time.perf_counter()
+        for name in self.modules:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                # Ошибка повторится и будет показана при первом использовании
+                self.errors[name] = str(e)
+        self.elapsed = time.perf_counter() - start_time
+        self._done.set()
@@ -0,0 +1,105 @@
+import queue
+import threading
+
+
+class UpdateScheduler:
+    """
+    Планировщик фоновых обновлений графика.
+
+    Серия запросов (движение ползунка, изменение погрешности или изотерм)
+    сворачивается в один: выполняется только последний запрос, пришедший
+    после паузы delay_ms. Тяжелая часть (compute) выполняется в рабочем
+    потоке, а результат передается в главный цикл Tk и применяется
+    функцией apply. Результаты устаревших запросов отбрасываются.
+    """
+
+    def __init__(self, root, compute, apply, on_error=None, delay_ms=40, poll_ms=15):
+        """
+        compute(params, is_cancelled) - вычисление в рабочем потоке;
+            is_cancelled() возвращает True, если запрос уже устарел
+        apply(params, result) - применение результата в главном потоке
+        on_error(error) - обработка исключения из compute в главном потоке
+        """
+        self.root = root
+        self.compute = compute
+        self.apply = apply
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+        self.poll_ms = poll_ms
+
+        self._generation = 0
+        self._pending = None
+        self._after_id = None
+        self._poll_id = None
+        self._worker = None
+        self._results = queue.Queue()
+
+    def request(self, params):
+        """Запрос обновления; заменяет все еще не начатые запросы"""
+        self._generation += 1
+        self._pending = (self._generation, params)
+
+        # Откладываем запуск, пока запросы продолжают поступать
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after(self.delay_ms, self._start_pending)
+
+    def cancel(self):
+        """Отмена ожидающего и выполняющегося запросов"""
+        self._generation += 1
+        self._pending = None
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def is_busy(self):
+        """Есть ли незавершенные запросы"""
+        return self._pending is not None or self._worker is not None
+
+    def _start_pending(self):
+        """Запуск последнего запроса в рабочем потоке"""
+        self._after_id = None
+        if self._pending is None or self._worker is not None:
+            # Если поток занят, запрос будет запущен после его завершения
+            return
+
+        generation, params = self._pending
+        self._pending = None
+
+        self._worker = threading.Thread(target=self._run, args=(generation, params), daemon=True)
+        self._worker.start()
+        self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _run(self, generation, params):
+        """Тело рабочего потока"""
+        def is_cancelled():
+            return generation != self._generation
+
+        try:
+            result = self.compute(params, is_cancelled)
+            self._results.put((generation, params, result, None))
+        except Exception as e:
+            self._results.put((generation, params, None, e))
+
+    def _poll(self):
+        """Проверка готовности результата из главного цикла Tk"""
+        try:
+            generation, params, result, error = self._results.get_nowait()
+        except queue.Empty:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+            return
+
+        self._poll_id = None
+        self._worker = None
+
+        # Применяем только результат самого свежего запроса
+        if generation == self._generation:
+            if error is not None:
+                if self.on_error is not None:
+                    self.on_error(error)
+            elif result is not None:
+                self.apply(params, result)
+
+        # Запрос, пришедший во время работы потока, запускаем сразу
+        if self._pending is not None and self._after_id is None:
+            self._start_pending()
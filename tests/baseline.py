@@ -0,0 +1,64 @@
+"""
+Эталонные реализации из исходной версии проекта (построчный разбор DAT,
+округление и биннинг через pandas groupby). Новые реализации проверяются
+на совпадение с ними.
+"""
+import numpy as np
+import pandas as pd
+
+
+def parse_dat(file_path):
+    """Разбор DAT файла, как в исходном DataLoader.load_from_dat (без прореживания)"""
+    with open(file_path, 'r') as file:
+        lines = file.readlines()
+
+    data_lines = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped and (stripped[0].isdigit() or stripped[0] == '-'):
+            data_lines.append(stripped)
+    if not data_lines:
+        return pd.DataFrame(columns=['x', 'y', 'z', 'T'])
+
+    df = pd.DataFrame([line.split() for line in data_lines])
+    df = df.iloc[:, :4]
+    df.columns = ['x', 'y', 'z', 'T']
+    for col in ['x', 'y', 'z', 'T']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df.dropna()
+
+
+def round_points(df, precision=0):
+    """Исходное прореживание округлением: группировка по округленным координатам"""
+    df = df.copy()
+    rounded_cols = ['x_rounded', 'y_rounded', 'z_rounded']
+    for i, col in enumerate(['x', 'y', 'z']):
+        df[rounded_cols[i]] = df[col].round(precision)
+    grouped_df = df.groupby(rounded_cols, as_index=False)['T'].mean()
+    return grouped_df.rename(columns={'x_rounded': 'x', 'y_rounded': 'y', 'z_rounded': 'z'})
+
+
+def bin_points(df, bin_width_x=0.5, bin_width_y=0.5, bin_width_z=0.5):
+    """Исходный биннинг с центроидами бинов через groupby"""
+    df = df.copy()
+    x_min, y_min, z_min = df['x'].min(), df['y'].min(), df['z'].min()
+    df['x_bin'] = ((df['x'] - x_min) // bin_width_x).astype(int)
+    df['y_bin'] = ((df['y'] - y_min) // bin_width_y).astype(int)
+    df['z_bin'] = ((df['z'] - z_min) // bin_width_z).astype(int)
+    grouped_df = df.groupby(['x_bin', 'y_bin', 'z_bin']).agg({
+        'T': 'mean', 'x': 'mean', 'y': 'mean', 'z': 'mean'
+    }).reset_index()
+    return grouped_df[['x', 'y', 'z', 'T']]
+
+
+def sorted_rows(df, columns=('x', 'y', 'z', 'T'), decimals=9):
+    """
+    Строки DataFrame в лексикографическом порядке (для сравнения без учета
+    порядка). Порядок определяется по значениям, округленным до decimals
+    знаков: центроиды, посчитанные разными путями, различаются в последнем
+    разряде.
+    """
+    values = np.column_stack([np.asarray(df[col], dtype=np.float64) for col in columns])
+    if len(values) == 0:
+        return values
+    return values[np.lexsort(np.round(values, decimals).T[::-1])]
@@ -0,0 +1,50 @@
+"""
+Замена корневого окна Tk для проверки классов, работающих через
+root.after: таймеры выполняются по ручным часам (advance), без главного
+цикла и без дисплея.
+"""
+import itertools
+import time
+
+
+class FakeRoot:
+    def __init__(self):
+        self.now = 0
+        self._timers = {}
+        self._ids = itertools.count(1)
+
+    def after(self, delay_ms, callback):
+        timer_id = f"after#{next(self._ids)}"
+        self._timers[timer_id] = (self.now + int(delay_ms), callback)
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        self._timers.pop(timer_id, None)
+
+    def pending(self):
+        return len(self._timers)
+
+    def advance(self, ms):
+        """Сдвиг часов на ms с выполнением наступивших таймеров по порядку"""
+        target = self.now + ms
+        while True:
+            due = [(when, timer_id) for timer_id, (when, _) in self._timers.items() if when <= target]
+            if not due:
+                break
+            when, timer_id = min(due)
+            self.now = max(self.now, when)
+            _, callback = self._timers.pop(timer_id)
+            callback()
+        self.now = target
+
+    def run_until_idle(self, step_ms=10, timeout=5.0):
+        """
+        Выполнение таймеров, пока они есть; между шагами рабочие потоки
+        получают время на работу
+        """
+        deadline = time.monotonic() + timeout
+        while self._timers:
+            if time.monotonic() > deadline:
+                raise TimeoutError("таймеры не завершились")
+            self.advance(step_ms)
+            time.sleep(0.001)
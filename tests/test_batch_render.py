@@ -0,0 +1,77 @@
+import os
+import sys
+import numpy as np
+import pytest
+import batch_render
+from data.data_summary import DataSummary
+
+Z_LEVELS = [0.0, 1.0, 2.0, 3.0]
+
+
+@pytest.fixture
+def grid_file(tmp_path):
+    """Регулярная сетка 10x10 на четырех уровнях по Z"""
+    x, y, z = np.meshgrid(np.linspace(0, 9, 10), np.linspace(0, 9, 10), Z_LEVELS, indexing='ij')
+    points = np.column_stack([x.ravel(), y.ravel(), z.ravel()])
+    T = np.sin(points[:, 0]) + points[:, 1] * 0.5 + points[:, 2]
+    path = tmp_path / "run.dat"
+    np.savetxt(path, np.column_stack([points, T]), fmt='%.6f')
+    return str(path)
+
+
+def make_options(out, **overrides):
+    options = {
+        'values': None,
+        'count': None,
+        'tolerance': 0.1,
+        'interpolate': None,
+        'neighbors': 8,
+        'normal': None,
+        'isotherms': 5,
+        'thinning': {'method': None, 'bin_widths': (0.5, 0.5, 0.5), 'precision': 0},
+        'format': 'png',
+        'dpi': 40,
+        'out': str(out)
+    }
+    options.update(overrides)
+    return options
+
+
+def test_slice_values(grid_file):
+    data, _, summary = batch_render._load_dataset(grid_file, make_options('.')['thinning'])
+    assert batch_render.slice_values(summary, 'z') == Z_LEVELS
+    assert batch_render.slice_values(summary, 'z', values=[0.5]) == [0.5]
+    np.testing.assert_allclose(batch_render.slice_values(summary, 'x', count=4), [0, 3, 6, 9])
+    assert isinstance(summary, DataSummary) and len(data) == 400
+
+
+def test_parts_cover_all_slices(grid_file, tmp_path):
+    """Части срезов разных процессов не пересекаются и вместе дают все уровни"""
+    out = tmp_path / "slices"
+    out.mkdir()
+    options = make_options(out)
+    images = []
+    for part in range(3):
+        results = batch_render.render_part(grid_file, 'z', options, part, 3)
+        images.extend(path for path, seconds in results)
+
+    expected = [str(out / f"run_z_{value:+.3f}.png") for value in Z_LEVELS]
+    assert sorted(images) == sorted(expected)
+    for path in images:
+        with open(path, 'rb') as f:
+            assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+
+
+def test_interpolated_svg(grid_file, tmp_path):
+    options = make_options(tmp_path, values=[1.5], interpolate='idw', normal=(1.0, 0.0, 1.0), format='svg')
+    [(path, seconds)] = batch_render.render_part(grid_file, 'z', options, 0, 1)
+    assert path.endswith("run_z_+1.500.svg") and os.path.getsize(path) > 0
+
+
+def test_main_renders_files(grid_file, tmp_path, monkeypatch, capsys):
+    out = tmp_path / "out"
+    monkeypatch.setattr(sys, 'argv', ['batch_render.py', grid_file, '--axis', 'x', 'z', '--count', '2',
+                                      '--thinning', 'none', '--dpi', '40', '--out', str(out), '--workers', '2'])
+    batch_render.main()
+    assert len(os.listdir(out)) == 4
+    assert "Построено изображений: 4" in capsys.readouterr().out
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from data.bin_pyramid import BinPyramid
+from data.binning import BinningEngine
+from tests import baseline
+from tests.test_binning import make_points
+
+
+def lattice_points(seed=0):
+    """
+    Точки в центрах ячеек 0.1 при начале сетки в нуле: ни одна не лежит
+    на границе бинов (на границе пирамида и прямой биннинг могут разойтись)
+    """
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, 200, (3, 20000))
+    coords = (idx + 0.5) * 0.1
+    df = make_points(20000, seed=seed)
+    df['x'], df['y'], df['z'] = coords
+    # Начало сетки пирамиды и прямого биннинга - минимум координат
+    df.loc[0, ['x', 'y', 'z']] = 0.0
+    return df
+
+
+@pytest.mark.parametrize('widths', [(0.2, 0.2, 0.2), (0.4, 0.8, 0.2), (1.2, 0.6, 2.0), (25.6, 25.6, 25.6)])
+def test_query_matches_bin_points(widths):
+    df = lattice_points()
+    pyramid = BinPyramid.build(df['x'], df['y'], df['z'], df['T'], (0.2, 0.2, 0.2))
+    result = pyramid.query(widths)
+    expected, _ = BinningEngine().bin_points(df['x'], df['y'], df['z'], df['T'], widths)
+    np.testing.assert_allclose(baseline.sorted_rows(result), baseline.sorted_rows(expected), rtol=1e-10)
+
+
+def test_query_center_output():
+    df = lattice_points(1)
+    pyramid = BinPyramid.build(df['x'], df['y'], df['z'], df['T'], (0.2, 0.2, 0.2))
+    result = pyramid.query((0.4, 0.4, 0.4), 'center')
+    expected, _ = BinningEngine().bin_points(df['x'], df['y'], df['z'], df['T'], (0.4, 0.4, 0.4), output='center')
+    np.testing.assert_allclose(baseline.sorted_rows(result), baseline.sorted_rows(expected), rtol=1e-10)
+
+
+def test_query_rejects_non_multiples():
+    df = lattice_points()
+    pyramid = BinPyramid.build(df['x'], df['y'], df['z'], df['T'], (0.2, 0.2, 0.2))
+    assert pyramid.query((0.3, 0.2, 0.2)) is None
+    assert pyramid.query((0.1, 0.2, 0.2)) is None
+    assert not pyramid.supports((0.5, 0.5, 0.5))
+
+
+def test_arrays_roundtrip():
+    df = lattice_points()
+    pyramid = BinPyramid.build(df['x'], df['y'], df['z'], df['T'], (0.2, 0.2, 0.2))
+    restored = BinPyramid.from_arrays(pyramid.to_arrays())
+    np.testing.assert_array_equal(restored.query((0.8, 0.8, 0.8)).to_numpy(),
+                                  pyramid.query((0.8, 0.8, 0.8)).to_numpy())
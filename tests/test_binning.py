@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.binning import BinningEngine, narrow_keys
+from tests import baseline
+
+
+def make_points(num_points, extent=10.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'x': rng.uniform(0, extent, num_points),
+        'y': rng.uniform(-extent, 0, num_points),
+        'z': rng.uniform(0, extent / 2, num_points),
+        'T': rng.normal(-10, 5, num_points)
+    })
+
+
+@pytest.mark.parametrize('widths', [(0.5, 0.5, 0.5), (2.0, 1.0, 0.25), (0.05, 0.05, 0.05)])
+def test_bin_points_matches_groupby(widths):
+    """Биннинг через линейный индекс совпадает с исходным groupby (плотная и разреженная сетки)"""
+    df = make_points(20000)
+    result, grid = BinningEngine().bin_points(df['x'], df['y'], df['z'], df['T'], widths)
+    expected = baseline.bin_points(df, *widths)
+    assert len(result) == len(expected) == len(grid['counts'])
+    np.testing.assert_allclose(baseline.sorted_rows(result), baseline.sorted_rows(expected), rtol=1e-12)
+
+
+def test_bin_points_center_output():
+    df = make_points(5000)
+    widths = (1.0, 2.0, 0.5)
+    result, grid = BinningEngine().bin_points(df['x'], df['y'], df['z'], df['T'], widths, output='center')
+    for i, col in enumerate(['x', 'y', 'z']):
+        expected = grid['origin'][i] + (grid['bins'][i] + 0.5) * widths[i]
+        np.testing.assert_allclose(result[col], expected)
+
+
+def test_reduce_bins_dense_and_sparse_agree():
+    """Плотный (bincount) и разреженный (сортировка) пути дают одинаковый результат"""
+    rng = np.random.default_rng(1)
+    shape = (40, 30, 20)
+    keys = [rng.integers(0, n, 3000) for n in shape]
+    values = [rng.normal(size=3000)]
+    engine = BinningEngine()
+
+    dense = engine.reduce_bins(keys, shape, values)
+    # Та же сетка, растянутая по X так, что число ячеек много больше числа точек
+    sparse = engine.reduce_bins([keys[0] * 1000, keys[1], keys[2]], (40 * 1000, 30, 20), values)
+
+    np.testing.assert_array_equal(dense[0][0] * 1000, sparse[0][0])
+    np.testing.assert_array_equal(dense[0][1], sparse[0][1])
+    np.testing.assert_array_equal(dense[1], sparse[1])
+    np.testing.assert_allclose(dense[2][0], sparse[2][0])
+    assert dense[1].sum() == 3000
+
+
+def test_round_points_matches_baseline():
+    df = make_points(20000)
+    for precision in [0, 1]:
+        result = BinningEngine().round_points(df['x'], df['y'], df['z'], df['T'], precision)
+        expected = baseline.round_points(df, precision)
+        np.testing.assert_allclose(baseline.sorted_rows(result), baseline.sorted_rows(expected), atol=1e-9)
+
+
+@pytest.mark.parametrize('precision', [-1, -2])
+def test_round_points_negative_precision(precision):
+    """Отрицательная точность округляет до десятков и сотен, как round(-1) в исходной версии"""
+    df = make_points(5000, extent=1000.0)
+    result = BinningEngine().round_points(df['x'], df['y'], df['z'], df['T'], precision)
+    expected = baseline.round_points(df, precision)
+    np.testing.assert_allclose(baseline.sorted_rows(result), baseline.sorted_rows(expected), atol=1e-9)
+
+    single = BinningEngine().round_points([123.0], [-77.0], [5.0], [1.0], -1)
+    assert single[['x', 'y', 'z']].to_numpy().tolist() == [[120.0, -80.0, 0.0]]
+
+
+def test_narrow_keys_types():
+    keys, offsets, shape = narrow_keys([np.array([5.0, 7.0]), np.array([-3.0, 400.0]), np.array([0.0, 1e6])])
+    assert [k.dtype for k in keys] == [np.uint8, np.uint16, np.uint32]
+    assert offsets == [5, -3, 0]
+    assert shape == (3, 404, 1000001)
+
+
+def test_compact_dtype_preserved():
+    df = make_points(1000).astype(np.float32)
+    result, _ = BinningEngine().bin_points(df['x'], df['y'], df['z'], df['T'])
+    assert all(result[col].dtype == np.float32 for col in result.columns)
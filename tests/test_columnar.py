@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.columnar import COLUMNS, ColumnarStore, filter_rows
+from data.data_loader import DataLoader
+from tests import baseline
+
+# Модуль, без которого формат недоступен (None - только numpy)
+FORMAT_MODULES = {'npz': None, 'parquet': 'pyarrow', 'feather': 'pyarrow', 'hdf5': 'tables'}
+
+REGIONS = [
+    {'z': (4.9, 5.1)},
+    {'x': (-1.0, 2.0), 'y': (3.0, 3.5)},
+    {'x': (2.5, 2.5)},
+    {'z': (20.0, 30.0)},
+]
+
+
+def make_points(num_points=50000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.uniform(0, 10, (num_points, 3)), columns=['x', 'y', 'z'])
+    # Часть точек ровно на границе области
+    df.loc[:99, 'x'] = 2.5
+    df['T'] = rng.normal(20, 5, num_points)
+    return df
+
+
+def full_read_filter(df, bounds):
+    """Область полным проходом по всем точкам"""
+    return pd.DataFrame(filter_rows(df[COLUMNS].to_numpy(), bounds), columns=COLUMNS)
+
+
+@pytest.fixture(scope='module')
+def points():
+    return make_points()
+
+
+@pytest.fixture(params=list(FORMAT_MODULES))
+def saved(request, points, tmp_path):
+    module = FORMAT_MODULES[request.param]
+    if module is not None:
+        pytest.importorskip(module)
+    store = ColumnarStore(chunk_rows=2048)
+    path = str(tmp_path / f"points.{request.param}")
+    store.save(points, path)
+    return store, path
+
+
+def test_round_trip(saved, points):
+    store, path = saved
+    loaded = store.load(path)
+    assert list(loaded.columns) == COLUMNS
+    np.testing.assert_array_equal(baseline.sorted_rows(loaded), baseline.sorted_rows(points))
+
+
+@pytest.mark.parametrize('bounds', REGIONS)
+def test_region_matches_full_read(saved, points, bounds):
+    """Чтение с bounds дает те же точки, что полное чтение с фильтром"""
+    store, path = saved
+    region = store.load(path, bounds)
+    expected = full_read_filter(points, bounds)
+    assert len(region) == len(expected)
+    np.testing.assert_array_equal(baseline.sorted_rows(region), baseline.sorted_rows(expected))
+
+
+def test_npz_reads_only_overlapping_blocks(points, tmp_path):
+    store = ColumnarStore(chunk_rows=2048)
+    path = str(tmp_path / "points.npz")
+    store.save(points, path)
+    total = len(list(store._iter_npz(path, {})))
+    assert total >= len(points) // 2048
+
+    # Полоса внутри одной восьмой диапазона Z: блоки - ячейки октодерева
+    selected = list(store._iter_npz(path, {'z': (1.0, 1.1)}))
+    assert 0 < len(selected) <= total // 4
+    assert list(store._iter_npz(path, {'z': (20.0, 30.0)})) == []
+
+    progress = []
+    store.load(path, {'z': (1.0, 1.1)}, progress=lambda *args: progress.append(args))
+    assert len(progress) == len(selected)
+
+
+def test_compressed_npz_without_chunks(points, tmp_path):
+    """NPZ, записанный не этой программой, читается блоками без границ"""
+    path = str(tmp_path / "foreign.npz")
+    np.savez_compressed(path, **{col: points[col].to_numpy() for col in COLUMNS})
+    store = ColumnarStore(chunk_rows=4096)
+    np.testing.assert_array_equal(store.load(path).to_numpy(), points.to_numpy())
+    bounds = REGIONS[1]
+    np.testing.assert_array_equal(baseline.sorted_rows(store.load(path, bounds)),
+                                  baseline.sorted_rows(full_read_filter(points, bounds)))
+
+
+def test_nan_rows_dropped_in_region(tmp_path):
+    df = make_points(1000)
+    df.loc[10, 'T'] = np.nan
+    path = str(tmp_path / "points.npz")
+    ColumnarStore(chunk_rows=256).save(df, path)
+    region = ColumnarStore().load(path, {'x': (0.0, 10.0)})
+    assert len(region) == 999 and not region.isna().any().any()
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_load_region_text_and_columnar(points, tmp_path, compact):
+    """Область из DAT файла и из NPZ совпадает с полным чтением и фильтром"""
+    loader = DataLoader(compact=compact)
+    dat_path = str(tmp_path / "points.dat")
+    np.savetxt(dat_path, points.to_numpy(), fmt='%.6f')
+    npz_path = str(tmp_path / "points.npz")
+    loader.save_to_npz(loader.read_dat_columns(dat_path), npz_path)
+
+    full = loader.read_dat_columns(dat_path)
+    for bounds in REGIONS[:2]:
+        expected = baseline.sorted_rows(full_read_filter(full, bounds))
+        for path in [dat_path, npz_path]:
+            region = loader.load_region(path, bounds)
+            assert (region.dtypes == loader.dtype).all()
+            np.testing.assert_array_equal(baseline.sorted_rows(region), expected)
+
+
+def test_save_errors(tmp_path):
+    store = ColumnarStore()
+    with pytest.raises(ValueError):
+        store.save(pd.DataFrame({'x': [1.0]}), str(tmp_path / "a.npz"))
+    with pytest.raises(ValueError):
+        store.save(make_points(10), str(tmp_path / "a.bin"))
+    with pytest.raises(ValueError):
+        store.load(str(tmp_path / "a.bin"))
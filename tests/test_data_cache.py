@@ -0,0 +1,115 @@
+import json
+import multiprocessing
+import os
+import time
+import numpy as np
+import pandas as pd
+from data.data_cache import LOCK_NAME, STALE_LOCK_SECONDS, DataCache
+
+
+def make_frame(value, rows=100):
+    return pd.DataFrame({col: np.full(rows, value, dtype=np.float64) for col in ['x', 'y', 'z', 'T']})
+
+
+def test_save_while_previous_cache_is_mapped(tmp_path):
+    """
+    Повторное сохранение не перезаписывает отображенные в память файлы:
+    колонки пишутся в новый подкаталог, старый набор данных читается как прежде
+    """
+    source = tmp_path / "data.dat"
+    source.write_text("0 0 0 1\n")
+    cache = DataCache(parser_version=1)
+
+    cache.save(str(source), make_frame(1.0))
+    mapped = cache.load(str(source))
+    assert mapped is not None and mapped['T'].iloc[0] == 1.0
+
+    cache.save(str(source), make_frame(2.0, rows=50))
+    reloaded = cache.load(str(source))
+    assert len(reloaded) == 50 and reloaded['T'].iloc[0] == 2.0
+    assert mapped['T'].iloc[-1] == 1.0
+
+    # Прежний подкаталог колонок удален, остался только текущий
+    cache_path = cache.get_cache_path(str(source))
+    assert len([name for name in os.listdir(cache_path) if name.startswith('columns.')]) == 1
+
+
+def test_stale_key_and_clear(tmp_path):
+    source = tmp_path / "data.dat"
+    source.write_text("0 0 0 1\n")
+    cache = DataCache(parser_version=1)
+    cache.save(str(source), make_frame(1.0))
+
+    assert DataCache(parser_version=2).load(str(source)) is None
+    source.write_text("0 0 0 1\n1 1 1 2\n")
+    assert cache.load(str(source)) is None
+
+    cache.clear(str(source))
+    assert not os.path.exists(cache.get_cache_path(str(source)))
+
+
+def save_after_barrier(source, barrier, value):
+    barrier.wait()
+    DataCache(parser_version=1).save(source, make_frame(value, rows=200000))
+
+
+def test_concurrent_saves(tmp_path):
+    """
+    Несколько процессов сохраняют кэш одного файла одновременно (пакетная
+    отрисовка с --workers): метаданные указывают на существующий каталог
+    колонок, и кэш читается
+    """
+    source = tmp_path / "data.dat"
+    source.write_text("0 0 0 1\n")
+    barrier = multiprocessing.Barrier(4)
+    processes = [multiprocessing.Process(target=save_after_barrier, args=(str(source), barrier, float(i)))
+                 for i in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    cache = DataCache(parser_version=1)
+    cache_path = cache.get_cache_path(str(source))
+    with open(os.path.join(cache_path, 'meta.json'), encoding='utf-8') as file:
+        columns_dir = json.load(file)['columns_dir']
+    assert os.path.isdir(os.path.join(cache_path, columns_dir))
+    loaded = cache.load(str(source))
+    assert loaded is not None and len(loaded) == 200000
+    assert not os.path.exists(os.path.join(cache_path, LOCK_NAME))
+
+
+def test_save_skipped_while_locked(tmp_path):
+    source = tmp_path / "data.dat"
+    source.write_text("0 0 0 1\n")
+    cache = DataCache(parser_version=1)
+    cache_path = cache.get_cache_path(str(source))
+    os.makedirs(cache_path)
+    lock_path = os.path.join(cache_path, LOCK_NAME)
+    open(lock_path, 'w').close()
+
+    cache.save(str(source), make_frame(1.0))
+    assert cache.load(str(source)) is None
+
+    # Блокировка прерванного процесса не мешает сохранению
+    stale = time.time() - STALE_LOCK_SECONDS - 1
+    os.utime(lock_path, (stale, stale))
+    cache.save(str(source), make_frame(1.0))
+    assert cache.load(str(source)) is not None
+    assert not os.path.exists(lock_path)
+
+
+def test_newer_columns_kept(tmp_path):
+    """Каталог колонок, созданный позже текущего, не удаляется"""
+    source = tmp_path / "data.dat"
+    source.write_text("0 0 0 1\n")
+    cache = DataCache(parser_version=1)
+    cache_path = cache.get_cache_path(str(source))
+    newer = os.path.join(cache_path, f"columns.{time.time_ns() + 10 ** 12}.1")
+    older = os.path.join(cache_path, "columns.1.1")
+    os.makedirs(newer)
+    os.makedirs(older)
+
+    cache.save(str(source), make_frame(1.0))
+    assert os.path.isdir(newer) and not os.path.exists(older)
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+from data.data_loader import DataLoader
+from tests import baseline
+from utils.synthetic_data import SyntheticDataGenerator
+
+DAT_CONTENT = """TITLE = "Temperature"
+VARIABLES = "X" "Y" "Z" "T"
+ZONE T="zone 1", I=3, J=2
+0.000000 0.000000 -0.000000 -12.587000
+0.725669 0.000000 -0.000000 -12.587000 1.0
+1.451338 0.000000 0.000000 -12.5e-1
+# комментарий
+-0.362835 0.628319 0.000000 -3.25
+
+ZONE T="zone 2"
+1.088504 0.628319 1.500000 4.000000
+1.814173 0.628319 1.500000 5.500000
+"""
+
+
+@pytest.fixture
+def dat_file(tmp_path):
+    path = tmp_path / "sample.dat"
+    path.write_text(DAT_CONTENT)
+    return str(path)
+
+
+@pytest.mark.parametrize('chunk_size', [16, 64, 1 << 20])
+def test_dat_parser_matches_baseline(dat_file, chunk_size):
+    """Потоковый разбор DAT совпадает с исходным построчным при любой границе блоков"""
+    df = DataLoader().read_dat_columns(dat_file, chunk_size=chunk_size)
+    expected = baseline.parse_dat(dat_file)
+    assert list(df.columns) == ['x', 'y', 'z', 'T']
+    np.testing.assert_array_equal(df.to_numpy(), expected.to_numpy(dtype=np.float64))
+
+
+def test_dat_parser_crlf(tmp_path):
+    path = tmp_path / "crlf.dat"
+    path.write_bytes(DAT_CONTENT.replace("\n", "\r\n").encode())
+    df = DataLoader().read_dat_columns(str(path), chunk_size=32)
+    np.testing.assert_array_equal(df.to_numpy(), baseline.parse_dat(str(path)).to_numpy(dtype=np.float64))
+
+
+def test_load_from_dat_matches_baseline_rounding(tmp_path):
+    """load_from_dat (разбор и округление) совпадает с исходной версией"""
+    path = str(tmp_path / "lattice.dat")
+    SyntheticDataGenerator().write_dat(path, 5000, 'structured')
+    result = DataLoader().load_from_dat(path)
+    expected = baseline.round_points(baseline.parse_dat(path))
+    np.testing.assert_allclose(baseline.sorted_rows(result), baseline.sorted_rows(expected), rtol=0, atol=1e-9)
+
+
+def test_load_from_dat_uses_loader_dtype(dat_file):
+    """В компактном режиме прямой вызов load_from_dat возвращает float32"""
+    raw = DataLoader(compact=True).read_dat_columns(dat_file)
+    assert all(raw[col].dtype == np.float32 for col in raw.columns)
+    thinned = DataLoader(compact=True).load_from_dat(dat_file)
+    assert thinned['T'].dtype == np.float32
+    assert DataLoader().load_from_dat(dat_file)['T'].dtype == np.float64
+
+
+def test_empty_dat(tmp_path):
+    path = tmp_path / "empty.dat"
+    path.write_text('TITLE = "nothing"\n')
+    assert DataLoader().load_from_dat(str(path)).empty
+
+
+CSV_POINTS = np.array([[0.0, 0.5, 1.0, 20.25],
+                       [1.5, -2.0, 3.0, -4.5],
+                       [2.0, 2.5, -1.0, 0.001]])
+
+# Текст файла и ожидаемый формат; во всех файлах точки CSV_POINTS
+CSV_CASES = {
+    'comma_header': (
+        "x,y,z,T\n0,0.5,1,20.25\n1.5,-2,3,-4.5\n2,2.5,-1,1e-3\n",
+        {'sep': ',', 'skiprows': 1, 'num_fields': 4, 'usecols': [0, 1, 2, 3]}),
+    'semicolon_no_header': (
+        "0;0.5;1;20.25\n1.5;-2;3;-4.5\n2;2.5;-1;1e-3\n",
+        {'sep': ';', 'skiprows': 0, 'num_fields': 4, 'usecols': [0, 1, 2, 3]}),
+    'tab_reordered_header': (
+        'T\t"X"\tz\tY\tid\n20.25\t0\t1\t0.5\t1\n-4.5\t1.5\t3\t-2\t2\n1e-3\t2\t-1\t2.5\t3\n',
+        {'sep': '\t', 'skiprows': 1, 'num_fields': 5, 'usecols': [1, 3, 2, 0]}),
+    'spaces_comments': (
+        "# расчет 1\n\n# шаг 5\n0  0.5  1  20.25\n1.5 -2 3 -4.5\n2 2.5 -1   1e-3\n",
+        {'sep': r'\s+', 'skiprows': 0, 'num_fields': 4, 'usecols': [0, 1, 2, 3]}),
+    'comments_before_header': (
+        "\ufeff# расчет\n\nx,y,z,t,id\n0,0.5,1,20.25,7\n1.5,-2,3,-4.5,7\n2,2.5,-1,1e-3,7\n",
+        {'sep': ',', 'skiprows': 3, 'num_fields': 5, 'usecols': [0, 1, 2, 3]}),
+}
+
+
+@pytest.mark.parametrize('case', list(CSV_CASES))
+def test_sniff_csv(tmp_path, case):
+    """Разделитель, строки до данных и номера колонок x, y, z, T"""
+    text, expected = CSV_CASES[case]
+    path = tmp_path / "data.csv"
+    path.write_text(text, encoding='utf-8')
+    loader = DataLoader()
+    assert loader.sniff_csv(str(path)) == expected
+
+    for chunk_rows in [None, 2]:
+        kwargs = {} if chunk_rows is None else {'chunk_rows': chunk_rows, 'progress': lambda *args: None}
+        df = loader.load_from_csv(str(path), **kwargs)
+        assert list(df.columns) == ['x', 'y', 'z', 'T']
+        np.testing.assert_array_equal(df.to_numpy(), CSV_POINTS)
+
+
+def test_csv_bad_values_and_empty(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("x,y,z,T\n1,2,3,4\n5,oops,7,8\n9,10,11,12\n")
+    for loader in [DataLoader(), DataLoader(compact=True)]:
+        df = loader.load_from_csv(str(path))
+        np.testing.assert_array_equal(df.to_numpy(), [[1, 2, 3, 4], [9, 10, 11, 12]])
+        assert (df.dtypes == loader.dtype).all()
+
+    empty = tmp_path / "empty.csv"
+    empty.write_text("# только комментарий\n\n")
+    assert DataLoader().sniff_csv(str(empty)) is None
+    assert DataLoader().load_from_csv(str(empty)).empty
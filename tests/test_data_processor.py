@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.data_processor import DataProcessor, RunningStats
+
+
+def test_running_stats_merge_matches_numpy():
+    """Объединение блоков разного размера по формулам Чана совпадает с расчетом по всем данным"""
+    rng = np.random.default_rng(0)
+    data = rng.normal(1e3, 5.0, (10007, 4))
+    stats = RunningStats()
+    for start, stop in [(0, 1), (1, 500), (500, 503), (503, 10007)]:
+        stats.update(data[start:stop])
+
+    result = stats.result()
+    for i, col in enumerate(['x', 'y', 'z', 'T']):
+        assert result[col]['count'] == len(data)
+        assert result[col]['min'] == data[:, i].min()
+        assert result[col]['max'] == data[:, i].max()
+        assert result[col]['mean'] == pytest.approx(data[:, i].mean(), rel=1e-12)
+        assert result[col]['std'] == pytest.approx(data[:, i].std(ddof=1), rel=1e-9)
+
+
+def test_statistics_chunked_equals_single_pass():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.normal(size=(5000, 4)), columns=['x', 'y', 'z', 'T'])
+    processor = DataProcessor(chunk_rows=777)
+    single = processor.calculate_statistics(df)
+    chunked = processor.calculate_statistics_chunked(df.iloc[i:i + 1000] for i in range(0, 5000, 1000))
+    for key in ['count', 'min', 'max', 'avg', 'std']:
+        assert single[key] == pytest.approx(chunked[key], rel=1e-12)
+    # Исходная статистика: pandas describe по T
+    assert single['std'] == pytest.approx(df['T'].std(), rel=1e-12)
+
+
+def test_statistics_rows_subset():
+    df = pd.DataFrame({'x': [0.0, 1, 2, 3], 'y': 0.0, 'z': 0.0, 'T': [1.0, 5, 3, 10]})
+    stats = DataProcessor().calculate_statistics(df, np.array([1, 2]))
+    assert stats['count'] == 2 and stats['avg'] == 4.0 and stats['min'] == 3.0
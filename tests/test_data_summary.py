@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.data_summary import HISTOGRAM_BINS, DataSummary
+from data.slice_index import SliceIndex
+
+
+def make_points(num_points=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(np.round(rng.uniform(0, 10, (num_points, 3)), 1), columns=['x', 'y', 'z'])
+    df['T'] = rng.normal(20, 5, num_points)
+    return df
+
+
+def test_summary_matches_pandas():
+    """Статистика, уникальные значения и гистограмма совпадают с прямым расчетом"""
+    df = make_points()
+    summary = DataSummary.from_data(df)
+    assert summary.valid and summary.count == len(df) and summary.matches(df)
+    for col in ['x', 'y', 'z', 'T']:
+        values = summary.columns[col]
+        assert summary.range(col) == (df[col].min(), df[col].max())
+        assert values['mean'] == pytest.approx(df[col].mean(), rel=1e-12)
+        assert values['std'] == pytest.approx(df[col].std(), rel=1e-9)
+    for axis in ['x', 'y', 'z']:
+        np.testing.assert_array_equal(summary.unique[axis], np.unique(df[axis]))
+
+    counts, edges = summary.histogram
+    expected_counts, expected_edges = np.histogram(df['T'], bins=HISTOGRAM_BINS)
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_allclose(edges, expected_edges)
+
+
+def test_unique_from_slice_index():
+    """С индексом срезов уникальные значения берутся из его осей и те же"""
+    df = make_points()
+    index = SliceIndex(df)
+    summary = DataSummary.from_data(df, index)
+    assert set(index._order) == {'x', 'y', 'z'}
+    for axis in ['x', 'y', 'z']:
+        np.testing.assert_array_equal(summary.unique[axis], DataSummary.from_data(df).unique[axis])
+
+
+def test_summary_is_immutable():
+    summary = DataSummary.from_data(make_points(100))
+    with pytest.raises(AttributeError):
+        summary.count = 0
+    with pytest.raises(TypeError):
+        summary.columns['T']['min'] = 0.0
+    with pytest.raises(ValueError):
+        summary.unique['x'][0] = -1.0
+    assert not summary.matches(make_points(100))
+
+
+def test_invalid_data():
+    empty = DataSummary.from_data(pd.DataFrame(columns=['x', 'y', 'z', 'T']))
+    assert not empty.valid and empty.count == 0 and empty.histogram is None
+    assert not DataSummary.from_data(pd.DataFrame({'x': [1.0]})).valid
+
+    df = make_points(100)
+    df.loc[5, 'T'] = np.nan
+    summary = DataSummary.from_data(df)
+    assert not summary.valid and summary.histogram is None
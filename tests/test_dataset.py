@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+from data.data_loader import DataLoader
+from data.dataset import Dataset
+
+
+def make_raw(num_points=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.uniform(0, 10, (num_points, 4)), columns=['x', 'y', 'z', 'T'])
+
+
+def thinned_bytes(raw, method, **params):
+    return Dataset._memory_usage(Dataset(raw).get_thinned(method, **params))
+
+
+def test_thinning_cached_and_matches_loader():
+    """Повторный запрос с теми же параметрами не пересчитывается; результат как у DataLoader"""
+    dataset = Dataset(make_raw())
+    rounded = dataset.get_thinned("rounding", precision=1)
+    assert dataset.get_thinned("rounding", precision=1) is rounded
+    pd.testing.assert_frame_equal(rounded, DataLoader().get_data_without_binning(dataset.raw, 1))
+
+    binned = dataset.get_thinned("binning", bin_widths=(1, 1, 1))
+    assert dataset.get_thinned("binning", bin_widths=(1.0, 1.0, 1.0)) is binned
+    assert dataset.get_thinned("binning", bin_widths=(1, 1, 1), bin_output='center') is not binned
+
+
+def test_lru_eviction_within_budget():
+    """При превышении бюджета вытесняется давно не использованный результат"""
+    raw = make_raw()
+    first = dict(bin_widths=(1.0, 1.0, 1.0))
+    second = dict(bin_widths=(2.0, 2.0, 2.0))
+    third = dict(bin_widths=(2.5, 2.5, 2.5))
+    budget = sum(thinned_bytes(raw, "binning", **params) for params in (first, second)) + 1
+    dataset = Dataset(raw, memory_budget=budget)
+
+    a = dataset.get_thinned("binning", **first)
+    dataset.get_thinned("binning", **second)
+    summary = dataset.get_summary(a)
+    # Обращение к первому результату делает вытесняемым второй
+    assert dataset.get_thinned("binning", **first) is a
+    dataset.get_thinned("binning", **third)
+
+    keys = list(dataset._thinned)
+    assert Dataset.make_key("binning", **first) in keys
+    assert Dataset.make_key("binning", **second) not in keys
+    assert dataset._thinned_bytes == sum(Dataset._memory_usage(df) for df in dataset._thinned.values())
+    assert dataset._thinned_bytes <= budget
+    assert dataset.get_summary(a) is summary
+
+
+def test_result_larger_than_budget_is_kept():
+    dataset = Dataset(make_raw(), memory_budget=1)
+    first = dataset.get_thinned("rounding", precision=0)
+    second = dataset.get_thinned("rounding", precision=1)
+    assert list(dataset._thinned.values()) == [second]
+    assert dataset.get_thinned("rounding", precision=0) is not first
+
+
+def test_summary_dropped_with_evicted_result():
+    dataset = Dataset(make_raw(), memory_budget=1)
+    first = dataset.get_thinned("rounding", precision=0)
+    dataset.get_summary(first)
+    dataset.get_thinned("rounding", precision=1)
+    assert Dataset.make_key("rounding", precision=0) not in dataset._summaries
+
+    dataset.get_summary(dataset.raw)
+    dataset.clear_cache()
+    assert not dataset._thinned and dataset._thinned_bytes == 0
+    assert list(dataset._summaries) == [None]
+
+
+def test_raw_read_once(tmp_path):
+    """Файл читается один раз, смена прореживания его не перечитывает"""
+    path = tmp_path / "data.dat"
+    np.savetxt(path, make_raw(500).to_numpy(), fmt='%.6f')
+    loader = DataLoader()
+    calls = []
+    load_raw = loader.load_raw
+    loader.load_raw = lambda *args: calls.append(args) or load_raw(*args)
+
+    dataset = Dataset.from_file(str(path), loader, use_cache=False)
+    for precision in [0, 1, 0]:
+        dataset.get_thinned("rounding", precision=precision)
+    dataset.get_thinned("binning")
+    assert len(calls) == 1
+
+
+def test_csv_not_thinned():
+    """CSV файлы, как и раньше, не прореживаются"""
+    dataset = Dataset(make_raw(100), file_path="data.csv")
+    assert dataset.get_thinned("binning") is dataset.raw
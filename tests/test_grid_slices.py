@@ -0,0 +1,75 @@
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pytest
+from scipy.interpolate import LinearNDInterpolator
+from data.data_loader import DataLoader
+from data.slice_index import SliceIndex
+from data.structured_grid import StructuredGrid
+from utils.synthetic_data import SyntheticDataGenerator
+from visualization.plot_3d import Plot3D
+
+
+@pytest.fixture(scope='module')
+def staggered_file(tmp_path_factory):
+    """DAT файл решетки со сдвигом рядов на полшага (все узлы заполнены)"""
+    path = str(tmp_path_factory.mktemp('grid') / 'staggered.dat')
+    generator = SyntheticDataGenerator(extent=(70.0, 18.0, 17.0))
+    # Число точек, при котором решетка generator.lattice_shape занята целиком
+    num_points = 20000
+    while int(np.prod(generator.lattice_shape(num_points))) != num_points:
+        num_points = int(np.prod(generator.lattice_shape(num_points)))
+    generator.write_dat(path, num_points, 'structured')
+    return path
+
+
+def test_grid_slice_matches_interpolated_slice(staggered_file):
+    """
+    Изотермы по слою решетки совпадают с интерполяцией Делоне: в узлах
+    полностью заполненного слоя интерполяция дает значения самих точек
+    """
+    loader = DataLoader()
+    data = loader.read_dat_columns(staggered_file)
+    grid = StructuredGrid.detect(data)
+    assert grid is not None and grid.fill_ratio == 1.0
+    slice_index = SliceIndex(data, grid)
+    plot = Plot3D()
+
+    for value in grid.coords['z'][::4]:
+        params = {'axis': 'z', 'value': float(value), 'tolerance': 0.1}
+        X, Y, T = plot.prepare_slice(data, params, slice_index=slice_index)['grid']
+        assert not np.isnan(T).any()
+
+        # Тот же срез без решетки: точки полосы и интерполяция по ним
+        band = plot.prepare_slice(data, params, slice_index=SliceIndex(data))
+        assert T.size == len(band['temperatures'])
+        at_nodes = LinearNDInterpolator(np.column_stack((band['x_coords'], band['y_coords'])),
+                                        band['temperatures'])(X, Y)
+        np.testing.assert_allclose(T, at_nodes, rtol=1e-9)
+
+
+def test_layers_with_empty_nodes_fall_back_to_interpolation(staggered_file):
+    """
+    После округления сдвинутых рядов решетка заполнена не полностью: слои
+    с пустыми узлами не идут в contourf напрямую, изотермы интерполируются
+    """
+    loader = DataLoader()
+    data = loader.get_data_without_binning(loader.read_dat_columns(staggered_file), 0)
+    grid = StructuredGrid.detect(data)
+    assert grid is not None and grid.fill_ratio < 1.0
+    slice_index = SliceIndex(data, grid)
+    plot = Plot3D()
+
+    value = float(grid.coords['z'][0])
+    assert grid.slice_plane('z', value, 0.1) is None
+    params = {'axis': 'z', 'value': value, 'tolerance': 0.1}
+    prepared = plot.prepare_slice(data, params, slice_index=slice_index)
+    Xi, Yi, Zi = prepared['grid']
+    assert Zi.shape == (plot.grid_size, plot.grid_size)
+
+    expected = plot._create_interpolated_grid(prepared['x_coords'], prepared['y_coords'], prepared['temperatures'],
+                                              plot.grid_size)
+    np.testing.assert_array_equal(Zi, expected[2])
+    # Пустые узлы интерполяции - только у края, вне выпуклой оболочки точек
+    # (в слое решетки их было несколько десятков посреди панели)
+    assert np.isnan(Zi[2:-2, 2:-2]).sum() == 0
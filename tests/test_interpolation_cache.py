@@ -0,0 +1,64 @@
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+from scipy.interpolate import griddata
+from data.slice_index import SliceIndex
+from visualization.interpolation_cache import InterpolationCache
+from visualization.plot_3d import Plot3D
+
+
+def make_points(num_points=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.uniform(0, 10, (num_points, 3)), columns=['x', 'y', 'z'])
+    df['T'] = np.sin(df['x']) + df['y'] * 0.5
+    return df
+
+
+def test_lru_eviction_and_counters():
+    cache = InterpolationCache(max_grids=2)
+    keys = [cache.make_key(1, 'z', value, 0.1) for value in range(3)]
+    cache.put_grid(keys[0], 50, 'a')
+    cache.put_grid(keys[1], 50, 'b')
+    assert cache.get_grid(keys[0], 50) == 'a'
+    cache.put_grid(keys[2], 50, 'c')
+
+    # Вытесняется давно не использованная сетка
+    assert cache.get_grid(keys[1], 50) is None
+    assert cache.get_grid(keys[0], 50) == 'a'
+    assert cache.get_grid(keys[0], 100) is None
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_grid_matches_griddata():
+    """Интерполяция по кэшированной триангуляции совпадает с исходным griddata"""
+    df = make_points(2000)
+    x, y, T = df['x'].to_numpy(), df['y'].to_numpy(), df['T'].to_numpy()
+    plot = Plot3D(grid_size=40)
+    key = plot.interpolation_cache.make_key(1, 'z', 5.0, 0.1)
+
+    for _ in range(2):
+        Xi, Yi, Zi = plot._create_interpolated_grid(x, y, T, 40, key)
+        expected = griddata((x, y), T, (Xi, Yi), method='linear')
+        np.testing.assert_allclose(Zi, expected, rtol=1e-10, equal_nan=True)
+    assert plot.interpolation_cache.hits == 1
+
+
+def test_prepare_slice_reuses_grid():
+    """Повторный срез с теми же параметрами берет сетку из кэша; новые данные - новый ключ"""
+    df = make_points()
+    plot = Plot3D(grid_size=30)
+    params = {'axis': 'z', 'value': 5.0, 'tolerance': 0.5}
+    index = SliceIndex(df)
+
+    first = plot.prepare_slice(df, params, slice_index=index)
+    second = plot.prepare_slice(df, params, slice_index=index)
+    assert first['grid'] is not None and second['grid'] is first['grid']
+
+    other = plot.prepare_slice(df, dict(params, value=6.0), slice_index=index)
+    assert other['grid'] is not first['grid']
+
+    # Тот же срез другого набора данных не берется из кэша
+    reloaded = plot.prepare_slice(df, params, slice_index=SliceIndex(df))
+    assert reloaded['grid'] is not first['grid']
+    np.testing.assert_allclose(reloaded['grid'][2], first['grid'][2], equal_nan=True)
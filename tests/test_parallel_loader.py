@@ -0,0 +1,63 @@
+import os
+import numpy as np
+import pytest
+from data import parallel_loader
+from data.data_loader import DataLoader
+from data.parallel_loader import COLUMNS, load_files_parallel
+from data.progress import LoadCancelled
+
+
+def write_dat(path, num_points, seed):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 10, size=(num_points, 4))
+    np.savetxt(path, points, fmt='%.6f')
+    return points
+
+
+def test_parallel_load_matches_loader(tmp_path):
+    """Колонки, переданные через общую память, совпадают с загрузкой в процессе"""
+    paths = [tmp_path / f"month{i}.dat" for i in range(3)]
+    for i, path in enumerate(paths):
+        write_dat(path, 200 + i, seed=i)
+
+    collection = load_files_parallel(str(tmp_path), max_workers=2, use_cache=False)
+    assert collection.paths == [str(path) for path in paths]
+    loader = DataLoader()
+    for path in paths:
+        expected = loader.read_dat_columns(str(path))
+        np.testing.assert_array_equal(collection[str(path)][COLUMNS].to_numpy(), expected[COLUMNS].to_numpy())
+
+
+def test_load_without_shared_memory(tmp_path, monkeypatch):
+    """В Windows рабочий процесс возвращает сам массив колонок"""
+    path = tmp_path / "data.dat"
+    points = write_dat(path, 50, seed=0)
+    monkeypatch.setattr(parallel_loader, 'USE_SHARED_MEMORY', False)
+
+    _, columns, num_rows, raw_count, _ = parallel_loader._load_to_shared_memory(
+        str(path), None, (0.5, 0.5, 0.5), 0, 'centroid', False)
+    assert isinstance(columns, np.ndarray) and columns.shape == (len(COLUMNS), 50)
+    assert num_rows == raw_count == 50
+    np.testing.assert_allclose(columns.T, points, atol=1e-6)
+
+
+def test_progress_and_cancel(tmp_path):
+    """Отчет после каждого файла; отмена не оставляет блоков общей памяти"""
+    for i in range(4):
+        write_dat(tmp_path / f"month{i}.dat", 300, seed=i)
+    total = sum(os.path.getsize(path) for path in tmp_path.iterdir())
+
+    reports = []
+    load_files_parallel(str(tmp_path), max_workers=2, use_cache=False,
+                        progress=lambda *args: reports.append(args))
+    assert [done for _, done, _, _ in reports] == sorted(done for _, done, _, _ in reports)
+    assert reports[-1][1:] == (total, total, 4 * 300)
+
+    def cancel(stage, done=None, total=None, rows=None):
+        raise LoadCancelled()
+
+    shared = set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+    with pytest.raises(LoadCancelled):
+        load_files_parallel(str(tmp_path), max_workers=2, use_cache=False, progress=cancel)
+    if os.path.isdir('/dev/shm'):
+        assert set(os.listdir('/dev/shm')) == shared
@@ -0,0 +1,51 @@
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+from data.plane_sampler import plane_basis, plane_polygon
+from visualization.plot_3d import Plot3D
+
+UNIT_BOX = {'x': (0.0, 1.0), 'y': (0.0, 1.0), 'z': (0.0, 1.0)}
+
+
+def test_plane_polygon_is_section_of_box():
+    """Вершины сечения лежат на плоскости и в границах данных, обход выпуклый"""
+    bounds = {'x': (-2.0, 8.0), 'y': (0.0, 3.0), 'z': (1.0, 5.0)}
+    origin, normal = np.array([3.0, 1.5, 3.0]), (1.0, 2.0, 3.0)
+    polygon = plane_polygon(bounds, origin, normal)
+    assert 3 <= len(polygon) <= 6
+
+    n, _, _ = plane_basis(normal)
+    np.testing.assert_allclose((polygon - origin) @ n, 0, atol=1e-12)
+    for i, axis in enumerate(['x', 'y', 'z']):
+        assert bounds[axis][0] - 1e-12 <= polygon[:, i].min()
+        assert polygon[:, i].max() <= bounds[axis][1] + 1e-12
+
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    turns = np.cross(edges, np.roll(edges, -1, axis=0)) @ n
+    assert (turns > 0).all() or (turns < 0).all()
+
+
+def test_plane_polygon_shapes():
+    assert len(plane_polygon(UNIT_BOX, (0.5, 0.5, 0.5), (1.0, 1.0, 1.0))) == 6
+    np.testing.assert_allclose(
+        np.sort(plane_polygon(UNIT_BOX, (0.5, 0.5, 0.5), (0.0, 0.0, 1.0)), axis=0),
+        [[0, 0, 0.5], [0, 0, 0.5], [1, 1, 0.5], [1, 1, 0.5]])
+    # Плоскость вне параллелепипеда
+    assert plane_polygon(UNIT_BOX, (0.5, 0.5, 5.0), (0.0, 1.0, 1.0)).shape == (0, 3)
+
+
+def test_oblique_plane_keeps_axis_limits():
+    """Наклонная плоскость не расширяет оси 3D графика по сравнению со срезом полосой"""
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(rng.uniform(0, 1, size=(2000, 4)) * [100, 100, 50, 30], columns=['x', 'y', 'z', 'T'])
+    plot = Plot3D(grid_size=30)
+
+    limits = []
+    for extra in ({}, {'mode': 'interpolated', 'method': 'nearest', 'normal': (1.0, 1.0, 2.0)}):
+        fig = plot.create_3d_plot_with_slice(data, dict({'axis': 'z', 'value': 25.0, 'tolerance': 1.0}, **extra),
+                                             show_isotherms=False, interactive=False)
+        fig.canvas.draw()
+        ax = fig.slices_axes[0]
+        limits.append([ax.get_xlim3d(), ax.get_ylim3d(), ax.get_zlim3d()])
+    np.testing.assert_allclose(limits[1], limits[0])
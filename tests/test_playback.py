@@ -0,0 +1,70 @@
+import threading
+import numpy as np
+import pandas as pd
+from gui.main_window import Graph3DApp
+from gui.playback import FrameCache, PlaybackController
+
+
+def make_params(**slice_params):
+    return {
+        'slice_params': dict({'axis': 'z', 'value': 1.0, 'tolerance': 0.1}, **slice_params),
+        'show_isotherms': True,
+        'num_isotherms': 10
+    }
+
+
+def test_frame_key_includes_interpolation_settings():
+    """Кадры, подготовленные для другого режима среза, не берутся из кэша"""
+    band = PlaybackController.make_key(0, make_params())
+    nearest = PlaybackController.make_key(0, make_params(mode='interpolated', method='nearest', k=8, normal=None))
+    idw = PlaybackController.make_key(0, make_params(mode='interpolated', method='idw', k=8, normal=None))
+    idw_k4 = PlaybackController.make_key(0, make_params(mode='interpolated', method='idw', k=4, normal=None))
+    oblique = PlaybackController.make_key(0, make_params(mode='interpolated', method='idw', k=4,
+                                                         normal=[1.0, 0.0, 1.0]))
+    keys = [band, nearest, idw, idw_k4, oblique]
+    assert len(set(keys)) == len(keys)
+
+    # Нормаль из списка и из кортежа дает один ключ
+    assert oblique == PlaybackController.make_key(0, make_params(mode='interpolated', method='idw', k=4,
+                                                                 normal=(1, 0, 1)))
+
+
+class MainThreadVar:
+    """Заменяет переменную Tk: чтение не из главного потока - ошибка"""
+
+    def __init__(self, value):
+        self.value = value
+        self.threads = []
+
+    def get(self):
+        self.threads.append(threading.current_thread())
+        return self.value
+
+
+class SliceStub:
+    def prepare_slice(self, data, slice_params, **kwargs):
+        return {'slice_params': slice_params}
+
+
+def test_prefetch_does_not_read_tk_variables():
+    """Загрузчик для кадров серии берется в главном потоке вместе с параметрами"""
+    app = Graph3DApp.__new__(Graph3DApp)
+    app._data_loader = None
+    app.compact_mode = MainThreadVar(True)
+    app.slice_axis, app.slice_value, app.tolerance_value = MainThreadVar('z'), MainThreadVar(1.0), MainThreadVar(0.1)
+    app.slice_interpolated = MainThreadVar(False)
+    app.show_isotherms, app.num_isotherms = MainThreadVar(False), MainThreadVar(10)
+    app.frame_states = FrameCache(4)
+    app._plot_3d = SliceStub()
+    rng = np.random.default_rng(0)
+    app.collection = [pd.DataFrame(rng.uniform(0, 2, (500, 4)), columns=['x', 'y', 'z', 'T'])]
+
+    params = app._playback_settings()
+    assert params['data_loader'].compact
+
+    frames = []
+    worker = threading.Thread(target=lambda: frames.append(app._prepare_playback_frame(0, params, lambda: False)))
+    worker.start()
+    worker.join()
+    assert frames[0]['prepared']['slice_params']['axis'] == 'z'
+    assert app.compact_mode.threads == [threading.main_thread()]
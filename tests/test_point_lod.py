@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from visualization.point_lod import INTERACTIVE_FRACTION, NEAR_WIDTH, PointLOD
+
+
+def make_points(num_points, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.uniform(0, 1, (num_points, 3)) * [100, 50, 20], columns=['x', 'y', 'z'])
+    df['T'] = rng.normal(size=num_points)
+    return df
+
+
+@pytest.fixture(scope='module')
+def lod():
+    return PointLOD(make_points(200000))
+
+
+def test_small_data_returned_whole():
+    df = make_points(1000)
+    x, y, z, T = PointLOD(df).select(budget=5000, axis='z', value=10.0)
+    assert len(T) == 1000
+    np.testing.assert_array_equal(np.sort(T), np.sort(df['T'].to_numpy()))
+
+
+def test_levels_conserve_points_and_mean(lod):
+    """Ячейки каждого уровня покрывают все точки; средние взвешены числом точек"""
+    previous = 0
+    for depth in [1, 3, 5, 7]:
+        cells = lod.level(depth)
+        assert cells['count'].sum() == len(lod)
+        assert previous < len(cells['T']) <= 8 ** depth
+        previous = len(cells['T'])
+        for col in ['x', 'T']:
+            total = (cells[col] * cells['count']).sum()
+            assert total == pytest.approx(lod.data[col].sum(), rel=1e-9, abs=1e-6)
+
+
+@pytest.mark.parametrize('budget', [1000, 20000, 50000])
+def test_select_within_budget_and_bounds(lod, budget):
+    for args in [{}, {'axis': 'z', 'value': 10.0}, {'axis': 'x', 'value': 3.0}]:
+        x, y, z, T = lod.select(budget, **args)
+        assert 0 < len(T) <= budget
+        for axis, values in zip(['x', 'y', 'z'], (x, y, z)):
+            lo, hi = lod.bounds[axis]
+            assert values.min() >= lo and values.max() <= hi
+
+    x, y, z, T = lod.select(budget, 'z', 10.0, interactive=True)
+    assert len(T) <= max(1, int(budget * INTERACTIVE_FRACTION))
+
+
+def test_points_near_slice_plane_are_exact(lod):
+    """Вблизи плоскости среза рисуются исходные точки, вдали - центроиды ячеек"""
+    value = 10.0
+    width = NEAR_WIDTH * 20
+    x, y, z, T = lod.select(50000, 'z', value)
+    near = np.abs(z - value) <= width
+
+    data = lod.data
+    expected = np.sort(data['T'].to_numpy()[np.abs(data['z'].to_numpy() - value) <= width])
+    assert near.sum() == len(expected) < 25000
+    np.testing.assert_array_equal(np.sort(T[near]), expected)
+    assert (~near).sum() > 0
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+import pytest
+from utils.profiler import OperationRecord, Profiler
+
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler()
+    profiler.enable()
+    yield profiler
+    profiler.disable()
+
+
+def test_disabled_is_noop():
+    profiler = Profiler()
+    with profiler.operation("Загрузка") as record:
+        with profiler.stage("чтение"):
+            profiler.count("точек", 10)
+    assert record is None
+    assert profiler.last_operation is None and profiler.last_summary() is None
+    assert len(profiler._events) == 0
+
+
+def test_operation_breakdown(profiler):
+    """Этапы и счетчики попадают в разбивку действия с учетом вложенности"""
+    with profiler.operation("Загрузка") as record:
+        with profiler.stage("чтение"):
+            with profiler.stage("разбор"):
+                time.sleep(0.01)
+            profiler.count("точек", 100)
+        for _ in range(2):
+            with profiler.stage("прореживание"):
+                profiler.count("точек", 5)
+
+    assert profiler.last_operation is record
+    assert list(record.stages) == ["разбор", "чтение", "прореживание"]
+    reading, parsing, thinning = record.stages["чтение"], record.stages["разбор"], record.stages["прореживание"]
+    assert (reading[2], parsing[2], thinning[1:3]) == (0, 1, [2, 0])
+    assert parsing[0] >= 0.01 and reading[0] >= parsing[0]
+    assert record.seconds >= reading[0] + thinning[0]
+    assert record.counters == {"точек": 110}
+
+    summary = profiler.last_summary()
+    assert summary.startswith("Загрузка: ") and "чтение" in summary and "разбор" not in summary
+    assert "    разбор" in record.report() and "(2 раз)" in record.report()
+
+
+def test_count_outside_operation(profiler):
+    with profiler.stage("срез"):
+        profiler.count("точек", 1)
+    assert profiler.last_operation is None
+
+
+def test_operation_continued_in_other_thread(profiler):
+    """Часть действия в рабочем потоке и часть в главном дают одну разбивку"""
+    records = []
+
+    def compute():
+        with profiler.operation("Обновление среза") as record:
+            with profiler.stage("срез"):
+                pass
+            records.append(record)
+
+    worker = threading.Thread(target=compute)
+    worker.start()
+    worker.join()
+    with profiler.operation("Обновление среза", records[0]) as record:
+        with profiler.stage("отрисовка"):
+            pass
+
+    assert record is records[0]
+    assert list(record.stages) == ["срез", "отрисовка"]
+    assert all(stage[2] == 0 for stage in record.stages.values())
+
+
+def test_save_trace(profiler, tmp_path):
+    with profiler.operation("Загрузка"):
+        with profiler.stage("чтение", category='io'):
+            profiler.count("точек", 3)
+
+    path = tmp_path / "trace.json"
+    profiler.save_trace(str(path))
+    with open(path, encoding='utf-8') as f:
+        trace = json.load(f)
+
+    events = {event['name']: event for event in trace['traceEvents']}
+    assert events['thread_name']['ph'] == 'M'
+    assert events['чтение']['cat'] == 'io' and events['чтение']['ph'] == 'X'
+    assert events['Загрузка']['args'] == {"точек": 3}
+    assert events['Загрузка']['dur'] >= events['чтение']['dur'] >= 0
+    assert events['чтение']['ts'] >= events['Загрузка']['ts']
+
+
+def test_memory_stages():
+    profiler = Profiler()
+    profiler.enable(memory=True)
+    try:
+        with profiler.operation("Загрузка") as record:
+            with profiler.stage("выделение"):
+                data = bytearray(4 * 1024 * 1024)
+        assert record.stages["выделение"][3] >= 3.9
+        assert record.peak_mb >= 3.9
+        assert "пик памяти" in record.summary()
+        del data
+    finally:
+        profiler.disable()
+
+
+def test_summary_other_time():
+    record = OperationRecord("Кадр серии")
+    record.add_stage("срез", 0.010, 0)
+    record.add_stage("сетка", 0.004, 1)
+    record.seconds = 0.015
+    assert record.summary() == "Кадр серии: 15 мс (срез 10, прочее 5)"
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.slice_index import SliceIndex
+
+
+def make_points(num_points=20000, dtype=np.float64, seed=0):
+    rng = np.random.default_rng(seed)
+    # Координаты на сетке 0.1: много точек ровно на границах полос
+    coords = np.round(rng.uniform(-5, 5, (num_points, 3)), 1)
+    df = pd.DataFrame(coords, columns=['x', 'y', 'z'])
+    df['T'] = rng.normal(size=num_points)
+    return df.astype(dtype)
+
+
+def mask_rows(df, axis, value, tolerance):
+    """Строки среза полным проходом, как в исходной версии"""
+    return np.flatnonzero(np.abs(df[axis].to_numpy() - value) <= tolerance)
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_query_matches_boolean_mask(dtype):
+    df = make_points(dtype=dtype)
+    index = SliceIndex(df)
+    rng = np.random.default_rng(1)
+    values = np.concatenate([rng.uniform(-6, 6, 20), [-5.0, 0.0, 0.3, 4.9, 5.0, 7.0]])
+    for axis in ['x', 'y', 'z']:
+        for value in values:
+            for tolerance in [0.0, 0.05, 0.1, 0.3]:
+                rows = index.query(axis, value, tolerance)
+                np.testing.assert_array_equal(np.sort(rows), mask_rows(df, axis, value, tolerance))
+                assert index.count(axis, value, tolerance) == len(rows)
+
+
+def test_query_sorted_by_axis_and_slice_data():
+    df = make_points()
+    index = SliceIndex(df)
+    rows = index.query('y', 1.0, 0.25)
+    assert np.all(np.diff(df['y'].to_numpy()[rows]) >= 0)
+
+    slice_data = index.get_slice_data('y', 1.0, 0.25)
+    expected = df.iloc[mask_rows(df, 'y', 1.0, 0.25)]
+    pd.testing.assert_frame_equal(
+        slice_data.sort_values(['y', 'x', 'z', 'T']).reset_index(drop=True),
+        expected.sort_values(['y', 'x', 'z', 'T']).reset_index(drop=True))
+
+
+def test_empty_slice_and_unknown_axis():
+    index = SliceIndex(make_points(1000))
+    assert len(index.query('z', 100.0, 0.1)) == 0
+    assert index.get_slice_data('z', 100.0, 0.1).empty
+    with pytest.raises(ValueError):
+        index.query('T', 0.0)
+
+
+def test_axes_built_lazily():
+    index = SliceIndex(make_points(1000))
+    assert index.memory_usage() == 0
+    index.query('x', 0.0)
+    assert set(index._order) == {'x'}
+    assert index.memory_usage() == 1000 * (4 + 8)
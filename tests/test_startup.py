@@ -0,0 +1,28 @@
+import json
+import os
+import subprocess
+import sys
+from gui.startup import ModuleWarmer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_window_import_skips_heavy_modules():
+    """Модуль окна импортируется без pandas, matplotlib и scipy"""
+    script = ("import json, sys\n"
+              "from gui.main_window import Graph3DApp\n"
+              "from gui.startup import HEAVY_MODULES\n"
+              "heavy = ('pandas', 'matplotlib', 'scipy') + HEAVY_MODULES\n"
+              "print(json.dumps([name for name in heavy if name in sys.modules]))\n")
+    completed = subprocess.run([sys.executable, '-c', script], cwd=ROOT_DIR,
+                               capture_output=True, text=True, check=True)
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
+
+
+def test_warmer_loads_modules():
+    warmer = ModuleWarmer(('json', 'no_such_module_for_warm_up'))
+    assert not warmer.is_done()
+    warmer.start()
+    assert warmer.wait(30) and warmer.is_done()
+    assert warmer.elapsed >= 0
+    assert list(warmer.errors) == ['no_such_module_for_warm_up']
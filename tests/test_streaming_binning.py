@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from data.binning import BinAccumulator, BinningEngine
+from data.data_loader import DataLoader
+from tests import baseline
+from tests.test_binning import make_points
+from utils.synthetic_data import SyntheticDataGenerator
+
+
+def test_accumulator_matches_bin_points():
+    """Потоковый биннинг блоками совпадает с биннингом всех точек сразу"""
+    df = make_points(30000)
+    widths = (0.5, 0.5, 0.5)
+    origin = tuple(df[col].min() for col in ['x', 'y', 'z'])
+    accumulator = BinAccumulator(widths, origin)
+    for start in range(0, len(df), 7000):
+        block = df.iloc[start:start + 7000]
+        accumulator.add(block['x'], block['y'], block['z'], block['T'])
+
+    streamed, _ = accumulator.result()
+    expected, _ = BinningEngine().bin_points(df['x'], df['y'], df['z'], df['T'], widths)
+    np.testing.assert_allclose(baseline.sorted_rows(streamed), baseline.sorted_rows(expected), rtol=1e-12)
+
+
+@pytest.mark.parametrize('extension', ['dat', 'csv', 'npz'])
+@pytest.mark.parametrize('output', ['centroid', 'center'])
+@pytest.mark.parametrize('compact', [False, True])
+def test_streaming_matches_in_memory(tmp_path, extension, output, compact):
+    """
+    Биннинг файла блоками совпадает с биннингом загруженных в память
+    точек, в компактном режиме - с теми же ячейками и типом float32.
+    """
+    path = str(tmp_path / f"points.{extension}")
+    if extension == 'npz':
+        source = str(tmp_path / "points.dat")
+        SyntheticDataGenerator().write(source, 50000, 'scattered')
+        DataLoader().save_to_npz(DataLoader().read_dat_columns(source), path)
+    else:
+        SyntheticDataGenerator().write(path, 50000, 'scattered')
+    loader = DataLoader(compact=compact)
+    widths = (0.3, 0.7, 0.5)
+
+    # Маленькие блоки: точки файла проходят через много вызовов add
+    streamed = loader.bin_file_streaming(path, *widths, output=output, chunk_size=64 * 1024)
+    expected = loader.get_data_with_binning(loader.load_raw(path, use_cache=False), *widths, output=output)
+    assert (streamed.dtypes == loader.dtype).all() and (expected.dtypes == loader.dtype).all()
+    assert len(streamed) == len(expected)
+    rtol = 1e-6 if compact else 1e-10
+    np.testing.assert_allclose(baseline.sorted_rows(streamed), baseline.sorted_rows(expected),
+                               rtol=rtol, atol=1e-9)
+
+
+def test_accumulator_keeps_float32():
+    df = make_points(5000).astype(np.float32)
+    accumulator = BinAccumulator((0.5, 0.5, 0.5), tuple(float(df[col].min()) for col in ['x', 'y', 'z']))
+    accumulator.add(df['x'], df['y'], df['z'], df['T'])
+    for output in ['centroid', 'center']:
+        result, _ = accumulator.result(output)
+        assert (result.dtypes == np.float32).all()
+
+
+def test_streaming_empty_file(tmp_path):
+    path = tmp_path / "empty.dat"
+    path.write_text('TITLE = "nothing"\n')
+    assert DataLoader().bin_file_streaming(str(path)).empty
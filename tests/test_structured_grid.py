@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from data.structured_grid import StructuredGrid
+from utils.synthetic_data import SyntheticDataGenerator
+
+
+def lattice(nx=6, ny=5, nz=4, seed=0):
+    rng = np.random.default_rng(seed)
+    x, y, z = np.meshgrid(np.arange(nx) * 0.5, np.arange(ny) * 1.5, np.arange(nz) - 1.0, indexing='ij')
+    df = pd.DataFrame({'x': x.ravel(), 'y': y.ravel(), 'z': z.ravel(), 'T': rng.normal(size=x.size)})
+    # Порядок строк в файле не важен
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def test_detect_rectangular_lattice():
+    df = lattice()
+    grid = StructuredGrid.detect(df)
+    assert grid is not None
+    assert grid.shape == (6, 5, 4)
+    assert grid.fill_ratio == 1.0
+    # Каждый узел ссылается на свою строку
+    rows = grid.rows.ravel()
+    np.testing.assert_array_equal(grid.values.ravel(), df['T'].to_numpy()[rows])
+
+
+def test_detect_scattered_returns_none():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.uniform(0, 1, (2000, 4)), columns=['x', 'y', 'z', 'T'])
+    assert StructuredGrid.detect(df) is None
+
+
+def test_detect_staggered_lattice():
+    """Решетка со сдвигом рядов определяется без пустых узлов"""
+    df = SyntheticDataGenerator().generate(4000, 'structured')
+    grid = StructuredGrid.detect(df)
+    assert grid is not None
+    assert grid.stagger_axis == 'x' and grid.shift_axis == 'y'
+    assert grid.fill_ratio == 1.0
+
+
+def test_slice_plane_matches_points():
+    """Слой решетки совпадает с точками полосы среза"""
+    df = lattice()
+    grid = StructuredGrid.detect(df)
+    X, Y, T = grid.slice_plane('z', 1.0, 0.1)
+    band = df[np.abs(df['z'] - 1.0) <= 0.1]
+    assert T.size == len(band)
+    expected = {(round(x, 6), round(y, 6)): t for x, y, t in band[['x', 'y', 'T']].to_numpy()}
+    for x, y, t in zip(X.ravel(), Y.ravel(), T.ravel()):
+        assert expected[(round(x, 6), round(y, 6))] == t
+
+    rows = grid.slice_rows('z', 1.0, 0.1, df)
+    assert sorted(rows) == sorted(band.index)
+    # Полоса между слоями или через два слоя - не слой решетки
+    assert grid.slice_plane('z', 0.5, 0.1) is None
+    assert grid.slice_plane('z', 0.5, 1.0) is None
@@ -0,0 +1,91 @@
+import threading
+from gui.update_scheduler import UpdateScheduler
+from tests.fake_root import FakeRoot
+
+
+class Recorder:
+    def __init__(self, compute=None):
+        self.computed = []
+        self.applied = []
+        self.errors = []
+        self._compute = compute
+
+    def compute(self, params, is_cancelled):
+        self.computed.append(params)
+        if self._compute is not None:
+            return self._compute(params, is_cancelled)
+        return params * 10
+
+    def apply(self, params, result):
+        self.applied.append((params, result))
+
+    def on_error(self, error):
+        self.errors.append(error)
+
+
+def make_scheduler(recorder, root):
+    return UpdateScheduler(root, recorder.compute, recorder.apply, recorder.on_error, delay_ms=40, poll_ms=15)
+
+
+def test_burst_coalesced_into_last_request():
+    """Запросы чаще delay_ms сворачиваются в один - последний"""
+    root, recorder = FakeRoot(), Recorder()
+    scheduler = make_scheduler(recorder, root)
+    for value in range(5):
+        scheduler.request(value)
+        root.advance(10)
+    assert recorder.computed == []
+
+    root.run_until_idle()
+    assert recorder.computed == [4]
+    assert recorder.applied == [(4, 40)]
+    assert not scheduler.is_busy()
+
+
+def test_request_during_compute_supersedes_result():
+    """Результат устаревшего запроса отбрасывается, новый запускается после потока"""
+    started, release = threading.Event(), threading.Event()
+    cancelled = []
+
+    def compute(params, is_cancelled):
+        if params == 'old':
+            started.set()
+            release.wait(5)
+            cancelled.append(is_cancelled())
+        return params
+
+    root, recorder = FakeRoot(), Recorder(compute)
+    scheduler = make_scheduler(recorder, root)
+    scheduler.request('old')
+    root.advance(40)
+    assert started.wait(5)
+
+    scheduler.request('new')
+    root.advance(100)
+    # Пока поток занят, новый запрос ждет
+    assert recorder.computed == ['old']
+    release.set()
+    root.run_until_idle()
+
+    assert cancelled == [True]
+    assert recorder.computed == ['old', 'new']
+    assert recorder.applied == [('new', 'new')]
+
+
+def test_error_and_cancel():
+    def compute(params, is_cancelled):
+        raise RuntimeError(params)
+
+    root, recorder = FakeRoot(), Recorder(compute)
+    scheduler = make_scheduler(recorder, root)
+    scheduler.request('bad')
+    root.run_until_idle()
+    assert [str(e) for e in recorder.errors] == ['bad']
+    assert recorder.applied == []
+
+    root, recorder = FakeRoot(), Recorder()
+    scheduler = make_scheduler(recorder, root)
+    scheduler.request(1)
+    scheduler.cancel()
+    root.run_until_idle()
+    assert recorder.computed == [] and recorder.applied == []
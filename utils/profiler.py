@@ -0,0 +1,285 @@
+"""
+Замер времени и памяти по этапам работы программы.
+
+Этапы (чтение файла, прореживание, срез, интерполяция, изотермы,
+отрисовка) размечаются в коде так:
+
+    with profiler.stage("срез"):
+        ...
+    profiler.count("точек в срезе", len(slice_data))
+
+Действие пользователя (загрузка, обновление графика) размечается через
+profiler.operation: этапы внутри него собираются в разбивку, которую
+окно показывает в строке состояния. События этапов можно сохранить в
+формате Chrome trace (chrome://tracing, Perfetto) для разбора потом.
+
+По умолчанию замер выключен и stage/count почти ничего не стоят.
+Включение из окружения:
+    THERMAL_PROFILE=1       - время по этапам
+    THERMAL_PROFILE=memory  - время и память (tracemalloc, заметно медленнее)
+    THERMAL_TRACE=trace.json - сохранить события в файл при выходе
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+
+# Предельное число событий, хранимых для файла трассировки
+MAX_TRACE_EVENTS = 200_000
+
+
+class _NullContext:
+    """Пустой контекст для выключенного замера"""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class OperationRecord:
+    """
+    Разбивка одного действия по этапам.
+
+    Действие может выполняться по частям в разных потоках (срез в
+    рабочем потоке, отрисовка в главном) - тогда время частей
+    суммируется. stages - {имя: [секунды, вызовы, вложенность,
+    прирост памяти МБ]} в порядке первого вызова.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.stages = OrderedDict()
+        self.counters = OrderedDict()
+        self.peak_mb = None
+
+    def add_stage(self, name, seconds, depth, memory_mb=None):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = [0.0, 0, depth, None]
+        stage[0] += seconds
+        stage[1] += 1
+        stage[2] = min(stage[2], depth)
+        if memory_mb is not None:
+            stage[3] = (stage[3] or 0.0) + memory_mb
+
+    def add_count(self, name, value):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self):
+        """Одна строка: общее время и этапы верхнего уровня в мс"""
+        parts = [f"{name} {stage[0] * 1000:.0f}" for name, stage in self.stages.items() if stage[2] == 0]
+        other = self.seconds - sum(stage[0] for stage in self.stages.values() if stage[2] == 0)
+        if parts and other * 1000 >= 1:
+            parts.append(f"прочее {other * 1000:.0f}")
+        text = f"{self.name}: {self.seconds * 1000:.0f} мс"
+        if parts:
+            text += " (" + ", ".join(parts) + ")"
+        if self.peak_mb is not None:
+            text += f", пик памяти {self.peak_mb:.1f} МБ"
+        return text
+
+    def report(self):
+        """Подробная разбивка с вложенными этапами и счетчиками"""
+        lines = [f"{self.name}: {self.seconds * 1000:.1f} мс"]
+        for name, (seconds, calls, depth, memory_mb) in self.stages.items():
+            line = f"  {'  ' * depth}{name}: {seconds * 1000:.1f} мс"
+            if calls > 1:
+                line += f" ({calls} раз)"
+            if memory_mb is not None:
+                line += f", память {memory_mb:+.1f} МБ"
+            lines.append(line)
+        for name, value in self.counters.items():
+            lines.append(f"  {name}: {value}")
+        if self.peak_mb is not None:
+            lines.append(f"  пик памяти: {self.peak_mb:.1f} МБ")
+        return "\n".join(lines)
+
+
+class _Stage:
+    """Контекст этапа при включенном замере"""
+
+    __slots__ = ('profiler', 'name', 'category', 'start', 'memory')
+
+    def __init__(self, profiler, name, category):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        state = self.profiler._state()
+        state.depth += 1
+        self.memory = tracemalloc.get_traced_memory()[0] if self.profiler.memory else None
+        self.start = time.perf_counter_ns()
+        return None
+
+    def __exit__(self, exc_type, exc, traceback):
+        end = time.perf_counter_ns()
+        state = self.profiler._state()
+        state.depth -= 1
+
+        memory_mb = None
+        if self.memory is not None and tracemalloc.is_tracing():
+            memory_mb = (tracemalloc.get_traced_memory()[0] - self.memory) / (1024 * 1024)
+        if state.operation is not None:
+            state.operation.add_stage(self.name, (end - self.start) / 1e9, state.depth - state.base_depth,
+                                      memory_mb)
+        self.profiler._add_event(self.name, self.category, self.start, end)
+        return False
+
+
+class _Operation:
+    """Контекст действия (или его части) при включенном замере"""
+
+    __slots__ = ('profiler', 'record', 'start', 'previous')
+
+    def __init__(self, profiler, record):
+        self.profiler = profiler
+        self.record = record
+
+    def __enter__(self):
+        state = self.profiler._state()
+        self.previous = (state.operation, state.base_depth)
+        state.operation = self.record
+        state.base_depth = state.depth
+        if self.profiler.memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter_ns()
+        return self.record
+
+    def __exit__(self, exc_type, exc, traceback):
+        end = time.perf_counter_ns()
+        state = self.profiler._state()
+        state.operation, state.base_depth = self.previous
+
+        record = self.record
+        record.seconds += (end - self.start) / 1e9
+        if self.profiler.memory and tracemalloc.is_tracing():
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            record.peak_mb = max(record.peak_mb or 0.0, peak_mb)
+        self.profiler._add_event(record.name, 'operation', self.start, end, dict(record.counters))
+        if state.operation is None:
+            self.profiler.last_operation = record
+        return False
+
+
+class Profiler:
+    """
+    Таймеры и счетчики этапов с разбивкой по действиям пользователя.
+
+    Вложенность этапов и текущее действие хранятся отдельно для каждого
+    потока. Пока замер выключен, stage и operation возвращают общий
+    пустой контекст, а count сразу возвращается.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.last_operation = None
+        self._events = deque(maxlen=MAX_TRACE_EVENTS)
+        self._threads = {}
+        self._local = threading.local()
+        self._origin = time.perf_counter_ns()
+
+    def enable(self, memory=False):
+        """Включение замера; memory=True - еще и прирост памяти по этапам"""
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.memory = False
+
+    def reset(self):
+        """Удаление накопленных событий и последней разбивки"""
+        self._events.clear()
+        self.last_operation = None
+
+    def stage(self, name, category='stage'):
+        """Контекст этапа: время (и память) записываются в текущее действие"""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _Stage(self, name, category)
+
+    def operation(self, name, record=None):
+        """
+        Контекст действия пользователя. Возвращает OperationRecord (или
+        None при выключенном замере); его можно передать в operation
+        другого потока, чтобы продолжить то же действие.
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _Operation(self, record if record is not None else OperationRecord(name))
+
+    def count(self, name, value=1):
+        """Прибавление к счетчику текущего действия"""
+        if not self.enabled:
+            return
+        operation = self._state().operation
+        if operation is not None:
+            operation.add_count(name, value)
+
+    def last_summary(self):
+        """Разбивка последнего завершенного действия одной строкой или None"""
+        if not self.enabled or self.last_operation is None:
+            return None
+        return self.last_operation.summary()
+
+    def save_trace(self, file_path):
+        """Запись событий в JSON формата Chrome trace event"""
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in self._threads.items()]
+        for name, category, start, end, tid, args in list(self._events):
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start - self._origin) / 1000,
+                'dur': (end - start) / 1000,
+                'pid': pid,
+                'tid': tid
+            }
+            if args:
+                event['args'] = args
+            events.append(event)
+
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file, ensure_ascii=False)
+        print(f"Трассировка сохранена в {file_path}: {len(events)} событий")
+
+    def _state(self):
+        state = self._local
+        if not hasattr(state, 'depth'):
+            state.depth = 0
+            state.base_depth = 0
+            state.operation = None
+        return state
+
+    def _add_event(self, name, category, start, end, args=None):
+        thread = threading.current_thread()
+        if thread.ident not in self._threads:
+            self._threads[thread.ident] = thread.name
+        self._events.append((name, category, start, end, thread.ident, args))
+
+
+profiler = Profiler()
+
+_mode = os.environ.get('THERMAL_PROFILE', '')
+_trace_path = os.environ.get('THERMAL_TRACE')
+if _mode or _trace_path:
+    profiler.enable(memory=_mode == 'memory')
+if _trace_path:
+    atexit.register(profiler.save_trace, _trace_path)
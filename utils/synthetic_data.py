@@ -0,0 +1,141 @@
+"""
+Генерация синтетических температурных полей для проверки масштабирования.
+
+Запуск из корня проекта:
+    python -m utils.synthetic_data out.dat --points 1e6 --kind structured
+    python -m utils.synthetic_data out.csv --points 1e7 --kind scattered
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+# Число точек, которые генерируются и записываются за один раз
+GENERATOR_CHUNK_POINTS = 1_000_000
+
+# Через сколько строк данных в DAT файл вставляется новая зона
+DAT_ZONE_LINES = 250_000
+
+
+class SyntheticDataGenerator:
+    """
+    Синтетические поля температуры T(x, y, z) от 1e4 до 1e8 точек.
+
+    kind='structured' - решетка со сдвигом четных рядов по X на полшага,
+    как в FileUtils.create_example_csv; kind='scattered' - случайные точки
+    в том же объеме. Поле гладкое (волны и вертикальный градиент) с
+    небольшим шумом, поэтому изотермы на срезах осмысленны.
+    Точки генерируются блоками, чтобы большие файлы писались без
+    размещения всех точек в памяти.
+    """
+
+    def __init__(self, extent=(100.0, 100.0, 50.0), seed=0):
+        self.extent = extent
+        self.seed = seed
+
+    def temperature(self, x, y, z, rng):
+        """Температура в точках"""
+        lx, ly, lz = self.extent
+        T = (-10.0
+             + 5.0 * np.sin(2 * np.pi * x / lx * 3) * np.cos(2 * np.pi * y / ly * 2)
+             - 8.0 * z / lz
+             + rng.normal(0.0, 0.1, len(x)))
+        return T
+
+    def lattice_shape(self, num_points):
+        """Размеры решетки с числом узлов не меньше num_points и шагом, близким к равному"""
+        lx, ly, lz = self.extent
+        step = (lx * ly * lz / num_points) ** (1 / 3)
+        shape = [max(1, int(round(length / step))) for length in self.extent]
+        while shape[0] * shape[1] * shape[2] < num_points:
+            shape[int(np.argmin([s / length for s, length in zip(shape, self.extent)]))] += 1
+        return tuple(shape)
+
+    def iter_chunks(self, num_points, kind='structured', chunk_points=GENERATOR_CHUNK_POINTS):
+        """Генератор блоков DataFrame с колонками x, y, z, T"""
+        rng = np.random.default_rng(self.seed)
+        lx, ly, lz = self.extent
+
+        if kind == 'structured':
+            nx, ny, nz = self.lattice_shape(num_points)
+            dx, dy, dz = lx / nx, ly / ny, lz / nz
+        elif kind != 'scattered':
+            raise ValueError(f"Неизвестный тип данных: {kind}")
+
+        for start in range(0, num_points, chunk_points):
+            count = min(chunk_points, num_points - start)
+            if kind == 'structured':
+                # Узлы по порядку: X меняется быстрее всего, как в выводе решателя
+                node = np.arange(start, start + count, dtype=np.int64)
+                i = node % nx
+                j = (node // nx) % ny
+                k = node // (nx * ny)
+                x = (i + 0.5 * (j % 2)) * dx
+                y = j * dy
+                z = k * dz
+            else:
+                x = rng.uniform(0, lx, count)
+                y = rng.uniform(0, ly, count)
+                z = rng.uniform(0, lz, count)
+            yield pd.DataFrame({'x': x, 'y': y, 'z': z, 'T': self.temperature(x, y, z, rng)})
+
+    def generate(self, num_points, kind='structured'):
+        """Все точки одним DataFrame"""
+        return pd.concat(list(self.iter_chunks(num_points, kind)), ignore_index=True)
+
+    def write_csv(self, file_path, num_points, kind='structured', chunk_points=GENERATOR_CHUNK_POINTS):
+        """Запись CSV файла с заголовком x,y,z,T"""
+        with open(file_path, 'w', encoding='utf-8', newline='') as file:
+            file.write("x,y,z,T\n")
+            for chunk in self.iter_chunks(num_points, kind, chunk_points):
+                chunk.to_csv(file, header=False, index=False, float_format='%.6f')
+        print(f"Создан CSV файл {file_path}: {num_points} точек ({kind})")
+
+    def write_dat(self, file_path, num_points, kind='structured', chunk_points=GENERATOR_CHUNK_POINTS,
+                  header_noise=True):
+        """
+        Запись DAT файла в формате вывода решателя (Tecplot POINT).
+
+        При header_noise=True в файле есть заголовок TITLE/VARIABLES,
+        строки зон через каждые DAT_ZONE_LINES строк данных, комментарии
+        и пустые строки - их загрузчик должен пропускать. Зона начинается
+        не реже чем через DAT_ZONE_LINES строк.
+        """
+        with open(file_path, 'w', encoding='utf-8', newline='\n') as file:
+            if header_noise:
+                file.write('TITLE = "Synthetic temperature field"\n')
+                file.write('VARIABLES = "X" "Y" "Z" "T"\n')
+            zone = 0
+            for chunk in self.iter_chunks(num_points, kind, chunk_points):
+                values = chunk.to_numpy()
+                for start in range(0, len(values), DAT_ZONE_LINES):
+                    part = values[start:start + DAT_ZONE_LINES]
+                    if header_noise:
+                        zone += 1
+                        file.write(f'\n# zone {zone}\n')
+                        file.write(f'ZONE T="zone {zone}", I={len(part)}, F=POINT\n')
+                    np.savetxt(file, part, fmt='%.6f', delimiter=' ')
+        print(f"Создан DAT файл {file_path}: {num_points} точек ({kind})")
+
+    def write(self, file_path, num_points, kind='structured'):
+        """Запись файла в формате по расширению (.csv или .dat)"""
+        if file_path.endswith('.csv'):
+            self.write_csv(file_path, num_points, kind)
+        elif file_path.endswith('.dat'):
+            self.write_dat(file_path, num_points, kind)
+        else:
+            raise ValueError(f"Неподдерживаемый формат файла: {file_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('file_path', help='файл .csv или .dat')
+    parser.add_argument('--points', type=float, default=1e6, help='число точек (1e4 - 1e8)')
+    parser.add_argument('--kind', choices=['structured', 'scattered'], default='structured')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    SyntheticDataGenerator(seed=args.seed).write(args.file_path, int(args.points), args.kind)
+
+
+if __name__ == "__main__":
+    main()
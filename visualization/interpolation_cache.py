@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+
+# Число интерполированных сеток и триангуляций, хранимых в кэше
+DEFAULT_MAX_GRIDS = 32
+DEFAULT_MAX_TRIANGULATIONS = 8
+
+
+class InterpolationCache:
+    """
+    Кэш интерполяции для изотерм.
+
+    Хранит интерполированные сетки (Xi, Yi, Zi) и триангуляции Делоне
+    точек среза. Ключ триангуляции - (версия данных, ось, значение среза,
+    погрешность), ключ сетки - тот же плюс размер сетки. Давно не
+    использованные записи вытесняются (LRU). Доступ потокобезопасен,
+    так как срезы готовятся и в фоновом потоке.
+    """
+
+    def __init__(self, max_grids=DEFAULT_MAX_GRIDS, max_triangulations=DEFAULT_MAX_TRIANGULATIONS):
+        self.max_grids = max_grids
+        self.max_triangulations = max_triangulations
+        self._grids = OrderedDict()
+        self._triangulations = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(version, axis, value, tolerance):
+        """Ключ среза"""
+        return (version, axis, float(value), float(tolerance))
+
+    def get_grid(self, slice_key, grid_size):
+        """Интерполированная сетка или None"""
+        return self._get(self._grids, (*slice_key, int(grid_size)))
+
+    def put_grid(self, slice_key, grid_size, grid):
+        self._put(self._grids, (*slice_key, int(grid_size)), grid, self.max_grids)
+
+    def get_triangulation(self, slice_key):
+        """Триангуляция точек среза или None"""
+        return self._get(self._triangulations, slice_key)
+
+    def put_triangulation(self, slice_key, triangulation):
+        self._put(self._triangulations, slice_key, triangulation, self.max_triangulations)
+
+    def clear(self):
+        """Очистка кэша"""
+        with self._lock:
+            self._grids.clear()
+            self._triangulations.clear()
+
+    def _get(self, storage, key):
+        with self._lock:
+            if key in storage:
+                storage.move_to_end(key)
+                self.hits += 1
+                return storage[key]
+            self.misses += 1
+            return None
+
+    def _put(self, storage, key, value, max_entries):
+        with self._lock:
+            storage[key] = value
+            storage.move_to_end(key)
+            while len(storage) > max_entries:
+                storage.popitem(last=False)
@@ -1,21 +1,48 @@
 import matplotlib.pyplot as plt
-import matplotlib
 import numpy as np
-from scipy.interpolate import griddata
+import pandas as pd
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+from data.data_summary import DataSummary
+from data.plane_sampler import DEFAULT_NEIGHBORS, plane_origin, plane_polygon
+from data.slice_index import SliceIndex
+from visualization.interpolation_cache import InterpolationCache
+from visualization.point_lod import PointLOD, DEFAULT_POINT_BUDGET, NEAR_WIDTH
 from visualization.plot_utils import PlotUtils
+from utils.profiler import profiler
+
+# Названия методов интерполированного среза для заголовков
+METHOD_NAMES = {'nearest': 'ближайшая точка', 'idw': 'ОВР'}
+
 
 class Plot3D:
-    def __init__(self):
+    def __init__(self, grid_size=100, point_budget=DEFAULT_POINT_BUDGET):
         self.plot_utils = PlotUtils()
+        # Размер сетки интерполяции изотерм и кэш интерполяции по срезам
+        self.grid_size = grid_size
+        self.interpolation_cache = InterpolationCache()
+        # Число точек 3D scatter за кадр и уровни детализации текущих данных
+        self.point_budget = point_budget
+        self._lod = None
     
     def create_3d_plot_with_slice(self, data: pd.DataFrame, slice_params: dict, 
-                                  show_isotherms=True, num_isotherms=10):
-        """Создание нового 3D графика и среза в одном окне"""
-        if not self.plot_utils.validate_data(data):
+                                  show_isotherms=True, num_isotherms=10, slice_index: SliceIndex = None,
+                                  summary: DataSummary = None, interactive=True):
+        """
+        Создание нового 3D графика и среза в одном окне.
+
+        interactive=False - фигура без окна и обработчиков мыши (для
+        сохранения в файл на бэкенде Agg).
+        """
+        if not self.plot_utils.validate_data(data, summary):
             raise ValueError("Некорректные данные для построения графика")
+
+        # Индекс срезов строится один раз на набор данных
+        if slice_index is None or slice_index.data is not data:
+            slice_index = SliceIndex(data)
         
         # Включение интерактивного режима
-        plt.ion()
+        if interactive:
+            plt.ion()
         
         # Создание фигуры с двумя подграфиками
         fig = plt.figure(figsize=(15, 6))
@@ -29,24 +56,51 @@ class Plot3D:
         fig.num_isotherms = num_isotherms
         
         # Создаем первоначальные графики
-        self._update_3d_plot(ax1, data, slice_params)
-        self._update_slice_plot(ax2, data, slice_params, show_isotherms, num_isotherms)
+        self._update_3d_plot(ax1, data, slice_params, summary)
+        self._update_slice_plot(ax2, data, slice_params, show_isotherms, num_isotherms, slice_index)
         
-        plt.tight_layout()
-        plt.show()
+        with profiler.stage("компоновка"):
+            plt.tight_layout()
+        if interactive:
+            plt.show()
+            
+            # Пока 3D график вращают, рисуем грубый уровень детализации
+            fig.canvas.mpl_connect('button_press_event', lambda event: self._on_rotate_start(fig, event))
+            fig.canvas.mpl_connect('button_release_event', lambda event: self._on_rotate_end(fig, event))
         
         # Сохраняем информацию о фигуре для последующего обновления
         fig.slices_axes = (ax1, ax2)
         fig.slice_params = slice_params.copy()
         fig.data = data
+        fig.slice_index = slice_index
         
         return fig
     
     def update_3d_plot_with_slice(self, fig, data: pd.DataFrame, slice_params: dict, 
-                                  show_isotherms=None, num_isotherms=None):
-        """Обновление существующего графика со срезом"""
+                                  show_isotherms=None, num_isotherms=None, slice_index: SliceIndex = None,
+                                  prepared: dict = None, full_redraw=False, summary: DataSummary = None,
+                                  redraw=True):
+        """
+        Обновление существующего графика со срезом.
+
+        prepared - результат prepare_slice, посчитанный заранее (например,
+        в фоновом потоке); тогда здесь выполняется только отрисовка.
+
+        Пока набор данных не изменился, 3D scatter и цветовая шкала
+        сохраняются: перемещается только плоскость среза, а точки 2D
+        среза и изотермы обновляются на месте. Полная перестройка
+        выполняется при смене данных или при full_redraw=True.
+
+        redraw=False - только обновить объекты графика, не перерисовывая
+        холст (например, перед сохранением фигуры в файл).
+        """
         if not fig or not hasattr(fig, 'slices_axes'):
-            return self.create_3d_plot_with_slice(data, slice_params, show_isotherms, num_isotherms)
+            return self.create_3d_plot_with_slice(data, slice_params, show_isotherms, num_isotherms,
+                                                  slice_index, summary)
+
+        # Переиспользуем индекс срезов, пока набор данных не изменился
+        if slice_index is None or slice_index.data is not data:
+            slice_index = fig.slice_index if fig.slice_index.data is data else SliceIndex(data)
         
         # Обновляем настройки изотерм если переданы
         if show_isotherms is not None:
@@ -54,25 +108,98 @@ class Plot3D:
         if num_isotherms is not None:
             fig.num_isotherms = num_isotherms
         
-        # Очищаем предыдущие графики
         ax1, ax2 = fig.slices_axes
-        ax1.clear()
-        ax2.clear()
+        full_redraw = full_redraw or data is not fig.data
+        if full_redraw:
+            # Очищаем предыдущие графики
+            ax1.clear()
+            ax2.clear()
+            ax2.slice_scatter = None
+            ax2.slice_image = None
+            ax2.isotherm_sets = []
+            ax2.empty_text = None
+            self._update_3d_plot(ax1, data, slice_params, summary)
+        else:
+            # Данные те же: переносим только плоскость среза
+            self._move_slice_plane(ax1, slice_params)
         
-        # Обновляем графики
-        self._update_3d_plot(ax1, data, slice_params)
-        self._update_slice_plot(ax2, data, slice_params, fig.show_isotherms, fig.num_isotherms)
+        self._update_slice_plot(ax2, data, slice_params, fig.show_isotherms, fig.num_isotherms, slice_index,
+                                prepared)
         
         # Обновляем параметры
         fig.slice_params = slice_params.copy()
         fig.data = data
+        fig.slice_index = slice_index
         
         # Перерисовываем фигуру
-        fig.canvas.draw()
+        if not redraw:
+            fig.blit_background = None
+            return
+        if full_redraw:
+            fig.blit_background = None
+            self._draw(fig)
+        else:
+            with profiler.stage("отрисовка"):
+                self._blit_slice_update(fig)
         fig.canvas.flush_events()
+
+    def _draw(self, fig):
+        """
+        Полная перерисовка холста. Обычно откладывается до простоя главного
+        цикла; при включенном замере выполняется сразу, чтобы время
+        отрисовки попало в разбивку действия.
+        """
+        if profiler.enabled:
+            with profiler.stage("отрисовка"):
+                fig.canvas.draw()
+        else:
+            fig.canvas.draw_idle()
+
+    def _blit_slice_update(self, fig):
+        """
+        Отрисовка только изменившихся частей: плоскости среза, заголовка
+        3D графика и 2D среза.
+
+        Фон (фигура без этих частей) рисуется один раз и сохраняется; он
+        перерисовывается заново только при изменении вида 3D графика
+        (поворот, масштаб) или размера окна.
+        """
+        canvas = fig.canvas
+        if not getattr(canvas, 'supports_blit', False):
+            canvas.draw_idle()
+            return
+
+        ax1, ax2 = fig.slices_axes
+        dynamic = [ax1.slice_plane, ax1.title, ax2]
+        if getattr(ax2, 'colorbar', None) is not None:
+            dynamic.append(ax2.colorbar.ax)
+
+        view_state = (ax1.elev, ax1.azim, getattr(ax1, 'roll', 0),
+                      ax1.get_xlim3d(), ax1.get_ylim3d(), ax1.get_zlim3d(),
+                      tuple(fig.bbox.bounds), fig.dpi, ax1.lod_state)
+
+        if getattr(fig, 'blit_background', None) is None or fig.blit_state != view_state:
+            for artist in dynamic:
+                artist.set_visible(False)
+            canvas.draw()
+            fig.blit_background = canvas.copy_from_bbox(fig.bbox)
+            fig.blit_state = view_state
+            for artist in dynamic:
+                artist.set_visible(True)
+        else:
+            canvas.restore_region(fig.blit_background)
+
+        # Плоскость проецируется с текущим видом 3D осей
+        ax1.slice_plane.do_3d_projection()
+        for artist in dynamic:
+            fig.draw_artist(artist)
+        canvas.blit(fig.bbox)
     
-    def _update_3d_plot(self, ax, data: pd.DataFrame, slice_params: dict):
+    def _update_3d_plot(self, ax, data: pd.DataFrame, slice_params: dict, summary: DataSummary = None):
         """Обновление 3D графика"""
+        if summary is not None and not summary.matches(data):
+            summary = None
+        
         # Используем pandas Series для доступа к данным
         x = data['x'].values
         y = data['y'].values
@@ -80,23 +207,36 @@ class Plot3D:
         T = data['T'].values
         
         # Расчет диапазона цветов
-        color_range = self.plot_utils.calculate_color_range(T)
+        color_range = self.plot_utils.calculate_color_range(T, summary)
+        
+        # Для больших наборов рисуем не больше point_budget точек за кадр
+        with profiler.stage("уровни детализации"):
+            ax.lod = self._get_lod(data)
+            ax.lod_state = None
+            if ax.lod is not None:
+                ax.lod_state = (slice_params['axis'], slice_params['value'], False)
+                x, y, z, T = ax.lod.select(self.point_budget, slice_params['axis'], slice_params['value'])
+        profiler.count("точек 3D", len(x))
         
         # Создание scatter plot
-        scatter = ax.scatter(x, y, z, c=T, cmap='viridis', s=20, alpha=0.6,
-                           vmin=color_range['vmin'], vmax=color_range['vmax'])
+        with profiler.stage("3D scatter"):
+            scatter = ax.scatter(x, y, z, c=T, cmap='viridis', s=20, alpha=0.6,
+                               vmin=color_range['vmin'], vmax=color_range['vmax'])
+        ax.scatter_artist = scatter
         
-        # Настройка 3D графика
-        axis = slice_params['axis']
-        value = slice_params['value']
+        # Границы данных нужны для плоскости среза при каждом обновлении
+        if summary is not None:
+            ax.data_bounds = {col: summary.range(col) for col in ['x', 'y', 'z']}
+        else:
+            ax.data_bounds = {col: (data[col].min(), data[col].max()) for col in ['x', 'y', 'z']}
+        ax.slice_plane = None
         
         # Добавление плоскости среза на 3D график
-        self._add_slice_plane(ax, data, axis, value)
+        self._move_slice_plane(ax, slice_params)
         
         ax.set_xlabel('X Axis')
         ax.set_ylabel('Y Axis')
         ax.set_zlabel('Z Axis')
-        ax.set_title(f'3D Scatter Plot\nСрез по {axis.upper()} = {value:.3f}')
         
         # Добавление цветовой шкалы
         if not hasattr(ax, 'colorbar') or ax.colorbar is None:
@@ -106,48 +246,278 @@ class Plot3D:
             # Обновляем существующую цветовую шкалу
             ax.colorbar.update_normal(scatter)
     
-    def _update_slice_plot(self, ax, data: pd.DataFrame, slice_params: dict, 
-                          show_isotherms=True, num_isotherms=10):
-        """Обновление 2D среза с изотермами"""
+    def prepare_slice(self, data: pd.DataFrame, slice_params: dict, show_isotherms=True,
+                      num_isotherms=10, slice_index: SliceIndex = None, is_cancelled=None):
+        """
+        Подготовка данных 2D среза без обращения к matplotlib.
+
+        Выполняет выборку точек среза и интерполяцию для изотерм, поэтому
+        может вызываться из фонового потока. is_cancelled - функция без
+        аргументов; если она вернула True, подготовка прерывается и
+        возвращается None.
+
+        При slice_params['mode'] == 'interpolated' вместо точек в полосе
+        погрешности температура интерполируется на сетку плоскости (см.
+        _prepare_interpolated_slice).
+        """
         axis = slice_params['axis']
         value = slice_params['value']
         tolerance = slice_params['tolerance']
+
+        if slice_index is None or slice_index.data is not data:
+            slice_index = SliceIndex(data)
+
+        if slice_params.get('mode') == 'interpolated':
+            return self._prepare_interpolated_slice(slice_params, show_isotherms, slice_index)
         
         # Создание 2D среза
-        slice_data = self._create_slice_data(data, axis, value, tolerance)
+        with profiler.stage("срез"):
+            slice_data = self._create_slice_data(data, axis, value, tolerance, slice_index)
+        profiler.count("точек в срезе", 0 if slice_data is None else len(slice_data))
+        prepared = {'slice_params': slice_params.copy(), 'slice_data': slice_data, 'grid': None}
+        if slice_data is None or len(slice_data) == 0:
+            return prepared
+
+        # Определяем координаты для графика в зависимости от оси среза
+        if axis == 'x':
+            x_coords = slice_data['y'].values
+            y_coords = slice_data['z'].values
+            x_label, y_label = 'Y Axis', 'Z Axis'
+        elif axis == 'y':
+            x_coords = slice_data['x'].values
+            y_coords = slice_data['z'].values
+            x_label, y_label = 'X Axis', 'Z Axis'
+        else:  # z
+            x_coords = slice_data['x'].values
+            y_coords = slice_data['y'].values
+            x_label, y_label = 'X Axis', 'Y Axis'
+
+        temperatures = slice_data['T'].values
+        prepared.update({
+            'x_coords': x_coords,
+            'y_coords': y_coords,
+            'temperatures': temperatures,
+            'labels': (x_label, y_label)
+        })
+
+        # Интерполяция для изотерм - самая затратная часть: берем ее из кэша,
+        # а при промахе проверяем отмену перед расчетом
+        if show_isotherms and len(temperatures) >= 10 and slice_index.grid is not None:
+            # Данные на решетке: изотермы строятся по слою без интерполяции
+            # (None для слоя с пустыми узлами - тогда интерполируем, как обычно)
+            prepared['grid'] = slice_index.grid.slice_plane(axis, value, tolerance)
+        if show_isotherms and len(temperatures) >= 10 and prepared['grid'] is None:
+            slice_key = self.interpolation_cache.make_key(slice_index.version, axis, value, tolerance)
+            grid = self.interpolation_cache.get_grid(slice_key, self.grid_size)
+            profiler.count("кэш интерполяции: попаданий", int(grid is not None))
+            if grid is None:
+                if is_cancelled is not None and is_cancelled():
+                    return None
+                try:
+                    with profiler.stage("интерполяция"):
+                        grid = self._create_interpolated_grid(x_coords, y_coords, temperatures,
+                                                              self.grid_size, slice_key)
+                    self.interpolation_cache.put_grid(slice_key, self.grid_size, grid)
+                except Exception as e:
+                    print(f"Ошибка при построении изотерм: {e}")
+            prepared['grid'] = grid
+
+        return prepared
+
+    def _prepare_interpolated_slice(self, slice_params: dict, show_isotherms, slice_index: SliceIndex):
+        """
+        Интерполированный срез: температура в узлах сетки grid_size x grid_size
+        на плоскости по KD-дереву индекса срезов. Плоскость проходит через
+        центр данных со значением value по оси axis; нормаль - вдоль оси
+        или slice_params['normal'] для наклонного среза.
+
+        Узлы с данными попадают в slice_data (колонки x, y, z, T), сама
+        сетка - в 'image' для отрисовки и в 'grid' для изотерм.
+        """
+        axis = slice_params['axis']
+        normal = self._slice_normal(slice_params)
+
+        # Дерево строится один раз на набор данных, дальше время среза
+        # зависит только от размера сетки
+        with profiler.stage("KD-дерево"):
+            slice_index.sampler.tree
+        with profiler.stage("интерполяция среза"):
+            sample = slice_index.sample_plane(axis, slice_params['value'], normal, self.grid_size,
+                                              slice_params.get('method', 'nearest'),
+                                              slice_params.get('k', DEFAULT_NEIGHBORS))
+
+        U, V, T = sample['U'], sample['V'], sample['T']
+        valid = ~np.isnan(T)
+        profiler.count("узлов среза", int(valid.sum()))
+        slice_data = pd.DataFrame({'x': sample['X'][valid], 'y': sample['Y'][valid],
+                                   'z': sample['Z'][valid], 'T': T[valid]})
+        if normal is None:
+            labels = tuple(f'{col.upper()} Axis' for col in ['x', 'y', 'z'] if col != axis)
+        else:
+            labels = ('U', 'V')
+
+        return {
+            'slice_params': slice_params.copy(),
+            'slice_data': slice_data,
+            'x_coords': U[valid],
+            'y_coords': V[valid],
+            'temperatures': T[valid],
+            'labels': labels,
+            'image': (U, V, T),
+            'grid': (U, V, T) if show_isotherms and valid.sum() >= 10 else None
+        }
+
+    @staticmethod
+    def _slice_normal(slice_params: dict):
+        """Нормаль наклонного среза или None для среза, перпендикулярного оси"""
+        if slice_params.get('mode') != 'interpolated':
+            return None
+        return slice_params.get('normal')
+
+    def _slice_title(self, slice_params: dict):
+        """Описание плоскости среза для заголовков"""
+        axis = slice_params['axis']
+        value = slice_params['value']
+        normal = self._slice_normal(slice_params)
+        if normal is None:
+            return f'Срез по {axis.upper()} = {value:.3f}'
+        return f'Срез через {axis.upper()} = {value:.3f}, n = ({normal[0]:g}, {normal[1]:g}, {normal[2]:g})'
+
+    def _move_slice_plane(self, ax, slice_params: dict):
+        """Перенос плоскости среза на 3D графике без перестройки scatter"""
+        axis = slice_params['axis']
+        value = slice_params['value']
+        normal = self._slice_normal(slice_params)
+
+        if getattr(ax, 'slice_plane', None) is not None:
+            # Пределы осей фиксированы после первой отрисовки и не должны
+            # расширяться вслед за каждым положением плоскости
+            ax.slice_plane.remove()
+            autoscale = ax.get_autoscale_on()
+            ax.set_autoscale_on(False)
+            ax.slice_plane = self._add_slice_plane(ax, None, axis, value, bounds=ax.data_bounds, normal=normal)
+            ax.set_autoscale_on(autoscale)
+        else:
+            ax.slice_plane = self._add_slice_plane(ax, None, axis, value, bounds=ax.data_bounds, normal=normal)
+        ax.set_title(f'3D Scatter Plot\n{self._slice_title(slice_params)}')
+
+        # Подробные точки следуют за плоскостью; выборку меняем, только
+        # когда плоскость ушла от нее на четверть ширины подробной области
+        if getattr(ax, 'lod', None) is not None and ax.scatter_artist is not None:
+            lod_axis, lod_value, _ = ax.lod_state
+            lo, hi = ax.lod.bounds[axis]
+            if lod_axis != axis or abs(lod_value - value) > NEAR_WIDTH * (hi - lo) / 4:
+                self._set_lod_points(ax, axis, value)
+
+    def _get_lod(self, data: pd.DataFrame):
+        """Уровни детализации для данных больше бюджета (строятся один раз на набор)"""
+        if len(data) <= self.point_budget:
+            return None
+        if self._lod is None or self._lod.data is not data:
+            self._lod = PointLOD(data)
+        return self._lod
+
+    def _set_lod_points(self, ax, axis, value, interactive=False):
+        """Замена точек 3D scatter на выборку уровней детализации"""
+        with profiler.stage("уровни детализации"):
+            x, y, z, T = ax.lod.select(self.point_budget, axis, value, interactive=interactive)
+        scatter = ax.scatter_artist
+        scatter.set_offsets(np.column_stack((x, y)))
+        scatter.set_array(T)
+        scatter.set_3d_properties(z, 'z')
+        ax.lod_state = (axis, value, interactive)
+
+    def _on_rotate_start(self, fig, event):
+        """Начало вращения 3D графика: переходим на грубый уровень"""
+        ax1 = fig.slices_axes[0]
+        if event.inaxes is ax1 and getattr(ax1, 'lod', None) is not None:
+            params = fig.slice_params
+            self._set_lod_points(ax1, params['axis'], params['value'], interactive=True)
+
+    def _on_rotate_end(self, fig, event):
+        """Вращение закончено: возвращаем подробную выборку"""
+        ax1 = fig.slices_axes[0]
+        if getattr(ax1, 'lod', None) is not None and ax1.lod_state[2]:
+            params = fig.slice_params
+            self._set_lod_points(ax1, params['axis'], params['value'])
+            self._draw(fig)
+
+    def _update_slice_plot(self, ax, data: pd.DataFrame, slice_params: dict, 
+                          show_isotherms=True, num_isotherms=10, slice_index: SliceIndex = None,
+                          prepared: dict = None):
+        """
+        Обновление 2D среза с изотермами.
+
+        Точки среза обновляются в существующем scatter через set_offsets и
+        set_array, изотермы предыдущего среза удаляются и строятся заново.
+        Интерполированный срез рисуется изображением сетки (imshow), которое
+        так же обновляется на месте.
+        """
+        # Создание 2D среза (если он не подготовлен заранее)
+        if prepared is None:
+            prepared = self.prepare_slice(data, slice_params, show_isotherms, num_isotherms, slice_index)
+        slice_data = prepared['slice_data']
+        image = prepared.get('image')
+        title = self._slice_title(slice_params)
+
+        # Убираем изотермы и надпись предыдущего среза
+        self._remove_isotherms(ax)
+        if getattr(ax, 'empty_text', None) is not None:
+            ax.empty_text.remove()
+            ax.empty_text = None
+        sc = getattr(ax, 'slice_scatter', None)
+        im = getattr(ax, 'slice_image', None)
         
         if slice_data is not None and len(slice_data) > 0:
-            # Определяем координаты для графика в зависимости от оси среза
-            if axis == 'x':
-                x_coords = slice_data['y'].values
-                y_coords = slice_data['z'].values
-                x_label, y_label = 'Y Axis', 'Z Axis'
-            elif axis == 'y':
-                x_coords = slice_data['x'].values
-                y_coords = slice_data['z'].values
-                x_label, y_label = 'X Axis', 'Z Axis'
-            else:  # z
-                x_coords = slice_data['x'].values
-                y_coords = slice_data['y'].values
-                x_label, y_label = 'X Axis', 'Y Axis'
-            
-            temperatures = slice_data['T'].values
+            x_coords = prepared['x_coords']
+            y_coords = prepared['y_coords']
+            x_label, y_label = prepared['labels']
+            temperatures = prepared['temperatures']
             
-            # Создаем scatter plot точек
-            sc = ax.scatter(x_coords, y_coords, c=temperatures, 
-                           cmap='viridis', s=30, alpha=0.8, edgecolors='black', linewidth=0.5)
+            if image is not None:
+                # Сетка плоскости: узлы без данных (NaN) остаются прозрачными
+                if sc is not None:
+                    sc.set_visible(False)
+                sc = self._set_slice_image(ax, *image)
+            elif sc is None:
+                # Создаем scatter plot точек
+                sc = ax.scatter(x_coords, y_coords, c=temperatures, 
+                               cmap='viridis', s=30, alpha=0.8, edgecolors='black', linewidth=0.5)
+                ax.slice_scatter = sc
+            else:
+                # Обновляем точки существующего scatter
+                offsets = np.column_stack((x_coords, y_coords))
+                sc.set_offsets(offsets)
+                sc.set_array(temperatures)
+                sc.set_clim(temperatures.min(), temperatures.max())
+                sc.set_visible(True)
+                ax.ignore_existing_data_limits = True
+                ax.update_datalim(offsets)
+                ax.autoscale_view()
+            if image is None and im is not None:
+                im.set_visible(False)
             
             # Добавляем изотермы если включено и достаточно точек
-            if show_isotherms and len(temperatures) >= 10:
-                self._add_isotherms(ax, x_coords, y_coords, temperatures, num_isotherms)
+            if show_isotherms and prepared['grid'] is not None:
+                with profiler.stage("изотермы"):
+                    self._add_isotherms(ax, x_coords, y_coords, temperatures, num_isotherms, prepared['grid'])
             
             ax.set_xlabel(x_label)
             ax.set_ylabel(y_label)
-            ax.set_title(f'2D Срез по {axis.upper()} = {value:.3f}\n'
-                         f'Точек в срезе: {len(slice_data)}')
+            if image is not None:
+                method = slice_params.get('method', 'nearest')
+                ax.set_title(f'2D {title} ({METHOD_NAMES.get(method, method)})\n'
+                             f'Узлов сетки с данными: {len(slice_data)}')
+            else:
+                ax.set_title(f'2D {title}\n'
+                             f'Точек в срезе: {len(slice_data)}')
             ax.grid(True, alpha=0.3)
             
-            # Цветовая шкала для среза
+            # Цветовая шкала для среза; при переходе между точками и сеткой
+            # шкала привязывается к другому объекту и создается заново
+            if getattr(ax, 'colorbar', None) is not None and ax.colorbar.mappable is not sc:
+                ax.colorbar.remove()
+                ax.colorbar = None
             if not hasattr(ax, 'colorbar') or ax.colorbar is None:
                 ax.colorbar = plt.colorbar(sc, ax=ax, shrink=0.8)
                 ax.colorbar.set_label('Temperature (T)')
@@ -155,33 +525,57 @@ class Plot3D:
                 ax.colorbar.update_normal(sc)
                 
         else:
-            ax.text(0.5, 0.5, 'Нет данных в выбранном срезе', 
-                    ha='center', va='center', transform=ax.transAxes)
-            ax.set_title(f'2D Срез по {axis.upper()} = {value:.3f}')
+            if sc is not None:
+                sc.set_visible(False)
+            if im is not None:
+                im.set_visible(False)
+            ax.empty_text = ax.text(0.5, 0.5, 'Нет данных в выбранном срезе', 
+                                    ha='center', va='center', transform=ax.transAxes)
+            ax.set_title(f'2D {title}')
             # Убираем цветовую шкалу если нет данных
             if hasattr(ax, 'colorbar') and ax.colorbar:
                 ax.colorbar.remove()
                 ax.colorbar = None
 
-    def _add_isotherms(self, ax, x, y, z, num_levels=10):
-        """Добавление изотерм (контурных линий) на график"""
+    def _set_slice_image(self, ax, U, V, T):
+        """Создание или обновление изображения интерполированной сетки"""
+        extent = (U[0, 0], U[0, -1], V[0, 0], V[-1, 0])
+        vmin, vmax = np.nanmin(T), np.nanmax(T)
+        im = getattr(ax, 'slice_image', None)
+        if im is None:
+            im = ax.imshow(T, origin='lower', extent=extent, aspect='auto', cmap='viridis',
+                           interpolation='nearest', vmin=vmin, vmax=vmax)
+            ax.slice_image = im
+        else:
+            # set_extent подгоняет пределы осей под новую сетку
+            ax.ignore_existing_data_limits = True
+            im.set_data(T)
+            im.set_extent(extent)
+            im.set_clim(vmin, vmax)
+            im.set_visible(True)
+        return im
+
+    def _remove_isotherms(self, ax):
+        """Удаление изотерм (вместе с подписями) с графика"""
+        for contour_set in getattr(ax, 'isotherm_sets', []):
+            contour_set.remove()
+        ax.isotherm_sets = []
+
+    def _add_isotherms(self, ax, x, y, z, num_levels=10, grid=None):
+        """
+        Добавление изотерм (контурных линий) на график.
+
+        grid - заранее интерполированная сетка (Xi, Yi, Zi); если не задана,
+        интерполяция выполняется здесь же.
+        """
         try:
             # Очищаем предыдущие контуры
-            for collection in ax.collections:
-                if isinstance(collection, matplotlib.collections.PathCollection):
-                    continue  # Пропускаем scatter точки
-                collection.remove()
+            self._remove_isotherms(ax)
             
-            for line in ax.lines:
-                line.remove()
-            
-            # Создаем регулярную сетку для интерполяции
-            xi = np.linspace(min(x), max(x), 100)
-            yi = np.linspace(min(y), max(y), 100)
-            Xi, Yi = np.meshgrid(xi, yi)
-            
-            # Интерполируем значения температуры на сетку
-            Zi = griddata((x, y), z, (Xi, Yi), method='linear', fill_value=np.nan)
+            # Интерполируем значения температуры на регулярную сетку
+            if grid is None:
+                grid = self._create_interpolated_grid(x, y, z)
+            Xi, Yi, Zi = grid
             
             # Убираем NaN значения для корректного построения контуров
             if np.any(~np.isnan(Zi)):
@@ -200,54 +594,89 @@ class Plot3D:
                 if labels:
                     for txt in labels:
                         txt.set_fontweight('bold')
+
+                # Запоминаем контуры, чтобы заменить их при следующем обновлении
+                ax.isotherm_sets = [contourf, contours]
                 
         except Exception as e:
             print(f"Ошибка при построении изотерм: {e}")
             # В случае ошибки просто рисуем точки без изотерм
     
-    def _create_interpolated_grid(self, x, y, z, grid_size=100):
-        """Создание интерполированной сетки для изотерм"""
+    def _create_interpolated_grid(self, x, y, z, grid_size=100, slice_key=None):
+        """
+        Создание интерполированной сетки для изотерм.
+
+        Линейная интерполяция по триангуляции Делоне (как griddata с
+        method='linear'); при заданном slice_key триангуляция берется из
+        кэша или сохраняется в него.
+        """
+        # scipy нужен только для изотерм, поэтому загружается при первом построении
+        from scipy.interpolate import LinearNDInterpolator
+        from scipy.spatial import Delaunay
+
         # Создаем регулярную сетку
         xi = np.linspace(np.min(x), np.max(x), grid_size)
         yi = np.linspace(np.min(y), np.max(y), grid_size)
         Xi, Yi = np.meshgrid(xi, yi)
+
+        triangulation = None
+        if slice_key is not None:
+            triangulation = self.interpolation_cache.get_triangulation(slice_key)
+        if triangulation is None:
+            triangulation = Delaunay(np.column_stack((x, y)))
+            if slice_key is not None:
+                self.interpolation_cache.put_triangulation(slice_key, triangulation)
         
         # Интерполируем значения на сетку
-        Zi = griddata((x, y), z, (Xi, Yi), method='linear')
+        Zi = LinearNDInterpolator(triangulation, z)(Xi, Yi)
         
         return Xi, Yi, Zi
     
-    def _add_slice_plane(self, ax, data: pd.DataFrame, axis: str, value: float, alpha=0.2):
-        """Добавление плоскости среза на 3D график"""
-        x_min, x_max = data['x'].min(), data['x'].max()
-        y_min, y_max = data['y'].min(), data['y'].max()
-        z_min, z_max = data['z'].min(), data['z'].max()
+    def _add_slice_plane(self, ax, data: pd.DataFrame, axis: str, value: float, alpha=0.2, bounds: dict = None,
+                         normal=None):
+        """
+        Добавление плоскости среза на 3D график.
+
+        bounds - заранее посчитанные границы {'x': (min, max), ...}; если не
+        заданы, считаются по data. normal - нормаль наклонной плоскости,
+        проходящей через центр данных со значением value по оси axis.
+        Возвращает созданную поверхность (для наклонной плоскости -
+        многоугольник Poly3DCollection).
+        """
+        if bounds is None:
+            bounds = {col: (data[col].min(), data[col].max()) for col in ['x', 'y', 'z']}
+        if normal is not None:
+            # Наклонная плоскость рисуется сечением параллелепипеда данных,
+            # чтобы не выходить за его пределы и не расширять оси
+            polygon = plane_polygon(bounds, plane_origin(bounds, axis, value), normal)
+            plane = Poly3DCollection([polygon] if len(polygon) else [], alpha=alpha, facecolor='red')
+            ax.add_collection3d(plane)
+            return plane
+        x_min, x_max = bounds['x']
+        y_min, y_max = bounds['y']
+        z_min, z_max = bounds['z']
         
         if axis == 'x':
             # Плоскость YZ при фиксированном X
             yy, zz = np.meshgrid([y_min, y_max], [z_min, z_max])
             xx = np.full_like(yy, value)
-            ax.plot_surface(xx, yy, zz, alpha=alpha, color='red')
+            return ax.plot_surface(xx, yy, zz, alpha=alpha, color='red')
         elif axis == 'y':
             # Плоскость XZ при фиксированном Y
             xx, zz = np.meshgrid([x_min, x_max], [z_min, z_max])
             yy = np.full_like(xx, value)
-            ax.plot_surface(xx, yy, zz, alpha=alpha, color='red')
+            return ax.plot_surface(xx, yy, zz, alpha=alpha, color='red')
         else:  # z
             # Плоскость XY при фиксированном Z
             xx, yy = np.meshgrid([x_min, x_max], [y_min, y_max])
             zz = np.full_like(xx, value)
-            ax.plot_surface(xx, yy, zz, alpha=alpha, color='red')
+            return ax.plot_surface(xx, yy, zz, alpha=alpha, color='red')
     
     def _create_slice_data(self, data: pd.DataFrame, axis: str, value: float, 
-                          tolerance=0.1) -> pd.DataFrame:
+                          tolerance=0.1, slice_index: SliceIndex = None) -> pd.DataFrame:
         """Создание данных для среза с заданной точностью"""
-        if axis == 'x':
-            mask = np.abs(data['x'] - value) <= tolerance
-        elif axis == 'y':
-            mask = np.abs(data['y'] - value) <= tolerance
-        else:  # z
-            mask = np.abs(data['z'] - value) <= tolerance
+        if slice_index is None or slice_index.data is not data:
+            slice_index = SliceIndex(data)
         
-        # Возвращаем DataFrame с отфильтрованными строками
-        return data[mask].copy()
\ No newline at end of file
+        # Возвращаем DataFrame только с точками среза
+        return slice_index.get_slice_data(axis, value, tolerance)
@@ -15,11 +15,21 @@ class PlotUtils:
         plt.ioff()
         
     @staticmethod
-    def calculate_color_range(temperatures: List[float]) -> Dict[str, float]:
-        """Расчет оптимального диапазона цветов для визуализации"""
-        T_min = min(temperatures)
-        T_max = max(temperatures)
-        T_avg = np.mean(temperatures)
+    def calculate_color_range(temperatures: List[float] = None, summary=None) -> Dict[str, float]:
+        """
+        Расчет оптимального диапазона цветов для визуализации.
+
+        Если передана сводка по данным (DataSummary), значения берутся из нее
+        без прохода по температурам.
+        """
+        if summary is not None and summary.valid:
+            T_min, T_max = summary.range('T')
+            T_avg = summary.columns['T']['mean']
+        else:
+            temperatures = np.asarray(temperatures)
+            T_min = temperatures.min()
+            T_max = temperatures.max()
+            T_avg = temperatures.mean()
         
         # Настройка диапазона цветов для лучшей визуализации
         vmin = T_avg - 2 * (T_avg - T_min) / 10
@@ -47,9 +57,13 @@ class PlotUtils:
         }
     
     @staticmethod
-    def validate_data(df: pd.DataFrame) -> bool:
+    def validate_data(df: pd.DataFrame, summary=None) -> bool:
         """Проверка корректности данных для построения графика"""
         
+        # Сводка уже содержит результат полной проверки этих данных
+        if summary is not None and summary.matches(df):
+            return summary.valid
+        
         # Проверяем, что передан DataFrame
         if not isinstance(df, pd.DataFrame):
             return False
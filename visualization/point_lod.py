@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+AXES = ['x', 'y', 'z']
+
+# Число точек, которое 3D scatter рисует за один кадр
+DEFAULT_POINT_BUDGET = 50000
+
+# Доля бюджета для вращения: пока мышь зажата, рисуется грубый уровень
+INTERACTIVE_FRACTION = 0.2
+
+# Доля бюджета для точек вблизи плоскости среза
+NEAR_FRACTION = 0.5
+
+# Полуширина области вблизи плоскости среза (доля размаха данных по оси)
+NEAR_WIDTH = 0.05
+
+# Глубина октодерева: 2**MAX_DEPTH ячеек по каждой оси
+MAX_DEPTH = 10
+
+
+def _spread_bits(v):
+    """Раздвигает 10 младших битов v так, чтобы между ними было по два нуля"""
+    v = v.astype(np.uint64)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x030000FF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x0300F00F)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x030C30C3)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x09249249)
+    return v
+
+
+class PointLOD:
+    """
+    Уровни детализации облака точек для 3D scatter (октодерево).
+
+    Точки один раз сортируются по коду Мортона; ячейки уровня L - это
+    группы точек с общим префиксом кода длиной 3*L бит, поэтому каждый
+    уровень получается одним проходом по отсортированному массиву. Ячейка
+    отображается одной точкой: центроидом ее точек со средней температурой.
+    Уровни строятся лениво и кэшируются.
+
+    select() подбирает для кадра не больше budget точек: вблизи плоскости
+    среза - самый подробный уровень (вплоть до исходных точек), который
+    укладывается в свою долю бюджета, вдали от нее - более грубый. Уровни
+    отличаются в 8 раз, поэтому последний уровень прореживается до бюджета.
+    """
+
+    def __init__(self, data: pd.DataFrame, max_depth=MAX_DEPTH):
+        self.data = data
+        self.max_depth = max_depth
+
+        columns = [data[axis].to_numpy(dtype=np.float64) for axis in AXES]
+        self.bounds = {axis: (float(c.min()), float(c.max())) for axis, c in zip(AXES, columns)}
+
+        # Целочисленные координаты ячеек самого подробного уровня
+        cells = 1 << max_depth
+        code = np.zeros(len(data), dtype=np.uint64)
+        for shift, (axis, c) in enumerate(zip(AXES, columns)):
+            lo, hi = self.bounds[axis]
+            scale = cells / (hi - lo) if hi > lo else 0.0
+            cell = np.clip(((c - lo) * scale).astype(np.int64), 0, cells - 1)
+            code |= _spread_bits(cell) << np.uint64(2 - shift)
+
+        self._order = np.argsort(code, kind='stable')
+        self._code = code[self._order]
+        self._sorted = {axis: c[self._order] for axis, c in zip(AXES, columns)}
+        self._sorted['T'] = data['T'].to_numpy(dtype=np.float64)[self._order]
+        self._levels = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    def level(self, depth):
+        """Ячейки уровня depth: словарь x, y, z, T (центроиды и средние) и count"""
+        if depth not in self._levels:
+            prefix = self._code >> np.uint64(3 * (self.max_depth - depth))
+            starts = np.concatenate(([0], np.flatnonzero(prefix[1:] != prefix[:-1]) + 1))
+            counts = np.diff(np.append(starts, len(prefix)))
+            cells = {col: np.add.reduceat(values, starts) / counts for col, values in self._sorted.items()}
+            cells['count'] = counts
+            self._levels[depth] = cells
+        return self._levels[depth]
+
+    def _points(self, depth):
+        """Точки уровня; depth=None - исходные точки"""
+        return self._sorted if depth is None else self.level(depth)
+
+    def _depths(self):
+        """Уровни от грубого к подробному, последний - исходные точки"""
+        return list(range(1, self.max_depth + 1)) + [None]
+
+    def _fit(self, budget, mask):
+        """
+        Точки самого подробного уровня, укладывающиеся в budget.
+
+        mask(points) - отбор точек области. Берется первый уровень, у
+        которого в области больше budget точек, и прореживается равным
+        шагом: точки упорядочены по коду Мортона, поэтому прореженные
+        ячейки остаются равномерно распределенными по пространству.
+        """
+        for depth in self._depths():
+            points = self._points(depth)
+            index = np.flatnonzero(mask(points))
+            if len(index) > budget or depth is None:
+                break
+        if len(index) > budget:
+            step = -(-len(index) // max(budget, 1))
+            index = index[::step]
+        return {col: points[col][index] for col in AXES + ['T']}
+
+    def select(self, budget=DEFAULT_POINT_BUDGET, axis=None, value=None, interactive=False):
+        """
+        Точки для отрисовки: (x, y, z, T) не длиннее budget.
+
+        axis, value - плоскость среза, вблизи которой нужна детализация;
+        interactive=True - быстрый грубый вариант для вращения.
+        """
+        if interactive:
+            budget = max(1, int(budget * INTERACTIVE_FRACTION))
+        if len(self) <= budget:
+            return tuple(self._sorted[col] for col in AXES + ['T'])
+
+        if interactive or axis is None:
+            points = self._fit(budget, lambda p: np.ones(len(p['T']), dtype=bool))
+            return tuple(points[col] for col in AXES + ['T'])
+
+        lo, hi = self.bounds[axis]
+        width = NEAR_WIDTH * (hi - lo)
+
+        def near_mask(points):
+            return np.abs(points[axis] - value) <= width
+
+        # Вблизи плоскости - подробный уровень в пределах своей доли бюджета,
+        # остальной бюджет - на точки вдали от плоскости
+        near = self._fit(int(budget * NEAR_FRACTION), near_mask)
+        far = self._fit(budget - len(near['T']), lambda p: ~near_mask(p))
+
+        return tuple(np.concatenate((near[col], far[col])) for col in AXES + ['T'])